@@ -2,34 +2,184 @@
 AI模型配置API路由
 提供AI模型配置和测试相关的API接口
 """
-import json
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, Header, HTTPException
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.database import get_db
 from app.core.logging_config import get_logger
 from app.core.exceptions import ResourceNotFoundException, ValidationException
 from app.core.i18n import i18n, get_locale_from_header
-from app.schemas.requests import AIModelConfigRequest, AIModelTestRequest
+from app.schemas.requests import AIModelConfigRequest, AIModelTestRequest, AIModelBatchTestRequest
 from app.schemas.responses import (
     AIModelInfo, AIModelsResponse, AIModelTestResponse, SuccessResponse
 )
 from app.schemas.enums import ModelType, ProviderType
 from app.models.ai_model import AIModelModel
+from app.services.ai_model_manager import ai_model_service
+from app.services.llm_query_enhancer import get_llm_query_enhancer
 from app.utils.enum_helpers import get_enum_value, is_embedding_model, is_speech_model, is_vision_model, is_llm_model
 
-router = APIRouter(prefix="/api/config", tags=["AI模型配置"])
+router = APIRouter(prefix="/api/config", tags=["AI模型配置"], default_response_class=ORJSONResponse)
 logger = get_logger(__name__)
 
 
+# 各模型类型在配置中保存模型名称的参数键
+MODEL_NAME_CONFIG_KEYS = {
+    'embedding': 'model_name',
+    'speech': 'model_size',
+    'vision': 'model_name'
+}
+
+
+@dataclass(frozen=True, slots=True)
+class AIModelUpdateData:
+    """AI模型配置更新结果（orjson直接序列化，无需构建中间字典）"""
+    model_id: int
+    model_type: str
+    provider: str
+    model_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class AIModelToggleData:
+    """AI模型启用状态切换结果"""
+    model_id: int
+    is_active: bool
+    old_status: bool
+
+
+@dataclass(frozen=True, slots=True)
+class AIModelDeleteData:
+    """AI模型配置删除结果"""
+    deleted_model_id: int
+    model_name: str
+    model_type: str
+
+
+# 成功响应信封的固定前缀
+_SUCCESS_DATA_PREFIX = b'{"success":true,"data":'
+
+
 def get_locale(accept_language: Optional[str] = Header(None)) -> str:
     """从请求头获取语言设置"""
     return get_locale_from_header(accept_language)
 
 
+def _build_model_path_config(model_type: str, model_name: str, model_path: str) -> Dict[str, Any]:
+    """
+    构建模型路径相关的配置参数
+
+    Args:
+        model_type: 模型类型
+        model_name: 模型名称
+        model_path: 计算得到的模型路径
+
+    Returns:
+        Dict[str, Any]: model_path及对应模型名称参数
+    """
+    path_config = {'model_path': model_path}
+    name_key = MODEL_NAME_CONFIG_KEYS.get(model_type)
+    if name_key:
+        path_config[name_key] = model_name
+    return path_config
+
+
+# AI模型列表接口返回的列，按列投影查询，不构建ORM实例
+AI_MODEL_INFO_COLUMNS = (
+    AIModelModel.id,
+    AIModelModel.model_type,
+    AIModelModel.provider,
+    AIModelModel.model_name,
+    AIModelModel.config_json,
+    AIModelModel.is_active,
+    AIModelModel.created_at,
+    AIModelModel.updated_at
+)
+
+
+def _build_ai_model_info(model: AIModelModel) -> AIModelInfo:
+    """
+    将数据库行转换为AIModelInfo
+
+    字段类型已由数据库表结构保证，使用model_construct跳过逐字段校验
+
+    Args:
+        model: AI模型配置记录
+
+    Returns:
+        AIModelInfo: AI模型信息
+    """
+    return AIModelInfo.model_construct(
+        id=model.id,
+        model_type=model.model_type,
+        provider=model.provider,
+        model_name=model.model_name,
+        config_json=model.config_json,
+        is_active=model.is_active,
+        created_at=model.created_at,
+        updated_at=model.updated_at
+    )
+
+
+def _embedding_dimension(embedding_result: Any) -> Any:
+    """
+    获取嵌入结果的向量维度
+
+    Args:
+        embedding_result: 嵌入服务返回值（numpy数组或列表）
+
+    Returns:
+        向量维度，无法识别的类型返回'unknown'
+    """
+    if isinstance(embedding_result, np.ndarray):
+        return embedding_result.shape[1] if embedding_result.ndim > 1 else len(embedding_result)
+    if isinstance(embedding_result, (list, tuple)):
+        return len(embedding_result)
+    return 'unknown'
+
+
+@lru_cache(maxsize=4)
+def _read_test_file(path: str) -> bytes:
+    """读取模型测试用的样例文件（样例文件固定不变，读取后缓存在内存中；文件不存在时不缓存）"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _success_response(data: Any, message: str) -> Response:
+    """
+    构建成功响应
+
+    信封中的常量部分预先编码，只序列化data
+
+    Args:
+        data: 响应数据（支持字典、列表及dataclass）
+        message: 响应消息
+
+    Returns:
+        Response: JSON响应
+    """
+    body = _SUCCESS_DATA_PREFIX + orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY) + _encode_message_suffix(message)
+    return Response(content=body, media_type="application/json")
+
+
+@lru_cache(maxsize=256)
+def _encode_message_suffix(message: str) -> bytes:
+    """编码响应信封的message部分（消息来自有限的i18n文案，缓存编码结果）"""
+    return b',"message":' + orjson.dumps(message) + b'}'
+
+
 @router.post("/ai-model", response_model=SuccessResponse, summary="更新AI模型配置")
-async def update_ai_model_config(
+def update_ai_model_config(
     request: AIModelConfigRequest,
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
@@ -42,37 +192,38 @@ async def update_ai_model_config(
     - **model_name**: 模型名称
     - **config**: 模型配置参数（支持部分更新）
     """
-    logger.info(f"更新AI模型配置: type={request.model_type}, provider={request.provider}, name={request.model_name}")
+    logger.debug("更新AI模型配置: type={}, provider={}, name={}", request.model_type, request.provider, request.model_name)
 
     try:
         # 检查是否已存在相同模型类型的配置（按model_type更新，而不是按model_name）
         model_type_value = get_enum_value(request.model_type)
-        logger.info(f"查找模型类型: {model_type_value} (原始: {request.model_type})")
+        provider_value = get_enum_value(request.provider)
+        logger.debug("查找模型类型: {} (原始: {})", model_type_value, request.model_type)
 
         existing_model = db.query(AIModelModel).filter(
             AIModelModel.model_type == model_type_value,
             AIModelModel.is_active == True
         ).first()
 
-        logger.info(f"查询结果: {existing_model}")
+        logger.debug("查询结果: {}", existing_model)
         if existing_model:
-            logger.info(f"找到现有模型: ID={existing_model.id}, 名称={existing_model.model_name}")
+            logger.debug("找到现有模型: ID={}, 名称={}", existing_model.id, existing_model.model_name)
         else:
-            logger.info("未找到现有模型，将创建新的")
+            logger.debug("未找到现有模型，将创建新的")
 
         if existing_model:
             # 合并现有配置和新配置 - 只更新前端传入的参数
             existing_config = {}
             if existing_model.config_json:
                 try:
-                    existing_config = json.loads(existing_model.config_json)
-                except json.JSONDecodeError:
+                    existing_config = existing_model.config_dict
+                except orjson.JSONDecodeError:
                     logger.warning(f"无法解析现有模型配置JSON: {existing_model.config_json}")
                     existing_config = {}
 
             # 检查模型名称是否发生变化
             model_name_changed = existing_model.model_name != request.model_name
-            logger.info(f"模型名称变化检测: {existing_model.model_name} -> {request.model_name}, 变化={model_name_changed}")
+            logger.debug("模型名称变化检测: {} -> {}, 变化={}", existing_model.model_name, request.model_name, model_name_changed)
 
             # 如果模型名称变了且不是LLM类型，重新计算model_path
             if model_name_changed and request.model_type != 'llm':
@@ -80,44 +231,32 @@ async def update_ai_model_config(
                     request.model_type,
                     request.model_name
                 )
-                logger.info(f"模型名称变化，更新model_path: {new_model_path}")
-
-                # 将新的model_path添加到配置中
-                merged_config = existing_config.copy()
-                merged_config['model_path'] = new_model_path
-
-                # 对于embedding模型，还需要更新model_name配置
-                if request.model_type == 'embedding':
-                    merged_config['model_name'] = request.model_name
+                logger.debug("模型名称变化，更新model_path: {}", new_model_path)
 
-                # 对于speech模型，需要更新model_size配置
-                elif request.model_type == 'speech':
-                    merged_config['model_size'] = request.model_name
+                # 将新的model_path及对应的模型名称参数添加到配置中
+                merged_config = {
+                    **existing_config,
+                    **_build_model_path_config(request.model_type, request.model_name, new_model_path)
+                }
 
-                # 对于vision模型，需要更新model_name配置
-                elif request.model_type == 'vision':
-                    merged_config['model_name'] = request.model_name
-
-                logger.info(f"已更新模型路径相关配置参数")
+                logger.debug("已更新模型路径相关配置参数")
             else:
                 # 模型名称没变或者是LLM类型，正常合并配置
-                merged_config = existing_config.copy()
-                for key, value in request.config.items():
-                    merged_config[key] = value
-                    logger.info(f"更新配置参数: {key} = {value}")
+                merged_config = {**existing_config, **request.config}
+                logger.debug("更新配置参数: {}", request.config)
 
             # 更新现有配置
             # 如果前端传了model_name，则更新，否则保持原有
-            if request.model_name and request.model_name != get_enum_value(request.model_type):
+            if request.model_name and request.model_name != model_type_value:
                 existing_model.model_name = request.model_name
-                logger.info(f"更新模型名称: {existing_model.model_name} -> {request.model_name}")
+                logger.debug("更新模型名称: {} -> {}", existing_model.model_name, request.model_name)
 
-            existing_model.provider = get_enum_value(request.provider)
-            existing_model.config_json = json.dumps(merged_config, ensure_ascii=False)
-            existing_model.updated_at = datetime.utcnow()
-            db.commit()
+            existing_model.provider = provider_value
+            # updated_at由列定义的onupdate在UPDATE时统一填充
+            existing_model.config_dict = merged_config
+            # 提交前读取字段，提交后对象过期，再访问会多一次SELECT
             model_id = existing_model.id
-            logger.info(f"更新现有AI模型配置: id={model_id}, model_type={request.model_type}, final_name={existing_model.model_name}")
+            final_name = existing_model.model_name
         else:
             # 创建新配置
             # 准备新配置，如果是非LLM类型，需要计算model_path
@@ -128,43 +267,42 @@ async def update_ai_model_config(
                     request.model_type,
                     request.model_name
                 )
-                new_config['model_path'] = new_model_path
-                logger.info(f"为新模型计算model_path: {new_model_path}")
-
-                # 对于不同类型模型，添加相应的配置参数
-                if request.model_type == 'embedding':
-                    new_config['model_name'] = request.model_name
-                elif request.model_type == 'speech':
-                    new_config['model_size'] = request.model_name
-                elif request.model_type == 'vision':
-                    new_config['model_name'] = request.model_name
+                new_config.update(_build_model_path_config(request.model_type, request.model_name, new_model_path))
+                logger.debug("为新模型计算model_path: {}", new_model_path)
 
             new_model = AIModelModel(
-                model_type=get_enum_value(request.model_type),
-                provider=get_enum_value(request.provider),
+                model_type=model_type_value,
+                provider=provider_value,
                 model_name=request.model_name,
-                config_json=json.dumps(new_config, ensure_ascii=False)
+                config_json=AIModelModel.dump_config_json(new_config)
             )
             db.add(new_model)
-            db.commit()
-            db.refresh(new_model)
+            # flush后即可拿到自增ID，无需提交后refresh重新查询
+            db.flush()
             model_id = new_model.id
+
+        # 更新和创建共用一次提交
+        db.commit()
+        if existing_model:
+            logger.info(f"更新现有AI模型配置: id={model_id}, model_type={request.model_type}, final_name={final_name}")
+        else:
             logger.info(f"创建新AI模型配置: id={model_id}")
 
         # 构建响应数据
-        response_data = {
-            "model_id": model_id,
-            "model_type": get_enum_value(request.model_type),
-            "provider": get_enum_value(request.provider),
-            "model_name": request.model_name
-        }
+        response_data = AIModelUpdateData(
+            model_id=model_id,
+            model_type=model_type_value,
+            provider=provider_value,
+            model_name=request.model_name
+        )
+
+        # LLM配置变更后清空查询增强缓存，避免返回旧模型的结果
+        if is_llm_model(request.model_type):
+            get_llm_query_enhancer().clear_cache()
 
         message = i18n.t('model.config_update_success', locale)
 
-        return SuccessResponse(
-            data=response_data,
-            message=message
-        )
+        return _success_response(response_data, message)
 
     except ValidationException:
         raise
@@ -174,7 +312,7 @@ async def update_ai_model_config(
 
 
 @router.get("/ai-models", response_model=AIModelsResponse, summary="获取所有AI模型配置")
-async def get_ai_models(
+def get_ai_models(
     model_type: Optional[ModelType] = None,
     provider: Optional[ProviderType] = None,
     db: Session = Depends(get_db),
@@ -186,19 +324,19 @@ async def get_ai_models(
     - **model_type**: 模型类型过滤
     - **provider**: 提供商类型过滤
     """
-    logger.info(f"获取AI模型配置列表: type={model_type}, provider={provider}")
+    logger.debug("获取AI模型配置列表: type={}, provider={}", model_type, provider)
 
     try:
-        # 首先检查是否有任何模型配置
-        total_models = db.query(AIModelModel).count()
+        # 首先检查是否有任何模型配置（EXISTS取到首行即停止，无需统计全表）
+        has_models = db.query(db.query(AIModelModel.id).exists()).scalar()
 
         # 如果没有模型配置，初始化默认配置
-        if total_models == 0:
+        if not has_models:
             logger.info("数据库中没有AI模型配置，开始初始化默认配置")
-            await _initialize_default_ai_models(db)
+            _initialize_default_ai_models(db)
 
-        # 构建查询
-        query = db.query(AIModelModel)
+        # 构建查询（只投影响应需要的列）
+        query = db.query(*AI_MODEL_INFO_COLUMNS)
 
         # 应用过滤条件
         if model_type:
@@ -206,184 +344,181 @@ async def get_ai_models(
         if provider:
             query = query.filter(AIModelModel.provider == get_enum_value(provider))
 
-        # 查询所有配置
-        models = query.order_by(AIModelModel.created_at.desc()).all()
-
-        # 转换为响应格式
-        model_list = []
-        for model in models:
-            model_info = AIModelInfo(
-                id=model.id,
-                model_type=model.model_type,
-                provider=model.provider,
-                model_name=model.model_name,
-                config_json=model.config_json,
-                is_active=model.is_active,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            )
-            model_list.append(model_info)
+        # 查询所有配置，行直接转换为字典，由orjson序列化
+        model_list = [row._asdict() for row in query.order_by(AIModelModel.created_at.desc())]
 
         logger.info(f"返回AI模型配置: 数量={len(model_list)}")
 
-        return AIModelsResponse(
-            data=model_list,
-            message=i18n.t('model.get_success', locale)
-        )
+        # 直接返回预编码响应，跳过response_model的二次校验和序列化
+        return _success_response(model_list, i18n.t('model.get_success', locale))
 
     except Exception as e:
         logger.error(f"获取AI模型配置失败: {str(e)}")
         raise HTTPException(status_code=500, detail=i18n.t('model.get_failed', locale))
 
 
-@router.post("/ai-model/{model_id}/test", response_model=AIModelTestResponse, summary="测试AI模型")
-async def test_ai_model(
-    model_id: int,
-    request: AIModelTestRequest = None,
-    db: Session = Depends(get_db),
-    locale: str = Depends(get_locale)
-):
+async def _run_model_test(
+    model_config: AIModelModel,
+    request: Optional[AIModelTestRequest],
+    locale: str
+) -> Dict[str, Any]:
     """
-    测试AI模型连通性
+    对单个模型配置执行连通性测试
 
-    - **model_id**: 模型配置ID
-    - **test_data**: 测试数据（可选）
-    - **config_override**: 临时配置覆盖（可选）
+    Args:
+        model_config: AI模型配置记录
+        request: 测试请求（可选）
+        locale: 语言设置
+
+    Returns:
+        Dict[str, Any]: 测试结果数据
     """
-    logger.info(f"测试AI模型: id={model_id}")
+    model_id = model_config.id
 
-    try:
-        # 查询模型配置
-        model_config = db.query(AIModelModel).filter(
-            AIModelModel.id == model_id
-        ).first()
+    # 执行真实的模型测试
+    start_ns = time.perf_counter_ns()
 
-        if not model_config:
-            raise ResourceNotFoundException("AI模型配置", str(model_id))
+    config = None
+    test_passed = False
+    test_message = ""
 
-        # 解析配置
-        config = json.loads(model_config.config_json)
+    try:
+        # 解析配置（config_json 格式错误时按测试失败处理）
+        config = model_config.config_dict
         if request and request.config_override:
-            config.update(request.config_override)
+            config = {**config, **request.config_override}
 
-        # 执行真实的模型测试
-        import time
-        start_time = time.time()
-
-        test_passed = False
         test_message = i18n.t('model.test_start', locale, model_name=model_config.model_name)
 
-        try:
-            # 导入AI模型服务
-            from app.services.ai_model_manager import ai_model_service
-
-            # 根据模型类型执行相应测试
-            if is_embedding_model(model_config.model_type):
-                # 测试文本嵌入模型
-                test_text = "这是一个测试文本，用于验证文本嵌入模型的功能。"
-                embedding_result = await ai_model_service.text_embedding(test_text)
-
-                if embedding_result is not None:
-                    # 检查向量维度
-                    if hasattr(embedding_result, 'shape'):
-                        dimension = embedding_result.shape[1] if len(embedding_result.shape) > 1 else len(embedding_result)
-                    elif hasattr(embedding_result, '__len__'):
-                        dimension = len(embedding_result)
-                    else:
-                        dimension = 'unknown'
+        # 根据模型类型执行相应测试
+        if is_embedding_model(model_config.model_type):
+            # 测试文本嵌入模型
+            test_text = "这是一个测试文本，用于验证文本嵌入模型的功能。"
+            embedding_result = await ai_model_service.text_embedding(test_text)
 
+            if embedding_result is not None:
+                # 检查向量维度
+                dimension = _embedding_dimension(embedding_result)
+
+                test_passed = True
+                test_message = i18n.t('model.text_embedding_success', locale, dimension=dimension)
+            else:
+                test_passed = False
+                test_message = i18n.t('model.text_embedding_failed', locale)
+
+        elif is_speech_model(model_config.model_type):
+            # 测试语音识别模型（使用真实音频文件）
+            test_audio_path = "../data/test-data/test.mp3"  # 真实音频文件路径
+            try:
+                # 首次在线程中读取音频文件，避免阻塞事件循环，之后直接命中缓存
+                test_audio = await asyncio.to_thread(_read_test_file, test_audio_path)
+
+                speech_result = await ai_model_service.speech_to_text(test_audio)
+                if speech_result and "text" in speech_result:
                     test_passed = True
-                    test_message = i18n.t('model.text_embedding_success', locale, dimension=dimension)
+                    test_message = i18n.t('model.speech_success', locale)
                 else:
                     test_passed = False
-                    test_message = i18n.t('model.text_embedding_failed', locale)
-
-            elif is_speech_model(model_config.model_type):
-                # 测试语音识别模型（使用真实音频文件）
-                test_audio_path = "../data/test-data/test.mp3"  # 真实音频文件路径
-                try:
-                    # 读取音频文件
-                    with open(test_audio_path, 'rb') as f:
-                        test_audio = f.read()
-
-                    speech_result = await ai_model_service.speech_to_text(test_audio)
-                    if speech_result and "text" in speech_result:
-                        test_passed = True
-                        test_message = i18n.t('model.speech_success', locale)
-                    else:
-                        test_passed = False
-                        test_message = i18n.t('model.speech_failed', locale)
-                except FileNotFoundError:
+                    test_message = i18n.t('model.speech_failed', locale)
+            except FileNotFoundError:
+                test_passed = False
+                test_message = i18n.t('model.speech_file_not_found', locale, path=test_audio_path)
+            except Exception as e:
+                test_passed = False
+                test_message = i18n.t('model.speech_test_error', locale, error=str(e))
+
+        elif is_vision_model(model_config.model_type):
+            # 测试图像理解模型（使用真实图片文件）
+            test_image_path = "../data/test-data/pokemon.jpeg"  # 真实图片文件路径
+            test_texts = ["描述这张图片的内容", "这张图片展示了什么", "这是一张宝可梦图片"]
+            try:
+                test_image = await asyncio.to_thread(_read_test_file, test_image_path)
+                vision_result = await ai_model_service.image_understanding(test_image, test_texts)
+                if vision_result and "best_match" in vision_result:
+                    test_passed = True
+                    test_message = i18n.t('model.vision_success', locale)
+                else:
                     test_passed = False
-                    test_message = i18n.t('model.speech_file_not_found', locale, path=test_audio_path)
-                except Exception as e:
+                    test_message = i18n.t('model.vision_failed', locale)
+            except Exception as e:
+                test_passed = False
+                test_message = i18n.t('model.vision_test_error', locale, error=str(e))
+
+        elif is_llm_model(model_config.model_type):
+            # 测试大语言模型
+            test_message = "你好，请介绍一下你自己"
+            try:
+                llm_result = await ai_model_service.text_generation(test_message)
+                # 检查可能的返回字段：content 或 text
+                generated_text = None
+                if llm_result:
+                    if "content" in llm_result:
+                        generated_text = llm_result["content"]
+                    elif "text" in llm_result:
+                        generated_text = llm_result["text"]
+
+                if generated_text:
+                    test_passed = True
+                    generated_text_preview = generated_text[:100]  # 只取前100字符
+                    test_message = i18n.t('model.llm_success', locale)
+                else:
                     test_passed = False
-                    test_message = i18n.t('model.speech_test_error', locale, error=str(e))
+                    test_message = i18n.t('model.llm_failed', locale)
+            except Exception as e:
+                test_passed = False
+                test_message = i18n.t('model.llm_test_error', locale, error=str(e))
 
-            elif is_vision_model(model_config.model_type):
-                # 测试图像理解模型（使用真实图片文件）
-                test_image_path = "../data/test-data/pokemon.jpeg"  # 真实图片文件路径
-                test_texts = ["描述这张图片的内容", "这张图片展示了什么", "这是一张宝可梦图片"]
-                try:
-                    vision_result = await ai_model_service.image_understanding(test_image_path, test_texts)
-                    if vision_result and "best_match" in vision_result:
-                        test_passed = True
-                        test_message = i18n.t('model.vision_success', locale)
-                    else:
-                        test_passed = False
-                        test_message = i18n.t('model.vision_failed', locale)
-                except Exception as e:
-                    test_passed = False
-                    test_message = i18n.t('model.vision_test_error', locale, error=str(e))
+        else:
+            test_passed = False
+            test_message = i18n.t('model.unknown_type', locale, type=model_config.model_type)
 
-            elif is_llm_model(model_config.model_type):
-                # 测试大语言模型
-                test_message = "你好，请介绍一下你自己"
-                try:
-                    llm_result = await ai_model_service.text_generation(test_message)
-                    # 检查可能的返回字段：content 或 text
-                    generated_text = None
-                    if llm_result:
-                        if "content" in llm_result:
-                            generated_text = llm_result["content"]
-                        elif "text" in llm_result:
-                            generated_text = llm_result["text"]
-
-                    if generated_text:
-                        test_passed = True
-                        generated_text_preview = generated_text[:100]  # 只取前100字符
-                        test_message = i18n.t('model.llm_success', locale)
-                    else:
-                        test_passed = False
-                        test_message = i18n.t('model.llm_failed', locale)
-                except Exception as e:
-                    test_passed = False
-                    test_message = i18n.t('model.llm_test_error', locale, error=str(e))
+    except ImportError:
+        # 模型依赖库在服务调用时按需导入，缺失时视为服务不可用
+        test_passed = False
+        test_message = i18n.t('model.service_unavailable', locale)
+    except Exception as e:
+        test_passed = False
+        test_message = i18n.t('model.test_failed_with_error', locale, error=str(e))
 
-            else:
-                test_passed = False
-                test_message = i18n.t('model.unknown_type', locale, type=model_config.model_type)
+    response_time = (time.perf_counter_ns() - start_ns) / 1_000_000_000
 
-        except ImportError:
-            test_passed = False
-            test_message = i18n.t('model.service_unavailable', locale)
-        except Exception as e:
-            test_passed = False
-            test_message = i18n.t('model.test_failed_with_error', locale, error=str(e))
+    logger.info("AI模型测试完成: id={}, 通过={}, 耗时={:.2f}秒", model_id, test_passed, response_time)
 
-        response_time = time.time() - start_time
+    return {
+        "model_id": model_id,
+        "test_passed": test_passed,
+        "response_time": round(response_time, 3),
+        "test_message": test_message,
+        "test_data": request.test_data if request else None,
+        "config_used": config
+    }
 
-        logger.info(f"AI模型测试完成: id={model_id}, 通过={test_passed}, 耗时={response_time:.2f}秒")
+
+@router.post("/ai-model/{model_id}/test", response_model=AIModelTestResponse, summary="测试AI模型")
+async def test_ai_model(
+    model_id: int,
+    request: AIModelTestRequest = None,
+    db: Session = Depends(get_db),
+    locale: str = Depends(get_locale)
+):
+    """
+    测试AI模型连通性
+
+    - **model_id**: 模型配置ID
+    - **test_data**: 测试数据（可选）
+    - **config_override**: 临时配置覆盖（可选）
+    """
+    logger.info(f"测试AI模型: id={model_id}")
+
+    try:
+        # 查询模型配置（同步查询放到线程池，避免阻塞事件循环）
+        model_config = await run_in_threadpool(db.get, AIModelModel, model_id)
+
+        if not model_config:
+            raise ResourceNotFoundException("AI模型配置", str(model_id))
 
         return AIModelTestResponse(
-            data={
-                "model_id": model_id,
-                "test_passed": test_passed,
-                "response_time": round(response_time, 3),
-                "test_message": test_message,
-                "test_data": request.test_data if request else None,
-                "config_used": config
-            },
+            data=await _run_model_test(model_config, request, locale),
             message=i18n.t('model.test_complete', locale)
         )
 
@@ -394,9 +529,67 @@ async def test_ai_model(
         raise HTTPException(status_code=500, detail=i18n.t('model.test_failed', locale))
 
 
+@router.post("/ai-models/test-batch", response_model=SuccessResponse, summary="批量测试AI模型")
+async def test_ai_models_batch(
+    request: AIModelBatchTestRequest,
+    db: Session = Depends(get_db),
+    locale: str = Depends(get_locale)
+):
+    """
+    并发测试多个AI模型的连通性
+
+    - **model_ids**: 模型配置ID列表
+    - **test_data**: 测试数据（可选）
+    """
+    logger.info(f"批量测试AI模型: ids={request.model_ids}")
+
+    try:
+        # 一次查询取出所有待测模型配置（同步查询放到线程池，避免阻塞事件循环）
+        model_configs = await run_in_threadpool(
+            lambda: db.query(AIModelModel).filter(AIModelModel.id.in_(request.model_ids)).all()
+        )
+        configs_by_id = {model_config.id: model_config for model_config in model_configs}
+
+        # 各模型测试以I/O等待为主，并发执行；单个模型测试抛出异常不影响其余模型
+        test_request = AIModelTestRequest(test_data=request.test_data)
+        found_ids = [model_id for model_id in request.model_ids if model_id in configs_by_id]
+        outcomes = await asyncio.gather(*(
+            _run_model_test(configs_by_id[model_id], test_request, locale)
+            for model_id in found_ids
+        ), return_exceptions=True)
+        outcomes_by_id = dict(zip(found_ids, outcomes))
+
+        # 按请求顺序汇总结果，不存在的模型和测试异常都记为测试失败
+        results = []
+        for model_id in request.model_ids:
+            outcome = outcomes_by_id.get(model_id)
+            if outcome is None:
+                results.append({
+                    "model_id": model_id,
+                    "test_passed": False,
+                    "test_message": i18n.t('model.not_found', locale)
+                })
+            elif isinstance(outcome, BaseException):
+                logger.error(f"测试AI模型异常: id={model_id}, {str(outcome)}")
+                results.append({
+                    "model_id": model_id,
+                    "test_passed": False,
+                    "test_message": str(outcome)
+                })
+            else:
+                results.append(outcome)
+
+        return _success_response(results, i18n.t('model.test_complete', locale))
+
+    except Exception as e:
+        logger.error(f"批量测试AI模型失败: {str(e)}")
+        raise HTTPException(status_code=500, detail=i18n.t('model.test_failed', locale))
+
+
 @router.put("/ai-model/{model_id}/toggle", response_model=SuccessResponse, summary="启用/禁用AI模型")
-async def toggle_ai_model(
+def toggle_ai_model(
     model_id: int,
+    return_body: bool = Query(True, description="是否返回响应体，为false时返回204 No Content"),
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
@@ -404,33 +597,36 @@ async def toggle_ai_model(
     启用或禁用AI模型
 
     - **model_id**: 模型配置ID
+    - **return_body**: 是否返回响应体（默认返回）
     """
     logger.info(f"切换AI模型状态: id={model_id}")
 
     try:
-        # 查询模型配置
-        model_config = db.query(AIModelModel).filter(
-            AIModelModel.id == model_id
-        ).first()
+        # 按主键查询模型配置（优先命中会话标识映射）
+        model_config = db.get(AIModelModel, model_id)
 
         if not model_config:
             raise ResourceNotFoundException("AI模型配置", str(model_id))
 
         # 切换状态
         old_status = model_config.is_active
-        model_config.is_active = not model_config.is_active
+        new_status = not old_status
+        model_config.is_active = new_status
         db.commit()
 
-        status_text = i18n.t('model.enabled', locale) if model_config.is_active else i18n.t('model.disabled', locale)
-        logger.info(f"AI模型状态已切换: id={model_id}, {old_status} -> {model_config.is_active}")
+        logger.info(f"AI模型状态已切换: id={model_id}, {old_status} -> {new_status}")
+
+        if not return_body:
+            return Response(status_code=204)
 
-        return SuccessResponse(
-            data={
-                "model_id": model_id,
-                "is_active": model_config.is_active,
-                "old_status": old_status
-            },
-            message=i18n.t('model.toggle_success', locale, status=status_text)
+        status_text = i18n.t('model.enabled', locale) if new_status else i18n.t('model.disabled', locale)
+        return _success_response(
+            AIModelToggleData(
+                model_id=model_id,
+                is_active=new_status,
+                old_status=old_status
+            ),
+            i18n.t('model.toggle_success', locale, status=status_text)
         )
 
     except ResourceNotFoundException:
@@ -441,8 +637,9 @@ async def toggle_ai_model(
 
 
 @router.delete("/ai-model/{model_id}", response_model=SuccessResponse, summary="删除AI模型配置")
-async def delete_ai_model_config(
+def delete_ai_model_config(
     model_id: int,
+    return_body: bool = Query(True, description="是否返回响应体，为false时返回204 No Content"),
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
@@ -450,14 +647,13 @@ async def delete_ai_model_config(
     删除AI模型配置
 
     - **model_id**: 模型配置ID
+    - **return_body**: 是否返回响应体（默认返回）
     """
     logger.info(f"删除AI模型配置: id={model_id}")
 
     try:
-        # 查询模型配置
-        model_config = db.query(AIModelModel).filter(
-            AIModelModel.id == model_id
-        ).first()
+        # 按主键查询模型配置（优先命中会话标识映射）
+        model_config = db.get(AIModelModel, model_id)
 
         if not model_config:
             raise ResourceNotFoundException("AI模型配置", str(model_id))
@@ -468,13 +664,16 @@ async def delete_ai_model_config(
 
         logger.info(f"AI模型配置已删除: id={model_id}, name={model_config.model_name}")
 
-        return SuccessResponse(
-            data={
-                "deleted_model_id": model_id,
-                "model_name": model_config.model_name,
-                "model_type": model_config.model_type
-            },
-            message=i18n.t('model.delete_success', locale)
+        if not return_body:
+            return Response(status_code=204)
+
+        return _success_response(
+            AIModelDeleteData(
+                deleted_model_id=model_id,
+                model_name=model_config.model_name,
+                model_type=model_config.model_type
+            ),
+            i18n.t('model.delete_success', locale)
         )
 
     except ResourceNotFoundException:
@@ -485,7 +684,7 @@ async def delete_ai_model_config(
 
 
 @router.get("/ai-models/default", response_model=AIModelsResponse, summary="获取默认AI模型配置")
-async def get_default_ai_models(
+def get_default_ai_models(
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
@@ -498,33 +697,20 @@ async def get_default_ai_models(
         # 获取默认配置
         default_configs = AIModelModel.get_default_configs()
 
-        # 检查数据库中是否已存在这些配置
-        existing_models = []
-        for config_key, config_data in default_configs.items():
-            existing_model = db.query(AIModelModel).filter(
-                AIModelModel.model_type == config_data["model_type"],
-                AIModelModel.provider == config_data["provider"],
-                AIModelModel.model_name == config_data["model_name"]
-            ).first()
-
-            if existing_model:
-                model_info = AIModelInfo(
-                    id=existing_model.id,
-                    model_type=existing_model.model_type,
-                    provider=existing_model.provider,
-                    model_name=existing_model.model_name,
-                    config_json=existing_model.config_json,
-                    is_active=existing_model.is_active,
-                    created_at=existing_model.created_at,
-                    updated_at=existing_model.updated_at
-                )
-                existing_models.append(model_info)
+        # 一次查询取出数据库中已存在的默认配置
+        existing_by_key = AIModelModel.query_default_models(db, default_configs)
+
+        existing_models = [
+            _build_ai_model_info(existing_by_key[key])
+            for key in map(AIModelModel.default_config_key, default_configs.values())
+            if key in existing_by_key
+        ]
 
         logger.info(f"返回默认AI模型配置: 数量={len(existing_models)}")
 
-        return AIModelsResponse(
-            data=existing_models,
-            message=i18n.t('model.get_default_success', locale)
+        return _success_response(
+            [model_info.model_dump() for model_info in existing_models],
+            i18n.t('model.get_default_success', locale)
         )
 
     except Exception as e:
@@ -532,7 +718,7 @@ async def get_default_ai_models(
         raise HTTPException(status_code=500, detail=i18n.t('model.get_default_failed', locale))
 
 
-async def _initialize_default_ai_models(db: Session):
+def _initialize_default_ai_models(db: Session):
     """
     初始化默认AI模型配置到数据库
 
@@ -545,37 +731,26 @@ async def _initialize_default_ai_models(db: Session):
         # 获取默认配置
         default_configs = AIModelModel.get_default_configs()
 
-        # 创建默认模型配置记录
-        created_models = []
+        # 收集缺失的默认模型配置行
+        new_rows = []
+        existing_by_key = AIModelModel.query_default_models(db, default_configs)
 
         for config_key, config_data in default_configs.items():
             # 检查是否已存在相同的配置
-            existing_model = db.query(AIModelModel).filter(
-                AIModelModel.model_type == config_data["model_type"],
-                AIModelModel.provider == config_data["provider"],
-                AIModelModel.model_name == config_data["model_name"]
-            ).first()
+            existing_model = existing_by_key.get(AIModelModel.default_config_key(config_data))
 
             if not existing_model:
-                # 创建新的模型配置
-                new_model = AIModelModel(
-                    model_type=config_data["model_type"],
-                    provider=config_data["provider"],
-                    model_name=config_data["model_name"],
-                    config_json=json.dumps(config_data["config"], ensure_ascii=False),
-                    is_active=True
-                )
-                db.add(new_model)
-                created_models.append(config_data["model_name"])
-                logger.info(f"创建默认AI模型配置: {config_data['model_type']} - {config_data['model_name']}")
+                new_rows.append(AIModelModel.build_default_row(config_data))
+                logger.debug("创建默认AI模型配置: {} - {}", config_data["model_type"], config_data["model_name"])
             else:
-                logger.info(f"AI模型配置已存在，跳过: {config_data['model_type']} - {config_data['model_name']}")
+                logger.debug("AI模型配置已存在，跳过: {} - {}", config_data["model_type"], config_data["model_name"])
 
-        # 提交所有更改
-        db.commit()
-
-        if created_models:
-            logger.info(f"成功初始化 {len(created_models)} 个默认AI模型配置: {', '.join(created_models)}")
+        if new_rows:
+            # 单条executemany批量INSERT，一次提交
+            db.execute(insert(AIModelModel), new_rows)
+            db.commit()
+            created_names = ', '.join(row["model_name"] for row in new_rows)
+            logger.info(f"成功初始化 {len(new_rows)} 个默认AI模型配置: {created_names}")
         else:
             logger.info("所有默认AI模型配置都已存在")
 
@@ -583,8 +758,3 @@ async def _initialize_default_ai_models(db: Session):
         logger.error(f"初始化默认AI模型配置失败: {str(e)}")
         db.rollback()
         raise
-
-
-# 添加缺失的导入
-from datetime import datetime
-import asyncio
\ No newline at end of file
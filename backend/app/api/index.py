@@ -3,13 +3,19 @@
 提供文件索引管理相关的API接口
 """
 import os
+import stat
 import asyncio
 import threading
+from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.core.logging_config import get_logger
 from app.core.exceptions import ResourceNotFoundException, ValidationException
 from app.core.config import get_settings
@@ -21,15 +27,26 @@ from app.schemas.responses import (
 from app.schemas.enums import JobType, JobStatus
 from app.models.index_job import IndexJobModel
 from app.utils.enum_helpers import get_enum_value
+from app.utils.pagination import paginate_with_total, iter_page_with_total
+from app.utils.http_cache import etag_json_response
+from app.utils.ndjson import accepts_ndjson, ndjson_page_response
 from app.models.file import FileModel
 from app.services.file_index_service import FileIndexService, get_file_index_service as get_global_file_index_service
 
-router = APIRouter(prefix="/api/index", tags=["索引管理"])
+router = APIRouter(prefix="/api/index", tags=["索引管理"], default_response_class=ORJSONResponse)
 logger = get_logger(__name__)
 settings = get_settings()
 
-# 全局文件索引服务实例（单例）
-_file_index_service: Optional[FileIndexService] = None
+# 索引任务列表批量校验/序列化适配器
+index_job_adapter = TypeAdapter(List[IndexJobInfo])
+
+
+# 索引进度流的轮询间隔(秒)
+INDEX_PROGRESS_POLL_INTERVAL = 1.0
+# 进度流在任务到达这些状态后结束
+INDEX_FINISHED_STATUSES = frozenset({JobStatus.COMPLETED.value, JobStatus.FAILED.value})
+# 按主键批量删除文件记录时单条语句的ID数量（低于SQLite绑定参数上限）
+FILE_DELETE_BATCH_SIZE = 500
 
 
 def get_locale(accept_language: Optional[str] = Header(None)) -> str:
@@ -38,29 +55,12 @@ def get_locale(accept_language: Optional[str] = Header(None)) -> str:
 
 
 def get_file_index_service() -> FileIndexService:
-    """获取文件索引服务实例（单例模式）"""
-    global _file_index_service
-    if _file_index_service is None:
-        faiss_path, whoosh_path = settings.get_index_paths()
-        _file_index_service = FileIndexService(
-            data_root=settings.index.data_root,
-            faiss_index_path=faiss_path,
-            whoosh_index_path=whoosh_path,
-            use_chinese_analyzer=settings.index.use_chinese_analyzer,
-            scanner_config={
-                'max_workers': settings.index.scanner_max_workers,
-                'max_file_size': settings.index.max_file_size,
-                'supported_extensions': set(settings.index.supported_extensions)
-            },
-            parser_config={
-                'max_content_length': settings.index.max_content_length
-            }
-        )
+    """获取文件索引服务实例（单例模式，由服务模块统一创建）"""
     return get_global_file_index_service()
 
 
 @router.post("/create", response_model=IndexCreateResponse, summary="创建索引")
-async def create_index(
+def create_index(
     request: IndexCreateRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -78,22 +78,26 @@ async def create_index(
     logger.info(f"创建索引请求: folder='{request.folder_path}', recursive={request.recursive}")
 
     try:
-        # 验证文件夹路径
-        if not os.path.exists(request.folder_path):
+        # 验证文件夹路径（一次stat同时判断存在性和是否为目录）
+        try:
+            folder_stat = os.stat(request.folder_path)
+        except (OSError, ValueError):
             raise ValidationException(i18n.t('index.path_not_exist', locale, path=request.folder_path))
 
-        if not os.path.isdir(request.folder_path):
+        if not stat.S_ISDIR(folder_stat.st_mode):
             raise ValidationException(i18n.t('index.path_not_directory', locale, path=request.folder_path))
 
         # 检查是否有正在运行的索引任务
-        existing_job = db.query(IndexJobModel).filter(
+        # 只取任务ID判断是否存在，命中时再加载完整记录
+        existing_job_id = db.query(IndexJobModel.id).filter(
             IndexJobModel.folder_path == request.folder_path,
             IndexJobModel.status.in_([get_enum_value(JobStatus.PENDING), get_enum_value(JobStatus.PROCESSING)])
-        ).first()
+        ).limit(1).scalar()
 
-        if existing_job:
+        if existing_job_id is not None:
             logger.info(f"文件夹已在索引中: {request.folder_path}")
-            return IndexCreateResponse(
+            existing_job = db.get(IndexJobModel, existing_job_id)
+            return IndexCreateResponse.model_construct(
                 data=IndexJobInfo(**existing_job.to_dict()),
                 message=i18n.t('index.folder_indexing', locale)
             )
@@ -119,7 +123,7 @@ async def create_index(
 
         logger.info(f"索引任务已创建: id={index_job.id}")
 
-        return IndexCreateResponse(
+        return IndexCreateResponse.model_construct(
             data=IndexJobInfo(**index_job.to_dict()),
             message=i18n.t('index.task_created', locale)
         )
@@ -132,7 +136,7 @@ async def create_index(
 
 
 @router.post("/update", response_model=IndexCreateResponse, summary="更新索引")
-async def update_index(
+def update_index(
     request: IndexUpdateRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -154,14 +158,16 @@ async def update_index(
             raise ValidationException(i18n.t('index.path_not_exist', locale, path=request.folder_path))
 
         # 检查是否有正在运行的索引任务
-        existing_job = db.query(IndexJobModel).filter(
+        # 只取任务ID判断是否存在，命中时再加载完整记录
+        existing_job_id = db.query(IndexJobModel.id).filter(
             IndexJobModel.folder_path == request.folder_path,
             IndexJobModel.status.in_([get_enum_value(JobStatus.PENDING), get_enum_value(JobStatus.PROCESSING)])
-        ).first()
+        ).limit(1).scalar()
 
-        if existing_job:
+        if existing_job_id is not None:
             logger.info(f"文件夹正在索引中: {request.folder_path}")
-            return IndexCreateResponse(
+            existing_job = db.get(IndexJobModel, existing_job_id)
+            return IndexCreateResponse.model_construct(
                 data=IndexJobInfo(**existing_job.to_dict()),
                 message=i18n.t('index.folder_indexing', locale)
             )
@@ -187,7 +193,7 @@ async def update_index(
 
         logger.info(f"增量索引任务已创建: id={index_job.id}")
 
-        return IndexCreateResponse(
+        return IndexCreateResponse.model_construct(
             data=IndexJobInfo(**index_job.to_dict()),
             message=i18n.t('index.incremental_created', locale)
         )
@@ -200,7 +206,7 @@ async def update_index(
 
 
 @router.get("/status", summary="获取索引系统状态")
-async def get_system_status(
+def get_system_status(
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
@@ -263,7 +269,7 @@ async def get_system_status(
 
 
 @router.get("/status/{index_id}", response_model=IndexCreateResponse, summary="查询索引状态")
-async def get_index_status(
+def get_index_status(
     index_id: int,
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
@@ -301,7 +307,7 @@ async def get_index_status(
 
         logger.info(f"索引状态查询完成: id={index_id}, status={index_job.status}")
 
-        return IndexCreateResponse(
+        return IndexCreateResponse.model_construct(
             data=IndexJobInfo(**job_dict),
             message=i18n.t('index.query_success', locale)
         )
@@ -313,8 +319,61 @@ async def get_index_status(
         raise HTTPException(status_code=500, detail=i18n.t('index.query_failed', locale) + f": {str(e)}")
 
 
+def _load_index_job_dict(index_id: int) -> Optional[Dict[str, Any]]:
+    """
+    使用独立会话读取索引任务（供进度流在线程中调用）
+
+    Args:
+        index_id: 索引任务ID
+
+    Returns:
+        Optional[Dict[str, Any]]: 索引任务字典，不存在时返回None
+    """
+    db = SessionLocal()
+    try:
+        index_job = db.query(IndexJobModel).filter(IndexJobModel.id == index_id).first()
+        return index_job.to_dict() if index_job else None
+    finally:
+        db.close()
+
+
+@router.get("/status/{index_id}/stream", summary="流式获取索引进度")
+async def stream_index_status(
+    index_id: int,
+    locale: str = Depends(get_locale)
+):
+    """
+    以NDJSON流推送索引任务进度
+
+    进度变化时输出一行JSON，任务完成或失败后结束，客户端无需反复轮询
+
+    - **index_id**: 索引任务ID
+    """
+    job_dict = await asyncio.to_thread(_load_index_job_dict, index_id)
+    if job_dict is None:
+        raise ResourceNotFoundException(i18n.t('validation.resource_not_found', locale, resource="索引任务", id=index_id))
+
+    async def progress_events():
+        current = job_dict
+        last_snapshot = None
+        while current is not None:
+            snapshot = (current['status'], current['processed_files'], current['total_files'], current['error_count'])
+            if snapshot != last_snapshot:
+                last_snapshot = snapshot
+                yield orjson.dumps(current) + b"\n"
+
+            if current['status'] in INDEX_FINISHED_STATUSES:
+                break
+
+            await asyncio.sleep(INDEX_PROGRESS_POLL_INTERVAL)
+            current = await asyncio.to_thread(_load_index_job_dict, index_id)
+
+    return StreamingResponse(progress_events(), media_type="application/x-ndjson")
+
+
 @router.get("/list", response_model=IndexListResponse, summary="索引列表")
-async def get_index_list(
+def get_index_list(
+    request: Request,
     status: Optional[JobStatus] = None,
     limit: int = 10,
     offset: int = 0,
@@ -327,6 +386,8 @@ async def get_index_list(
     - **status**: 任务状态过滤
     - **limit**: 返回结果数量
     - **offset**: 偏移量
+
+    请求头 Accept 为 application/x-ndjson 时逐行流式返回任务，总数在 X-Total-Count 响应头中
     """
     logger.info(f"获取索引列表: status={status}, limit={limit}, offset={offset}")
 
@@ -338,39 +399,71 @@ async def get_index_list(
         if status:
             query = query.filter(IndexJobModel.status == get_enum_value(status))
 
-        # 获取总数
-        total = query.count()
+        if accepts_ndjson(request):
+            index_jobs, total = iter_page_with_total(
+                query, IndexJobModel.created_at.desc(), limit, offset
+            )
+            return ndjson_page_response(
+                (IndexJobInfo.model_validate(job).model_dump(mode='json') for job in index_jobs),
+                total, limit, offset
+            )
 
-        # 分页查询
-        index_jobs = query.order_by(
-            IndexJobModel.created_at.desc()
-        ).offset(offset).limit(limit).all()
+        # 分页查询（同一条查询带出总数）
+        index_jobs, total = paginate_with_total(
+            query, IndexJobModel.created_at.desc(), limit, offset
+        )
 
-        # 转换为响应格式
-        job_list = [
-            IndexJobInfo(**job.to_dict())
-            for job in index_jobs
-        ]
+        # 转换为响应格式（批量从ORM属性校验）
+        job_list = index_job_adapter.validate_python(index_jobs, from_attributes=True)
 
         logger.info(f"返回索引列表: 数量={len(job_list)}, 总计={total}")
 
-        return IndexListResponse(
+        # 列表未变化时返回304
+        return etag_json_response(request, IndexListResponse.model_construct(
             data={
-                "indexes": [job.dict() for job in job_list],
+                "indexes": index_job_adapter.dump_python(job_list),
                 "total": total,
                 "limit": limit,
                 "offset": offset
             },
             message=i18n.t('index.list_success', locale)
-        )
+        ).model_dump(mode='json'))
 
     except Exception as e:
         logger.error(f"获取索引列表失败: {str(e)}")
         raise HTTPException(status_code=500, detail=i18n.t('index.list_failed', locale) + f": {str(e)}")
 
 
+def _delete_folder_files(db: Session, folder_path: str) -> List[str]:
+    """
+    删除文件夹下的全部文件记录（不提交事务）
+
+    Args:
+        db: 数据库会话
+        folder_path: 索引文件夹路径
+
+    Returns:
+        List[str]: 被删除文件的路径
+    """
+    folder_filter = FileModel.path_prefix_filter(folder_path)
+
+    # 单条 DELETE ... RETURNING 完成删除并带回路径，只扫描一次路径前缀
+    if db.get_bind().dialect.delete_returning:
+        stmt = delete(FileModel).where(*folder_filter).returning(FileModel.file_path)
+        return list(db.execute(stmt, execution_options={"synchronize_session": False}).scalars())
+
+    # 旧版SQLite不支持RETURNING：一次扫描取出ID和路径，再按主键分批删除
+    files_to_delete = db.query(FileModel.id, FileModel.file_path).filter(*folder_filter).all()
+    file_ids = [file_record.id for file_record in files_to_delete]
+    for start in range(0, len(file_ids), FILE_DELETE_BATCH_SIZE):
+        db.query(FileModel).filter(
+            FileModel.id.in_(file_ids[start:start + FILE_DELETE_BATCH_SIZE])
+        ).delete(synchronize_session=False)
+    return [file_record.file_path for file_record in files_to_delete]
+
+
 @router.delete("/{index_id}", response_model=SuccessResponse, summary="删除索引")
-async def delete_index(
+def delete_index(
     index_id: int,
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
@@ -398,19 +491,9 @@ async def delete_index(
             index_job.fail_job(i18n.t('index.task_stopped_manually_delete', locale))
             logger.info(f"停止正在运行的索引任务: id={index_id}")
 
-        # 删除相关的文件索引记录
-        deleted_files = db.query(FileModel).filter(
-            FileModel.file_path.like(f"{folder_path}%")
-        ).count()
-
-        # 获取要删除的文件列表，用于清理索引
-        files_to_delete = db.query(FileModel).filter(
-            FileModel.file_path.like(f"{folder_path}%")
-        ).all()
-
-        db.query(FileModel).filter(
-            FileModel.file_path.like(f"{folder_path}%")
-        ).delete()
+        # 删除相关的文件索引记录，返回的路径用于清理索引
+        deleted_paths = _delete_folder_files(db, folder_path)
+        deleted_files = len(deleted_paths)
 
         # 清理向量索引和全文索引
         index_service = get_file_index_service()
@@ -419,8 +502,8 @@ async def delete_index(
 
         try:
             # 删除文件索引
-            for file_record in files_to_delete:
-                result = index_service.delete_file_from_index(file_record.file_path)
+            for file_path in deleted_paths:
+                result = index_service.delete_file_from_index(file_path)
                 if result.get('success', False):
                     index_deleted += 1
 
@@ -438,10 +521,11 @@ async def delete_index(
         # 删除索引任务
         db.delete(index_job)
         db.commit()
+        index_service.reset_status_cache()
 
         logger.info(f"索引删除完成: id={index_id}, 数据库文件数={deleted_files}, 文件索引数={index_deleted}, 分块索引数={chunk_deleted}")
 
-        return SuccessResponse(
+        return SuccessResponse.model_construct(
             data={
                 "deleted_index_id": index_id,
                 "deleted_files_count": deleted_files,
@@ -460,7 +544,7 @@ async def delete_index(
 
 
 @router.post("/{index_id}/stop", response_model=SuccessResponse, summary="停止索引")
-async def stop_index(
+def stop_index(
     index_id: int,
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
@@ -497,7 +581,7 @@ async def stop_index(
 
         logger.info(f"索引任务已停止: id={index_id}")
 
-        return SuccessResponse(
+        return SuccessResponse.model_construct(
             data={
                 "stopped_index_id": index_id,
                 "processed_files": index_job.processed_files,
@@ -516,7 +600,6 @@ async def stop_index(
 @router.post("/backup", response_model=SuccessResponse, summary="备份索引")
 async def backup_index(
     backup_name: Optional[str] = None,
-    db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
     """
@@ -534,7 +617,7 @@ async def backup_index(
         backup_result = index_service.backup_indexes(backup_name)
 
         if backup_result['success']:
-            return SuccessResponse(
+            return SuccessResponse.model_construct(
                 data=backup_result,
                 message=i18n.t('index.backup_success', locale)
             )
@@ -547,7 +630,8 @@ async def backup_index(
 
 
 @router.get("/files", summary="已索引文件列表")
-async def get_indexed_files(
+def get_indexed_files(
+    request: Request,
     folder_path: Optional[str] = None,
     file_type: Optional[str] = None,
     index_status: Optional[str] = None,
@@ -564,6 +648,8 @@ async def get_indexed_files(
     - **index_status**: 索引状态过滤
     - **limit**: 返回结果数量
     - **offset**: 偏移量
+
+    请求头 Accept 为 application/x-ndjson 时逐行流式返回文件，总数在 X-Total-Count 响应头中
     """
     logger.info(f"获取已索引文件: folder={folder_path}, type={file_type}, status={index_status}")
 
@@ -573,19 +659,24 @@ async def get_indexed_files(
 
         # 应用过滤条件
         if folder_path:
-            query = query.filter(FileModel.file_path.like(f"{folder_path}%"))
+            query = query.filter(*FileModel.path_prefix_filter(folder_path))
         if file_type:
             query = query.filter(FileModel.file_type == file_type)
         if index_status:
             query = query.filter(FileModel.index_status == index_status)
 
-        # 获取总数
-        total = query.count()
+        if accepts_ndjson(request):
+            files, total = iter_page_with_total(
+                query, FileModel.indexed_at.desc(), limit, offset
+            )
+            return ndjson_page_response(
+                (file.to_dict() for file in files), total, limit, offset
+            )
 
-        # 分页查询
-        files = query.order_by(
-            FileModel.indexed_at.desc()
-        ).offset(offset).limit(limit).all()
+        # 分页查询（同一条查询带出总数）
+        files, total = paginate_with_total(
+            query, FileModel.indexed_at.desc(), limit, offset
+        )
 
         # 转换为响应格式
         file_list = [file.to_dict() for file in files]
@@ -609,7 +700,7 @@ async def get_indexed_files(
 
 
 @router.delete("/files/{file_id}", response_model=SuccessResponse, summary="删除文件索引")
-async def delete_file_index(
+def delete_file_index(
     file_id: int,
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
@@ -639,7 +730,7 @@ async def delete_file_index(
             db.delete(file_model)
             db.commit()
 
-            return SuccessResponse(
+            return SuccessResponse.model_construct(
                 data={
                     "deleted_file_id": file_id,
                     "file_path": file_model.file_path
@@ -656,6 +747,33 @@ async def delete_file_index(
         raise HTTPException(status_code=500, detail=i18n.t('index.file_delete_failed', locale) + f": {str(e)}")
 
 
+def fail_interrupted_index_jobs() -> int:
+    """
+    将上次进程退出时仍在待处理/处理中的索引任务标记为失败
+
+    索引任务作为后台任务在服务进程内执行，进程重启后不会继续；不处理的话
+    这些任务会一直显示为进行中，并使同一文件夹无法再次创建或更新索引
+
+    Returns:
+        int: 被标记为失败的任务数
+    """
+    db = SessionLocal()
+    try:
+        failed_count = db.query(IndexJobModel).filter(
+            IndexJobModel.status.in_([get_enum_value(JobStatus.PENDING), get_enum_value(JobStatus.PROCESSING)])
+        ).update({
+            IndexJobModel.status: get_enum_value(JobStatus.FAILED),
+            IndexJobModel.completed_at: datetime.now(),
+            IndexJobModel.error_message: "服务重启，任务已中断"
+        }, synchronize_session=False)
+        db.commit()
+        if failed_count:
+            logger.warning(f"已将 {failed_count} 个中断的索引任务标记为失败")
+        return failed_count
+    finally:
+        db.close()
+
+
 async def run_full_index_task(
     index_id: int,
     folder_path: str,
@@ -2,12 +2,24 @@
 搜索服务API路由
 提供文件搜索相关的API接口，集成AI模型功能
 """
+import asyncio
+import os
+import re
+import shutil
+import tempfile
 import time
+from collections import defaultdict
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Header
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Header, BackgroundTasks, Request
+from fastapi.responses import ORJSONResponse
+from PIL import Image
+from pydantic import TypeAdapter
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.core.config import get_settings
 from app.core.logging_config import get_logger
 from app.core.i18n import i18n, get_locale_from_header
@@ -19,25 +31,178 @@ from app.schemas.responses import (
 from app.schemas.enums import InputType, SearchType, FileType
 from app.models.search_history import SearchHistoryModel
 from app.utils.enum_helpers import get_enum_value, is_semantic_search, is_hybrid_search, is_text_input, is_voice_input, is_image_input
+from app.utils.pagination import paginate_with_total, iter_page_with_total
+from app.utils.http_cache import etag_json_response
+from app.utils.ndjson import accepts_ndjson, ndjson_page_response
 from app.services.chunk_search_service import get_chunk_search_service
 from app.services.ai_model_manager import ai_model_service
 from app.services.llm_query_enhancer import get_llm_query_enhancer
-from app.services.image_search_service import get_image_search_service
+from app.services.image_search_service import get_image_search_service, ensure_image_search_service
+from app.services.search_history_writer import get_search_history_writer
+from app.services.search_stats import get_today_search_counter
+from app.services.search_suggestions import get_cold_suggestion_queries, get_suggestion_result_cache
 
-router = APIRouter(prefix="/api/search", tags=["搜索服务"])
+router = APIRouter(prefix="/api/search", tags=["搜索服务"], default_response_class=ORJSONResponse)
 logger = get_logger(__name__)
 settings = get_settings()
 
+# 搜索历史列表批量校验/序列化适配器
+search_history_adapter = TypeAdapter(List[SearchHistoryInfo])
+# 搜索结果列表批量序列化适配器
+search_result_adapter = TypeAdapter(List[SearchResult])
+
+# 上传文件转存到临时文件时的分块大小(字节)
+UPLOAD_COPY_CHUNK_SIZE = 1024 * 1024
+
 
 def get_locale(accept_language: Optional[str] = Header(None)) -> str:
     """从请求头获取语言设置"""
     return get_locale_from_header(accept_language)
 
 
+def _spool_upload_to_temp(upload_file: UploadFile, suffix: str) -> str:
+    """
+    将上传文件分块复制到临时文件，避免整体读入内存
+
+    Args:
+        upload_file: 上传的文件
+        suffix: 临时文件后缀
+
+    Returns:
+        str: 临时文件路径，由调用方负责删除
+    """
+    upload_file.file.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+        shutil.copyfileobj(upload_file.file, temp_file, UPLOAD_COPY_CHUNK_SIZE)
+    return temp_file.name
+
+
+def _open_upload_image(upload_file: UploadFile) -> Image.Image:
+    """
+    直接从上传文件流打开图片，避免先整体读成字节
+
+    Args:
+        upload_file: 上传的文件
+
+    Returns:
+        Image.Image: PIL图像
+    """
+    upload_file.file.seek(0)
+    image = Image.open(upload_file.file)
+    image.load()
+    return image
+
+
+def save_search_history(record: dict):
+    """
+    单条写入搜索历史（后台任务）
+
+    批量写入器不可用时的兜底路径，使用独立的数据库会话
+
+    Args:
+        record: 搜索历史字段字典
+    """
+    db = SessionLocal()
+    try:
+        db.add(SearchHistoryModel(**record))
+        db.commit()
+        get_today_search_counter().record([record['created_at']])
+        get_suggestion_result_cache().clear()
+        if record.get('result_count'):
+            get_cold_suggestion_queries().discard_matching([record['search_query']])
+    except Exception as e:
+        logger.warning(f"保存搜索历史失败: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def record_search_history(background_tasks: BackgroundTasks, **fields):
+    """
+    记录一条搜索历史
+
+    优先放入批量写入队列；写入器未运行或队列已满时，退回到响应后的单条写入
+
+    Args:
+        background_tasks: 请求的后台任务集合
+        **fields: 搜索历史字段
+    """
+    record = dict(fields, created_at=datetime.now())
+    if not get_search_history_writer().enqueue(record):
+        background_tasks.add_task(save_search_history, record)
+
+
+def build_search_result(item: dict) -> SearchResult:
+    """
+    将分块搜索服务返回的结果字典转换为SearchResult
+
+    文本搜索和语音搜索共用，缺失字段使用默认值
+
+    Args:
+        item: 搜索服务返回的单条结果
+
+    Returns:
+        SearchResult: 搜索结果模型
+    """
+    get = item.get
+    return SearchResult(
+        file_id=get('file_id', 0),
+        file_name=get('file_name', ''),
+        file_path=get('file_path', ''),
+        file_type=get('file_type', ''),
+        relevance_score=get('relevance_score', 0.0),
+        preview_text=get('preview_text', ''),
+        highlight=get('highlight', ''),
+        created_at=get('created_at', ''),
+        modified_at=get('modified_at', ''),
+        file_size=get('file_size', 0),
+        match_type=get('match_type', '')
+    )
+
+
+async def resolve_search_models_used(search_type, llm_enhanced: bool) -> List[str]:
+    """
+    解析一次搜索实际使用的模型名称
+
+    LLM和嵌入模型的查询互不依赖，并发执行
+
+    Args:
+        search_type: 搜索类型
+        llm_enhanced: 查询是否经过LLM增强
+
+    Returns:
+        List[str]: 使用的模型名称列表
+    """
+    use_embedding = is_semantic_search(search_type) or is_hybrid_search(search_type)
+
+    llm_model, embedding_model = await asyncio.gather(
+        ai_model_service.get_model("llm") if llm_enhanced else _no_model(),
+        ai_model_service.get_model("embedding") if use_embedding else _no_model()
+    )
+
+    models_used = []
+    if llm_enhanced:
+        llm_model_name = llm_model.model_name if llm_model else "qwen2.5:1.5b"
+        models_used.append(f"{llm_model_name}(LLM增强)")
+    if use_embedding:
+        models_used.append(embedding_model.model_name if embedding_model else "BGE-M3")
+
+    # 如果是混合搜索，还有全文搜索
+    if is_hybrid_search(search_type):
+        models_used.append("Whoosh")  # Whoosh是搜索引擎，不是AI模型
+
+    return models_used
+
+
+async def _no_model():
+    """占位协程，对应本次搜索未使用的模型"""
+    return None
+
+
 @router.post("/", response_model=SearchResponse, summary="文本搜索")
 async def search_files(
     request: SearchRequest,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
     locale: str = Depends(get_locale)
 ):
     """
@@ -52,29 +217,29 @@ async def search_files(
     - **threshold**: 相似度阈值 (0.0-1.0)
     - **file_types**: 文件类型过滤
     """
-    start_time = time.time()
     # 使用枚举辅助函数确保类型安全
     search_type_str = get_enum_value(request.search_type)
+    is_text_query = is_text_input(request.input_type)
     logger.info(f"收到搜索请求: query='{request.query}', type={search_type_str}")
 
     try:
         # 获取分块搜索服务
         search_service = get_chunk_search_service()
+        service_ready = search_service.is_ready()
 
-        # 调试信息
-        logger.info(f"搜索服务状态: is_ready={search_service.is_ready()}")
-        logger.info(f"索引状态: {search_service.get_index_info()}")
+        logger.debug("搜索服务状态: is_ready={}", service_ready)
 
         # 检查搜索服务是否就绪
-        if not search_service.is_ready():
-            logger.warning("搜索服务未就绪，返回空结果")
-            return SearchResponse(
+        if not service_ready:
+            # 索引状态需要打开Whoosh索引统计文档数，仅在未就绪时输出用于排查
+            logger.warning("搜索服务未就绪，返回空结果，索引状态: {}", search_service.get_index_info())
+            return SearchResponse.model_construct(
                 data={
                     "results": [],
                     "total": 0,
                     "search_time": 0,
                     "query_used": request.query,
-                    "input_processed": not is_text_input(request.input_type),
+                    "input_processed": not is_text_query,
                     "ai_models_used": [],
                     "error": i18n.t('search.service_not_ready', locale)
                 },
@@ -85,11 +250,11 @@ async def search_files(
         enhanced_query = request.query
         query_enhancer = get_llm_query_enhancer()
 
-        if is_text_input(request.input_type):
+        if is_text_query:
             try:
                 # 使用LLM增强查询
                 enhancement_result = await query_enhancer.enhance_query(request.query)
-                logger.info(f"增强结果： {enhancement_result} ")
+                logger.debug("增强结果： {}", enhancement_result)
                 if enhancement_result.get('success', False) and enhancement_result.get('enhanced', False):
                     # 根据搜索类型选择最佳查询
                     if is_semantic_search(request.search_type):
@@ -122,65 +287,38 @@ async def search_files(
 
         # 处理搜索结果数据格式
         search_result = search_result_data.get('data', {})
-        results = []
-        for item in search_result.get('results', []):
-            search_result_item = SearchResult(
-                file_id=item.get('file_id', 0),
-                file_name=item.get('file_name', ''),
-                file_path=item.get('file_path', ''),
-                file_type=item.get('file_type', ''),
-                relevance_score=item.get('relevance_score', 0.0),
-                preview_text=item.get('preview_text', ''),
-                highlight=item.get('highlight', ''),
-                created_at=item.get('created_at', ''),
-                modified_at=item.get('modified_at', ''),
-                file_size=item.get('file_size', 0),
-                match_type=item.get('match_type', '')
-            )
-            results.append(search_result_item)
+        results = [build_search_result(item) for item in search_result.get('results', [])]
 
         # 计算响应时间和使用的AI模型
         response_time = search_result.get('search_time', 0)
         ai_models_used = []
 
-        # 记录LLM查询增强
-        if enhanced_query != request.query:
-            llm_model = await ai_model_service.get_model("llm")
-            llm_model_name = llm_model.model_name if llm_model else "qwen2.5:1.5b"
-            ai_models_used.append(f"{llm_model_name}(LLM增强)")
-
-        # 根据搜索类型记录使用的AI模型
-        if is_semantic_search(request.search_type) or is_hybrid_search(request.search_type):
-            embedding_model = await ai_model_service.get_model("embedding")
-            embedding_model_name = embedding_model.model_name if embedding_model else "BGE-M3"
-            ai_models_used.append(embedding_model_name)
-
-        # 如果是混合搜索，还有全文搜索
-        if is_hybrid_search(request.search_type):
-            ai_models_used.append("Whoosh")  # Whoosh是搜索引擎，不是AI模型
-
-        # 保存搜索历史
-        input_type_str = get_enum_value(request.input_type)
-        history_record = SearchHistoryModel(
+        # 记录LLM查询增强及根据搜索类型使用的AI模型
+        ai_models_used.extend(await resolve_search_models_used(
+            request.search_type,
+            llm_enhanced=enhanced_query != request.query
+        ))
+
+        # 保存搜索历史（批量异步写入）
+        record_search_history(
+            background_tasks,
             search_query=request.query,
-            input_type=input_type_str,
+            input_type=get_enum_value(request.input_type),
             search_type=search_type_str,
             ai_model_used=",".join(ai_models_used) if ai_models_used else "none",
             result_count=len(results),
             response_time=response_time
         )
-        db.add(history_record)
-        db.commit()
 
         logger.info(f"搜索完成: 结果数量={len(results)}, 耗时={response_time:.2f}秒")
 
-        return SearchResponse(
+        return SearchResponse.model_construct(
             data={
-                "results": [result.dict() for result in results],
+                "results": search_result_adapter.dump_python(results),
                 "total": search_result.get('total', 0),
                 "search_time": round(response_time, 2),
                 "query_used": request.query,
-                "input_processed": not is_text_input(request.input_type),
+                "input_processed": not is_text_query,
                 "ai_models_used": ai_models_used
             },
             message=i18n.t('search.search_complete', locale)
@@ -193,13 +331,13 @@ async def search_files(
 
 @router.post("/multimodal", response_model=MultimodalResponse, summary="多模态搜索")
 async def multimodal_search(
+    background_tasks: BackgroundTasks,
     input_type: InputType = Form(...),
     file: UploadFile = File(...),
     search_type: SearchType = Form(SearchType.HYBRID),
     limit: int = Form(settings.api.default_search_results),
     threshold: float = Form(settings.api.default_similarity_threshold),
     file_types: Optional[List[FileType]] = Form(None, description="文件类型过滤"),
-    db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
     """
@@ -214,7 +352,7 @@ async def multimodal_search(
     - **threshold**: 相似度阈值
     - **file_types**: 文件类型过滤
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     # 使用枚举辅助函数确保类型安全
     input_type_str = get_enum_value(input_type)
     search_type_str = get_enum_value(search_type)
@@ -234,9 +372,6 @@ async def multimodal_search(
                 detail=i18n.t('file.size_exceeds', locale, limit=f"{size_limit_mb}MB")
             )
 
-        # 读取文件内容
-        file_content = await file.read()
-
         # 使用AI模型服务处理多模态输入
         converted_text = ""
         confidence = 0.0
@@ -245,10 +380,15 @@ async def multimodal_search(
         if is_voice_input(input_type):
             # 语音转文字
             logger.info("使用语音识别模型进行语音识别")
-            transcription_result = await ai_model_service.speech_to_text(
-                file_content,
-                language="zh"
-            )
+            # 上传内容分块转存为临时音频文件（与按字节输入时一样按WAV处理）
+            audio_path = await run_in_threadpool(_spool_upload_to_temp, file, ".wav")
+            try:
+                transcription_result = await ai_model_service.speech_to_text(
+                    audio_path,
+                    language="zh"
+                )
+            finally:
+                os.remove(audio_path)
             converted_text = transcription_result.get("text", "")
             confidence = transcription_result.get("avg_confidence", 0.0)
 
@@ -263,11 +403,11 @@ async def multimodal_search(
 
             # 提取上传图片的特征向量
             try:
-                image_embedding = await ai_model_service.encode_image(file_content)
+                image = await run_in_threadpool(_open_upload_image, file)
+                image_embedding = await ai_model_service.encode_image(image)
 
                 if image_embedding is not None and len(image_embedding) > 0:
                     # 使用专门的图像搜索服务
-                    from app.services.image_search_service import ensure_image_search_service
                     image_search_service = await ensure_image_search_service()
 
                     # 执行CLIP图像向量搜索
@@ -277,7 +417,7 @@ async def multimodal_search(
                         threshold=threshold
                     )
 
-                    logger.info(f"执行CLIP图像向量搜索结果 : {search_result}")
+                    logger.debug("执行CLIP图像向量搜索结果 : {}", search_result)
 
                     if search_result.get('success', False):
                         search_results = search_result.get('data', {})
@@ -291,11 +431,9 @@ async def multimodal_search(
 
                         # 直接返回向量搜索结果，转换为SearchResult格式
                         image_results = []
+                        # 日期时间字段为空时统一使用当前时间
+                        now = datetime.now()
                         for item in search_results.get('results', []):
-                            # 处理日期时间字段，如果为空则使用当前时间
-                            from datetime import datetime
-                            now = datetime.now()
-
                             # 处理relevance_score - 使用相似度作为相关性分数，确保不超过1.0
                             relevance_score = item.get('similarity', 0.0)
                             if relevance_score == 0.0:
@@ -357,13 +495,12 @@ async def multimodal_search(
             # 获取分块搜索服务（完全复制文本搜索逻辑）
             search_service = get_chunk_search_service()
 
-            # 调试信息
-            logger.info(f"语音搜索服务状态: is_ready={search_service.is_ready()}")
-            logger.info(f"语音搜索索引状态: {search_service.get_index_info()}")
+            service_ready = search_service.is_ready()
+            logger.debug("语音搜索服务状态: is_ready={}", service_ready)
 
             # 检查搜索服务是否就绪
-            if not search_service.is_ready():
-                logger.warning("搜索服务未就绪，返回空结果")
+            if not service_ready:
+                logger.warning("搜索服务未就绪，返回空结果，索引状态: {}", search_service.get_index_info())
                 # 返回空结果但不抛出异常，保持与文本搜索一致
                 search_results = []
             else:
@@ -374,7 +511,7 @@ async def multimodal_search(
                 try:
                     # 使用LLM增强查询
                     enhancement_result = await query_enhancer.enhance_query(converted_text)
-                    logger.info(f"语音搜索LLM增强结果： {enhancement_result} ")
+                    logger.debug("语音搜索LLM增强结果： {}", enhancement_result)
                     if enhancement_result.get('success', False) and enhancement_result.get('enhanced', False):
                         # 根据搜索类型选择最佳查询
                         if is_semantic_search(search_type):
@@ -407,36 +544,13 @@ async def multimodal_search(
 
                 # 处理搜索结果数据格式（完全复制文本搜索逻辑）
                 search_result = search_result_data.get('data', {})
-                for item in search_result.get('results', []):
-                    search_results.append(SearchResult(
-                        file_id=item.get('file_id', 0),
-                        file_name=item.get('file_name', ''),
-                        file_path=item.get('file_path', ''),
-                        file_type=item.get('file_type', ''),
-                        relevance_score=item.get('relevance_score', 0.0),
-                        preview_text=item.get('preview_text', ''),
-                        highlight=item.get('highlight', ''),
-                        created_at=item.get('created_at', ''),
-                        modified_at=item.get('modified_at', ''),
-                        file_size=item.get('file_size', 0),
-                        match_type=item.get('match_type', '')
-                    ))
-
-                # 记录LLM查询增强
-                if enhanced_query != converted_text:
-                    llm_model = await ai_model_service.get_model("llm")
-                    llm_model_name = llm_model.model_name if llm_model else "qwen2.5:1.5b"
-                    ai_models_used.append(f"{llm_model_name}(LLM增强)")
-
-                # 根据搜索类型记录使用的AI模型
-                if is_semantic_search(search_type) or is_hybrid_search(search_type):
-                    embedding_model = await ai_model_service.get_model("embedding")
-                    embedding_model_name = embedding_model.model_name if embedding_model else "BGE-M3"
-                    ai_models_used.append(embedding_model_name)
-
-                # 如果是混合搜索，还有全文搜索
-                if is_hybrid_search(search_type):
-                    ai_models_used.append("Whoosh")  # Whoosh是搜索引擎，不是AI模型
+                search_results.extend(build_search_result(item) for item in search_result.get('results', []))
+
+                # 记录LLM查询增强及根据搜索类型使用的AI模型
+                ai_models_used.extend(await resolve_search_models_used(
+                    search_type,
+                    llm_enhanced=enhanced_query != converted_text
+                ))
 
                 logger.info(f"语音搜索完成: 结果数量={len(search_results)}, 搜索类型={get_enum_value(search_type)}")
 
@@ -447,10 +561,11 @@ async def multimodal_search(
             logger.warning("无法转换输入内容，跳过搜索")
 
         # 计算响应时间
-        response_time = time.time() - start_time
+        response_time = (time.perf_counter_ns() - start_ns) / 1_000_000_000
 
-        # 保存搜索历史
-        history_record = SearchHistoryModel(
+        # 保存搜索历史（批量异步写入）
+        record_search_history(
+            background_tasks,
             search_query=converted_text or "转换失败",
             input_type=input_type_str,
             search_type=search_type_str,
@@ -458,16 +573,14 @@ async def multimodal_search(
             result_count=len(search_results),
             response_time=response_time
         )
-        db.add(history_record)
-        db.commit()
 
         logger.info(f"多模态搜索完成: 转换文本='{converted_text}', 结果数量={len(search_results)}")
 
-        return MultimodalResponse(
+        return MultimodalResponse.model_construct(
             data={
                 "converted_text": converted_text,
                 "confidence": confidence,
-                "search_results": [result.dict() for result in search_results],
+                "search_results": search_result_adapter.dump_python(search_results),
                 "file_info": {
                     "filename": file.filename,
                     "size": file_size,
@@ -487,7 +600,8 @@ async def multimodal_search(
 
 
 @router.get("/history", response_model=SearchHistoryResponse, summary="搜索历史")
-async def get_search_history(
+def get_search_history(
+    request: Request,
     limit: int = 20,
     offset: int = 0,
     search_type: SearchType = None,
@@ -502,6 +616,8 @@ async def get_search_history(
     - **offset**: 偏移量
     - **search_type**: 搜索类型过滤
     - **input_type**: 输入类型过滤
+
+    请求头 Accept 为 application/x-ndjson 时逐行流式返回记录，总数在 X-Total-Count 响应头中
     """
     logger.info(f"获取搜索历史: limit={limit}, offset={offset}")
 
@@ -517,40 +633,35 @@ async def get_search_history(
             input_type_str = get_enum_value(input_type)
             query = query.filter(SearchHistoryModel.input_type == input_type_str)
 
-        # 获取总数
-        total = query.count()
-
-        # 分页查询
-        history_records = query.order_by(
-            SearchHistoryModel.created_at.desc()
-        ).offset(offset).limit(limit).all()
-
-        # 转换为响应格式
-        history_list = [
-            SearchHistoryInfo(
-                id=record.id,
-                search_query=record.search_query,
-                input_type=record.input_type,
-                search_type=record.search_type,
-                ai_model_used=record.ai_model_used,
-                result_count=record.result_count,
-                response_time=record.response_time,
-                created_at=record.created_at
+        if accepts_ndjson(request):
+            history_records, total = iter_page_with_total(
+                query, SearchHistoryModel.created_at.desc(), limit, offset
+            )
+            return ndjson_page_response(
+                (SearchHistoryInfo.model_validate(record).model_dump(mode='json') for record in history_records),
+                total, limit, offset
             )
-            for record in history_records
-        ]
+
+        # 分页查询（同一条查询带出总数）
+        history_records, total = paginate_with_total(
+            query, SearchHistoryModel.created_at.desc(), limit, offset
+        )
+
+        # 转换为响应格式（批量从ORM属性校验）
+        history_list = search_history_adapter.validate_python(history_records, from_attributes=True)
 
         logger.info(f"返回搜索历史: 数量={len(history_list)}, 总计={total}")
 
-        return SearchHistoryResponse(
+        # 历史未变化时返回304
+        return etag_json_response(request, SearchHistoryResponse.model_construct(
             data={
-                "history": [item.dict() for item in history_list],
+                "history": search_history_adapter.dump_python(history_list),
                 "total": total,
                 "limit": limit,
                 "offset": offset
             },
             message=i18n.t('search.history_found', locale)
-        )
+        ).model_dump(mode='json'))
 
     except Exception as e:
         logger.error(f"获取搜索历史失败: {str(e)}")
@@ -558,7 +669,7 @@ async def get_search_history(
 
 
 @router.delete("/history/{history_id}", summary="删除单条搜索历史")
-async def delete_search_history(
+def delete_search_history(
     history_id: int,
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
@@ -582,16 +693,18 @@ async def delete_search_history(
         # 删除记录
         db.delete(history_record)
         db.commit()
+        get_suggestion_result_cache().clear()
+        get_today_search_counter().invalidate()
 
         logger.info(f"搜索历史记录删除成功: ID={history_id}")
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": {
                 "deleted_id": history_id
             },
             "message": i18n.t('search.history_delete_success', locale)
-        }
+        })
 
     except HTTPException:
         raise
@@ -601,7 +714,7 @@ async def delete_search_history(
 
 
 @router.delete("/history", summary="清除搜索历史")
-async def clear_search_history(
+def clear_search_history(
     db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
@@ -611,28 +724,34 @@ async def clear_search_history(
     logger.info("清除搜索历史")
 
     try:
-        # 删除所有历史记录
-        deleted_count = db.query(SearchHistoryModel).count()
-        db.query(SearchHistoryModel).delete()
+        # 单条DELETE语句删除所有历史记录，直接使用其影响行数
+        deleted_count = db.query(SearchHistoryModel).delete(synchronize_session=False)
         db.commit()
+        get_suggestion_result_cache().clear()
+        get_today_search_counter().invalidate()
 
         logger.info(f"搜索历史清除完成: 删除数量={deleted_count}")
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": {
                 "deleted_count": deleted_count
             },
             "message": i18n.t('search.history_clear_success', locale)
-        }
+        })
 
     except Exception as e:
         logger.error(f"清除搜索历史失败: {str(e)}")
         raise HTTPException(status_code=500, detail=f"{i18n.t('search.history_clear_failed', locale)}: {str(e)}")
 
 
+# 搜索建议：触发历史记录/索引检索的最短查询长度
+SUGGESTION_MIN_QUERY_LENGTH = 2
+
+
 @router.get("/suggestions", summary="搜索建议")
 async def get_search_suggestions(
+    request: Request,
     query: str,
     limit: int = settings.api.max_search_suggestions,
     db: Session = Depends(get_db),
@@ -649,9 +768,6 @@ async def get_search_suggestions(
     logger.info(f"获取搜索建议: query='{query}', limit={limit}")
 
     try:
-        import re
-        from collections import defaultdict
-
         if not query or len(query.strip()) < 1:
             return {
                 "success": True,
@@ -663,21 +779,36 @@ async def get_search_suggestions(
             }
 
         query = query.strip()
+
+        # 连续输入时同一查询词会被反复请求，短时间内直接返回缓存结果
+        cached_data = get_suggestion_result_cache().get(query, limit)
+        if cached_data is not None:
+            return etag_json_response(request, {
+                "success": True,
+                "data": cached_data,
+                "message": "获取搜索建议成功"
+            })
+
         suggestions = []
         suggestion_sources = {}
 
-        # 1. 基于历史搜索记录的建议
-        history_suggestions = db.query(SearchHistoryModel).filter(
-            SearchHistoryModel.search_query.ilike(f"%{query}%"),
-            SearchHistoryModel.result_count > 0  # 只返回有结果的历史搜索
-        ).order_by(
-            SearchHistoryModel.created_at.desc()
-        ).limit(limit * 2).all()
+        # 过短或近期确认无匹配的查询词，跳过历史记录和索引检索
+        is_cold_query = len(query) < SUGGESTION_MIN_QUERY_LENGTH or get_cold_suggestion_queries().contains(query)
+
+        # 1. 基于历史搜索记录的建议（同步查询放到线程池执行，避免阻塞事件循环）
+        history_suggestions = [] if is_cold_query else await run_in_threadpool(
+            db.query(SearchHistoryModel.search_query).filter(
+                SearchHistoryModel.search_query.ilike(f"%{query}%"),
+                SearchHistoryModel.result_count > 0  # 只返回有结果的历史搜索
+            ).order_by(
+                SearchHistoryModel.created_at.desc()
+            ).limit(limit * 2).all
+        )
 
         # 统计频率和权重
         query_freq = defaultdict(int)
-        for history in history_suggestions:
-            query_freq[history.search_query] += 1
+        for (search_query,) in history_suggestions:
+            query_freq[search_query] += 1
 
         # 按频率排序并添加到建议中
         for search_query, freq in sorted(query_freq.items(), key=lambda x: x[1], reverse=True):
@@ -690,7 +821,7 @@ async def get_search_suggestions(
         # 2. 基于文件标题和关键词的建议
         try:
             search_service = get_chunk_search_service()
-            if search_service.is_ready():
+            if not is_cold_query and search_service.is_ready():
                 # 执行快速的前缀搜索，只返回标题匹配
                 prefix_results = await search_service.search(
                     query=query,
@@ -728,6 +859,10 @@ async def get_search_suggestions(
                                 suggestions.append(keyword)
                                 suggestion_sources[keyword] = "文件关键词"
 
+                # 历史记录和索引都没有匹配，记为冷查询
+                if not suggestions:
+                    get_cold_suggestion_queries().add(query)
+
         except Exception as e:
             logger.warning(f"搜索服务获取建议失败: {str(e)}")
 
@@ -753,14 +888,17 @@ async def get_search_suggestions(
                     suggestion_sources[pattern] = "智能补全"
 
         # 4. 如果还是没有足够建议，提供热门搜索关键词
+        #    （聚合查询同样放到线程池执行）
         if len(suggestions) < limit:
-            hot_keywords = db.query(SearchHistoryModel.search_query).filter(
-                SearchHistoryModel.result_count > 0
-            ).group_by(
-                SearchHistoryModel.search_query
-            ).order_by(
-                db.func.count(SearchHistoryModel.id).desc()
-            ).limit(limit - len(suggestions)).all()
+            hot_keywords = await run_in_threadpool(
+                db.query(SearchHistoryModel.search_query).filter(
+                    SearchHistoryModel.result_count > 0
+                ).group_by(
+                    SearchHistoryModel.search_query
+                ).order_by(
+                    func.count(SearchHistoryModel.id).desc()
+                ).limit(limit - len(suggestions)).all
+            )
 
             for (keyword,) in hot_keywords:
                 if keyword not in suggestions:
@@ -772,15 +910,18 @@ async def get_search_suggestions(
 
         logger.info(f"搜索建议完成: query='{query}', 建议数量={len(suggestions)}")
 
-        return {
+        data = {
+            "suggestions": suggestions,
+            "query": query,
+            "sources": list({suggestion_sources.get(s, "未知") for s in suggestions[:3]})  # 显示前3个建议的来源
+        }
+        get_suggestion_result_cache().put(query, limit, data)
+
+        return etag_json_response(request, {
             "success": True,
-            "data": {
-                "suggestions": suggestions,
-                "query": query,
-                "sources": {suggestion_sources.get(s, "未知") for s in suggestions[:3]}  # 显示前3个建议的来源
-            },
+            "data": data,
             "message": "获取搜索建议成功"
-        }
+        })
 
     except Exception as e:
         logger.error(f"获取搜索建议失败: {str(e)}")
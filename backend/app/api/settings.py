@@ -3,8 +3,10 @@
 提供动态配置的增删改查功能
 """
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query, Header, Depends
+from functools import lru_cache
+from typing import Any, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Header, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
 
 from app.services.settings_service import settings_service
 from app.schemas.requests import (
@@ -18,10 +20,40 @@ from app.schemas.responses import (
     MessageResponse
 )
 from app.core.i18n import i18n, get_locale_from_header
+from app.utils.http_cache import cache_headers, is_not_modified, not_modified_response
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/settings", tags=["设置管理"])
+router = APIRouter(prefix="/api/settings", tags=["设置管理"], default_response_class=ORJSONResponse)
+
+
+# 查询参数默认值中可识别的布尔字面量（小写）
+_BOOL_DEFAULT_VALUES = {'true': True, 'false': False}
+
+
+@lru_cache(maxsize=1024)
+def _parse_default_value(default: str) -> Any:
+    """
+    解析查询参数中的默认值字符串，结果按字符串缓存
+
+    Args:
+        default: 默认值字符串（非空）
+
+    Returns:
+        Any: 布尔值、整数、浮点数，无法识别时返回原字符串
+    """
+    bool_value = _BOOL_DEFAULT_VALUES.get(default.lower())
+    if bool_value is not None:
+        return bool_value
+    if default.isdigit():
+        return int(default)
+    if '.' in default and default.replace('.', '').isdigit():
+        try:
+            return float(default)
+        except ValueError:
+            # 形如 "1.2.3" 的字符串不是合法浮点数，按原字符串处理
+            return default
+    return default
 
 
 def get_locale(accept_language: Optional[str] = Header(None)) -> str:
@@ -30,23 +62,30 @@ def get_locale(accept_language: Optional[str] = Header(None)) -> str:
 
 
 @router.get("/", response_model=List[SettingResponse])
-async def get_all_settings(locale: str = Depends(get_locale)):
+async def get_all_settings(request: Request, response: Response, locale: str = Depends(get_locale)):
     """
     获取所有设置项
 
     Returns:
         List[SettingResponse]: 所有设置项列表
     """
+    # 设置版本未变化时直接返回304，不读取设置
+    etag = settings_service.etag
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(cache_headers(etag))
+
     try:
         settings = settings_service.get_all_settings()
-        return [SettingResponse(**setting) for setting in settings]
+        # 路由的response_model会再做一次校验，这里直接构造避免重复校验
+        return [SettingResponse.model_construct(**setting) for setting in settings]
     except Exception as e:
         logger.error(f"获取所有设置失败: {str(e)}")
         raise HTTPException(status_code=500, detail=i18n.t('config.get_all_failed', locale, error=str(e)))
 
 
 @router.get("/{key}", response_model=SettingResponse)
-async def get_setting(key: str, locale: str = Depends(get_locale)):
+async def get_setting(key: str, request: Request, response: Response, locale: str = Depends(get_locale)):
     """
     获取指定设置项
 
@@ -56,11 +95,18 @@ async def get_setting(key: str, locale: str = Depends(get_locale)):
     Returns:
         SettingResponse: 指定的设置项
     """
+    # 先取版本再读数据，读取期间发生写操作时只会返回较旧的ETag，不会误判为未修改
+    etag = settings_service.etag
+
     try:
+        # 设置项读取走内存缓存，先确认存在再比较ETag，不存在的键不会因 If-None-Match 返回304
         setting = settings_service.get_setting(key)
         if not setting:
             raise HTTPException(status_code=404, detail=i18n.t('config.get_not_exist', locale, key=key))
-        return SettingResponse(**setting)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        response.headers.update(cache_headers(etag))
+        return SettingResponse.model_construct(**setting)
     except HTTPException:
         raise
     except Exception as e:
@@ -86,19 +132,14 @@ async def get_setting_value(
     """
     try:
         # 解析默认值
-        parsed_default = default
-        if default and default.lower() in ('true', 'false'):
-            parsed_default = default.lower() == 'true'
-        elif default and default.isdigit():
-            parsed_default = int(default)
-        elif default and '.' in default and default.replace('.', '').isdigit():
-            parsed_default = float(default)
-
-        value = settings_service.get_setting_value(key, parsed_default)
+        parsed_default = _parse_default_value(default) if default else default
+
+        # 只查一次设置项，同时决定取值和是否存在
+        setting = settings_service.get_setting(key)
         return {
             "key": key,
-            "value": value,
-            "exists": settings_service.get_setting(key) is not None
+            "value": settings_service.parse_setting_value(setting, parsed_default),
+            "exists": setting is not None
         }
     except Exception as e:
         logger.error(f"获取设置值 {key} 失败: {str(e)}")
@@ -142,7 +183,7 @@ async def create_setting(request: CreateSettingRequest, locale: str = Depends(ge
             setting_type=request.type,
             description=request.description
         )
-        return SettingResponse(**setting)
+        return SettingResponse.model_construct(**setting)
     except HTTPException:
         raise
     except Exception as e:
@@ -164,7 +205,7 @@ async def update_setting(key: str, request: UpdateSettingRequest, locale: str =
     """
     try:
         setting = settings_service.update_setting(key, request.value)
-        return SettingResponse(**setting)
+        return SettingResponse.model_construct(**setting)
     except HTTPException:
         raise
     except Exception as e:
@@ -186,9 +227,9 @@ async def delete_setting(key: str, locale: str = Depends(get_locale)):
     try:
         success = settings_service.delete_setting(key)
         if success:
-            return MessageResponse(message=i18n.t('config.delete_success', locale, key=key))
+            return MessageResponse.model_construct(message=i18n.t('config.delete_success', locale, key=key))
         else:
-            return MessageResponse(message=i18n.t('config.delete_not_exist', locale, key=key))
+            return MessageResponse.model_construct(message=i18n.t('config.delete_not_exist', locale, key=key))
     except HTTPException:
         raise
     except Exception as e:
@@ -208,18 +249,9 @@ async def batch_create_settings(request: BatchCreateRequest, locale: str = Depen
         List[SettingResponse]: 创建的设置项列表
     """
     try:
-        # 转换数据格式
-        settings_data = []
-        for setting in request.settings:
-            settings_data.append({
-                'key': setting.get('key'),
-                'value': setting.get('value'),
-                'type': setting.get('type', 'string'),
-                'description': setting.get('description')
-            })
-
-        created_settings = settings_service.batch_create_settings(settings_data)
-        return [SettingResponse(**setting) for setting in created_settings]
+        # 请求中的设置字典字段与服务层一致，直接传入
+        created_settings = settings_service.batch_create_settings(request.settings)
+        return [SettingResponse.model_construct(**setting) for setting in created_settings]
     except Exception as e:
         logger.error(f"批量创建设置失败: {str(e)}")
         raise HTTPException(status_code=500, detail=i18n.t('config.batch_create_failed', locale, error=str(e)))
@@ -238,7 +270,7 @@ async def reset_to_defaults(request: ResetRequest, locale: str = Depends(get_loc
     """
     try:
         result = settings_service.reset_to_defaults(request.default_settings)
-        return MessageResponse(
+        return MessageResponse.model_construct(
             message=result.get("message", i18n.t('settings.reset_complete', locale)),
             data=result
         )
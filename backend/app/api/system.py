@@ -2,30 +2,217 @@
 系统管理API路由
 提供系统健康检查API接口
 """
-import psutil
-from datetime import datetime
-from typing import Optional
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
 from fastapi import APIRouter, Depends, Header
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
-from app.core.database import get_db, get_database_info
+from app.core.database import get_db
 from app.core.logging_config import get_logger
 from app.core.i18n import i18n, get_locale_from_header
 from app.schemas.responses import HealthResponse
+from app.models.index_job import IndexJobModel
+from app.models.search_history import SearchHistoryModel
+from app.services.system_monitor import get_system_monitor
+from app.services.search_stats import get_today_search_counter
 
 router = APIRouter(prefix="/api/system", tags=["系统管理"])
 logger = get_logger(__name__)
 
+# 依赖的服务模块在导入时加载一次；加载失败时置为None，接口返回降级状态
+try:
+    from app.services.ai_model_manager import ai_model_service
+except Exception as e:
+    logger.warning(f"AI模型服务模块加载失败: {str(e)}")
+    ai_model_service = None
+
+try:
+    from app.services.chunk_search_service import get_chunk_search_service
+except Exception as e:
+    logger.warning(f"分块搜索服务模块加载失败: {str(e)}")
+    get_chunk_search_service = None
+
+try:
+    from app.services.file_index_service import get_file_index_service
+except Exception as e:
+    logger.warning(f"文件索引服务模块加载失败: {str(e)}")
+    get_file_index_service = None
+
+# 系统接口中不带参数的固定文案，启动时按语言预先取出
+_STATIC_TEXT_KEYS = (
+    'system.model_service_error',
+    'system.health_check_complete',
+    'system.health_check_failed',
+    'system.normal',
+    'system.abnormal',
+    'system.waiting_index',
+)
+_static_texts: Dict[str, Dict[str, str]] = {
+    locale: {key: i18n.t(key, locale) for key in _STATIC_TEXT_KEYS}
+    for locale in i18n.get_available_locales()
+}
+
 
 def get_locale(accept_language: Optional[str] = Header(None)) -> str:
     """从请求头获取语言设置"""
     return get_locale_from_header(accept_language)
 
 
+def _static_text(key: str, locale: str) -> str:
+    """
+    获取预先取出的固定文案
+
+    Args:
+        key: 翻译键，需在 _STATIC_TEXT_KEYS 中
+        locale: 语言代码
+
+    Returns:
+        str: 翻译后的文本
+    """
+    texts = _static_texts.get(locale)
+    return texts[key] if texts is not None else i18n.t(key, locale)
+
+
+def _count_searches_on(db: Session, day: date) -> int:
+    """
+    统计指定日期的搜索次数
+
+    Args:
+        db: 数据库会话
+        day: 日期
+
+    Returns:
+        int: 搜索次数
+    """
+    # 按当天的时间区间过滤，可以直接使用 created_at 索引做范围查找
+    day_start = datetime.combine(day, datetime.min.time())
+    return db.execute(
+        select(func.count()).select_from(SearchHistoryModel).where(
+            SearchHistoryModel.created_at >= day_start,
+            SearchHistoryModel.created_at < day_start + timedelta(days=1)
+        )
+    ).scalar()
+
+
+def _load_running_counters(db: Session) -> Tuple[int, Optional[datetime]]:
+    """
+    取出今日搜索次数和最近索引任务完成时间（供运行状态接口在线程中调用）
+
+    今日搜索次数优先读取内存计数，只在首次读取、跨天或历史被删除后统计数据库
+
+    Args:
+        db: 数据库会话
+
+    Returns:
+        Tuple[int, Optional[datetime]]: (今日搜索次数, 最近完成时间)，没有已完成任务时为None
+    """
+    today_searches = get_today_search_counter().get(lambda day: _count_searches_on(db, day))
+    last_completed_at = db.execute(
+        select(func.max(IndexJobModel.completed_at)).where(IndexJobModel.status == 'completed')
+    ).scalar()
+    return today_searches, last_completed_at
+
+
+async def _get_ai_models_status(locale: str) -> Dict[str, Any]:
+    """
+    获取AI模型状态，服务不可用时返回默认状态
+
+    Args:
+        locale: 语言代码
+
+    Returns:
+        Dict[str, Any]: AI模型状态
+    """
+    try:
+        # 尝试获取AI模型服务状态
+        if ai_model_service is None:
+            raise RuntimeError("AI模型服务模块未加载")
+        return await ai_model_service.get_model_status()
+    except Exception as e:
+        logger.warning(f"无法获取AI模型状态: {str(e)}")
+        # 提供默认状态
+        model_error = _static_text('system.model_service_error', locale)
+        return {
+            "error": i18n.t('system.model_service_unavailable', locale, error=str(e)),
+            "bge_m3": {"status": "unknown", "error": model_error},
+            "faster_whisper": {"status": "unknown", "error": model_error},
+            "cn_clip": {"status": "unknown", "error": model_error}
+        }
+
+
+def _load_index_info() -> Dict[str, Any]:
+    """读取分块搜索服务的索引信息（在线程中调用）"""
+    if get_chunk_search_service is None:
+        raise RuntimeError("分块搜索服务模块未加载")
+    return get_chunk_search_service().get_index_info()
+
+
+async def _get_indexes_status(check_time: str) -> Dict[str, Any]:
+    """
+    获取索引状态，读取失败时返回错误状态
+
+    Args:
+        check_time: 本次检查的时间戳
+
+    Returns:
+        Dict[str, Any]: Faiss和Whoosh索引状态
+    """
+    try:
+        index_info = await asyncio.to_thread(_load_index_info)
+
+        # 转换索引状态格式
+        return {
+            "faiss_index": {
+                "status": "ready" if index_info.get('chunk_faiss_available') else "not_available",
+                "document_count": index_info.get('chunk_faiss_doc_count', 0),
+                "index_size": f"{index_info.get('chunk_faiss_doc_count', 0) * 150}KB",  # 估算大小
+                "dimension": index_info.get('chunk_faiss_dimension', 'unknown'),
+                "last_updated": check_time
+            },
+            "whoosh_index": {
+                "status": "ready" if index_info.get('chunk_whoosh_available') else "not_available",
+                "document_count": index_info.get('chunk_whoosh_doc_count', 0),
+                "index_size": f"{index_info.get('chunk_whoosh_doc_count', 0) * 50}KB",  # 估算大小
+                "last_updated": check_time
+            }
+        }
+    except Exception as e:
+        logger.warning(f"无法获取索引状态: {str(e)}")
+        return {
+            "faiss_index": {"status": "error", "error": str(e)},
+            "whoosh_index": {"status": "error", "error": str(e)}
+        }
+
+
+@router.get("/health/live", summary="存活检查")
+async def health_live():
+    """
+    存活检查
+
+    只表示服务进程能够响应请求，不做任何检查，适合高频探活
+    """
+    return {"status": "alive"}
+
+
+@router.get("/health/ready", summary="就绪检查")
+async def health_ready():
+    """
+    就绪检查
+
+    只检查数据库连接（读取系统状态快照），数据库不可用时返回503；
+    完整的资源、AI模型和索引状态请使用 /health
+    """
+    db_status = (await get_system_monitor().get_snapshot()).db_status
+    if db_status["status"] != "connected":
+        return ORJSONResponse(status_code=503, content={"status": "not_ready", "database": db_status["status"]})
+    return {"status": "ready", "database": db_status["status"]}
+
+
 @router.get("/health", response_model=HealthResponse, summary="系统健康检查")
 async def health_check(
-    db: Session = Depends(get_db),
     locale: str = Depends(get_locale)
 ):
     """
@@ -34,62 +221,19 @@ async def health_check(
     检查数据库连接、AI模型状态、索引状态等
     """
     logger.info("执行系统健康检查")
+    # 本次检查的所有时间戳共用同一个字符串
+    check_time = datetime.now().isoformat()
 
     try:
-        # 数据库状态检查
-        db_status = get_database_info()
-
-        # 系统资源状态
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        cpu_percent = psutil.cpu_percent(interval=1)
-
-        # 获取真实的AI模型状态
-        ai_models_status = {}
-        try:
-            # 尝试获取AI模型服务状态
-            from app.services.ai_model_manager import ai_model_service
-            ai_models_status = await ai_model_service.get_model_status()
-        except Exception as e:
-            logger.warning(f"无法获取AI模型状态: {str(e)}")
-            # 提供默认状态
-            ai_models_status = {
-                "error": i18n.t('system.model_service_unavailable', locale, error=str(e)),
-                "bge_m3": {"status": "unknown", "error": i18n.t('system.model_service_error', locale)},
-                "faster_whisper": {"status": "unknown", "error": i18n.t('system.model_service_error', locale)},
-                "cn_clip": {"status": "unknown", "error": i18n.t('system.model_service_error', locale)}
-            }
-
-        # 获取真实的索引状态
-        indexes_status = {}
-        try:
-            # 获取分块搜索服务实例
-            from app.services.chunk_search_service import get_chunk_search_service
-            search_service = get_chunk_search_service()
-            index_info = search_service.get_index_info()
-
-            # 转换索引状态格式
-            indexes_status = {
-                "faiss_index": {
-                    "status": "ready" if index_info.get('chunk_faiss_available') else "not_available",
-                    "document_count": index_info.get('chunk_faiss_doc_count', 0),
-                    "index_size": f"{index_info.get('chunk_faiss_doc_count', 0) * 150}KB",  # 估算大小
-                    "dimension": index_info.get('chunk_faiss_dimension', 'unknown'),
-                    "last_updated": datetime.now().isoformat()
-                },
-                "whoosh_index": {
-                    "status": "ready" if index_info.get('chunk_whoosh_available') else "not_available",
-                    "document_count": index_info.get('chunk_whoosh_doc_count', 0),
-                    "index_size": f"{index_info.get('chunk_whoosh_doc_count', 0) * 50}KB",  # 估算大小
-                    "last_updated": datetime.now().isoformat()
-                }
-            }
-        except Exception as e:
-            logger.warning(f"无法获取索引状态: {str(e)}")
-            indexes_status = {
-                "faiss_index": {"status": "error", "error": str(e)},
-                "whoosh_index": {"status": "error", "error": str(e)}
-            }
+        # 系统资源快照、AI模型状态和索引状态互不依赖，并发获取
+        snapshot, ai_models_status, indexes_status = await asyncio.gather(
+            get_system_monitor().get_snapshot(),
+            _get_ai_models_status(locale),
+            _get_indexes_status(check_time)
+        )
+        db_status = snapshot.db_status
+        memory = snapshot.memory
+        disk = snapshot.disk
 
         # 服务状态
         services_status = {
@@ -115,20 +259,8 @@ async def health_check(
 
         health_data = {
             "status": overall_status,
-            "timestamp": datetime.now().isoformat(),
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory": {
-                    "total": f"{memory.total / (1024**3):.1f}GB",
-                    "used": f"{memory.used / (1024**3):.1f}GB",
-                    "percent": memory.percent
-                },
-                "disk": {
-                    "total": f"{disk.total / (1024**3):.1f}GB",
-                    "used": f"{disk.used / (1024**3):.1f}GB",
-                    "percent": disk.percent
-                }
-            },
+            "timestamp": check_time,
+            "system": snapshot.system_info,
             "database": db_status,
             "ai_models": ai_models_status,
             "indexes": indexes_status,
@@ -139,7 +271,7 @@ async def health_check(
 
         return HealthResponse(
             data=health_data,
-            message=i18n.t('system.health_check_complete', locale)
+            message=_static_text('system.health_check_complete', locale)
         )
 
     except Exception as e:
@@ -148,9 +280,9 @@ async def health_check(
             data={
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": check_time
             },
-            message=i18n.t('system.health_check_failed', locale)
+            message=_static_text('system.health_check_failed', locale)
         )
 
 
@@ -168,65 +300,43 @@ async def get_running_status(
     logger.info("获取系统运行状态")
 
     try:
-        # 使用与 /api/index/status 相同的数据源
-        from app.services.file_index_service import FileIndexService
-        from app.core.config import get_settings
-
-        # 获取配置中的数据根目录
-        settings = get_settings()
-        data_root = settings.index.data_root
+        # 使用与 /api/index/status 相同的数据源（全局索引服务实例）
+        if get_file_index_service is None:
+            raise RuntimeError("文件索引服务模块未加载")
 
-        # 获取索引系统状态
-        index_service = FileIndexService(data_root=data_root)
-        index_status = index_service.get_index_status()
+        # 获取索引系统状态（短时间内复用统计结果，统计过程在线程中执行）
+        index_service = get_file_index_service()
+        index_status = await asyncio.to_thread(index_service.get_cached_index_status)
 
         # 提取文件数量和索引大小（与 /api/index/status 保持一致）
         index_count = index_status.get('total_files_indexed', 0)
         data_size = index_status.get('index_size_bytes', 0)
 
 
-        # 获取今日搜索次数
+        # 获取今日搜索次数和最近索引任务完成时间（在线程中执行）
         today_searches = 0
-        try:
-            from datetime import date
-            from app.models.search_history import SearchHistoryModel
-
-            # 查询今日搜索次数
-            today = date.today()
-            today_searches = db.query(SearchHistoryModel).filter(
-                func.date(SearchHistoryModel.created_at) == today
-            ).count()
-        except Exception as e:
-            logger.warning(i18n.t('system.today_searches_failed', locale, error=str(e)))
-
-        # 获取最近索引任务完成时间
         last_update = datetime.now()
         try:
-            from app.models.index_job import IndexJobModel
-
-            # 查询最近完成的索引任务
-            last_completed_job = db.query(IndexJobModel).filter(
-                IndexJobModel.status == 'completed'
-            ).order_by(IndexJobModel.completed_at.desc()).first()
-
-            if last_completed_job and last_completed_job.completed_at:
-                last_update = last_completed_job.completed_at
+            today_searches, last_completed_at = await asyncio.to_thread(_load_running_counters, db)
+            if last_completed_at:
+                last_update = last_completed_at
         except Exception as e:
+            logger.warning(i18n.t('system.today_searches_failed', locale, error=str(e)))
             logger.warning(i18n.t('system.last_update_failed', locale, error=str(e)))
 
         # 判断系统状态
-        system_status = i18n.t('system.normal', locale)
+        system_status = _static_text('system.normal', locale)
         system_color = "green"
 
         # 检查数据库连接
-        db_status = get_database_info()
+        db_status = (await get_system_monitor().get_snapshot()).db_status
         if db_status["status"] != "connected":
-            system_status = i18n.t('system.abnormal', locale)
+            system_status = _static_text('system.abnormal', locale)
             system_color = "red"
 
         # 检查是否有索引
         if index_count == 0:
-            system_status = i18n.t('system.waiting_index', locale)
+            system_status = _static_text('system.waiting_index', locale)
             system_color = "orange"
 
         response_data = {
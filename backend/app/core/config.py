@@ -173,6 +173,9 @@ class APIConfig(BaseSettings):
     default_similarity_threshold: float = Field(default=0.7, description="默认相似度阈值")
     suggestion_threshold: float = Field(default=0.3, description="搜索建议阈值")
 
+    # 系统状态接口配置
+    system_snapshot_ttl: float = Field(default=5.0, description="系统资源状态快照缓存时间(秒)，建议5-30")
+
     class Config:
         env_prefix = "API_"
 
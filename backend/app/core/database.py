@@ -3,10 +3,10 @@
 提供SQLite数据库连接和会话管理
 """
 import os
-from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy import create_engine, event, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
 from typing import Generator
 import logging
 
@@ -18,17 +18,48 @@ DATABASE_PATH = os.getenv("DATABASE_PATH", "../data/database/xiaoyao_search.db")
 # 确保数据库目录存在
 os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
 
+# 连接池配置（可通过环境变量调整）
+POOL_SIZE = int(os.getenv("SQLALCHEMY_POOL_SIZE", "20"))
+MAX_OVERFLOW = int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = int(os.getenv("SQLALCHEMY_POOL_TIMEOUT", "30"))
+POOL_PRE_PING = os.getenv("SQLALCHEMY_POOL_PRE_PING", "false").lower() == "true"
+
+# SQLite写锁等待时间(秒)，其他连接持有写锁时最多等待这么久再报 database is locked
+BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+
 # 创建数据库引擎
+# 每个会话从连接池获取独立连接，线程池中并发执行的请求互不共享连接
 engine = create_engine(
     f"sqlite:///{DATABASE_PATH}",
     connect_args={
         "check_same_thread": False,  # SQLite多线程访问
-        "timeout": 30  # 查询超时时间
+        "timeout": BUSY_TIMEOUT  # 等待数据库锁的超时时间
     },
-    poolclass=StaticPool,  # 静态连接池
+    poolclass=QueuePool,  # 队列连接池
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_pre_ping=POOL_PRE_PING,  # 本地文件数据库连接不会被远端断开，默认关闭
     echo=os.getenv("LOG_LEVEL") == "debug"  # 调试模式下打印SQL
 )
 
+
+@event.listens_for(engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """
+    为连接池中的每个新连接设置SQLite参数
+
+    WAL模式下读事务不阻塞写入，流式导出、建议查询等长时间读取期间，
+    搜索历史、设置和索引任务的写入无需等待读事务结束
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}")
+    finally:
+        cursor.close()
+
+
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -80,6 +111,11 @@ def init_database() -> None:
         Base.metadata.create_all(bind=engine)
         logger.info(f"数据库表创建完成: {DATABASE_PATH}")
 
+        # create_all不会为已存在的表补建索引，这里逐个补齐模型中声明的索引
+        for table in Base.metadata.sorted_tables:
+            for table_index in table.indexes:
+                table_index.create(bind=engine, checkfirst=True)
+
         # 初始化默认设置
         _init_default_settings()
 
@@ -131,6 +167,10 @@ def _init_default_settings() -> None:
         # 不抛出异常，允许系统继续运行
 
 
+# 连接检查语句，模块加载时构建一次
+_DB_PING = text("SELECT 1")
+
+
 def get_database_info() -> dict:
     """
     获取数据库信息
@@ -139,16 +179,15 @@ def get_database_info() -> dict:
         dict: 数据库连接信息
     """
     try:
-        from sqlalchemy import text
         with engine.connect() as conn:
             # 检查数据库连接
-            conn.execute(text("SELECT 1"))
+            conn.execute(_DB_PING)
 
             return {
                 "status": "connected",
                 "database_path": DATABASE_PATH,
                 "driver": "sqlite",
-                "connection_pool_size": 1
+                "connection_pool_size": engine.pool.size()
             }
     except Exception as e:
         logger.error(f"数据库连接检查失败: {str(e)}")
@@ -7,7 +7,7 @@ XiaoyaoSearch - 小遥搜索
 
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from functools import lru_cache
 from loguru import logger
 
@@ -20,7 +20,7 @@ class I18N:
     - 从JSON文件加载语言包
     - 嵌套键访问（如 'common.success'）
     - 参数格式化（如 '找到 {count} 个结果'）
-    - LRU缓存优化性能
+    - LRU缓存翻译模板优化性能
     - 自动回退到默认语言
     """
 
@@ -33,6 +33,8 @@ class I18N:
         """
         self.locale_dir = Path(locale_dir)
         self._translations: Dict[str, Dict[str, Any]] = {}
+        # 预先展开的翻译模板表：(语言代码, 点号键) -> 模板字符串
+        self._templates: Dict[Tuple[str, str], str] = {}
         self._load_locales()
 
     def _load_locales(self):
@@ -51,29 +53,43 @@ class I18N:
                 except Exception as e:
                     logger.error(f"Failed to load locale {locale_code}: {e}")
 
+            for locale_code, tree in self._translations.items():
+                self._flatten_templates(locale_code, tree, "")
+
             logger.info(f"Loaded {len(self._translations)} locales: {list(self._translations.keys())}")
 
         except Exception as e:
             logger.error(f"Failed to load locales from {self.locale_dir}: {e}")
 
+    def _flatten_templates(self, locale: str, node: Dict[str, Any], prefix: str):
+        """
+        将语言包的嵌套结构展开为模板表
+
+        Args:
+            locale: 语言代码
+            node: 当前层级的翻译字典
+            prefix: 当前层级的键前缀
+        """
+        for name, value in node.items():
+            key = f"{prefix}{name}"
+            if isinstance(value, dict):
+                self._flatten_templates(locale, value, f"{key}.")
+            elif isinstance(value, str):
+                self._templates[(locale, key)] = value
+
     @lru_cache(maxsize=1024)
-    def translate(self, key: str, locale: str = "zh_CN", **kwargs) -> str:
+    def _lookup(self, key: str, locale: str) -> Tuple[str, bool]:
         """
-        翻译文本（带缓存）
+        查找翻译模板（带缓存）
+
+        只缓存与参数无关的模板，带参数的调用不会占用缓存条目
 
         Args:
-            key: 翻译键，支持点号分隔的嵌套键，如 'common.success'
-            locale: 语言代码，默认为 'zh_CN'
-            **kwargs: 格式化参数
+            key: 翻译键，支持点号分隔的嵌套键
+            locale: 语言代码
 
         Returns:
-            翻译后的文本，如果找不到翻译则返回键本身
-
-        Examples:
-            >>> i18n.translate('common.success', 'zh_CN')
-            '操作成功'
-            >>> i18n.translate('search.results_count', 'zh_CN', count=10)
-            '找到 10 个结果'
+            (文本, 是否可格式化)：找不到翻译时返回键本身，且不做格式化
         """
         # 标准化语言代码（处理 zh-CN 和 zh_CN）
         locale = locale.replace('-', '_')
@@ -93,15 +109,45 @@ class I18N:
         except (KeyError, TypeError):
             # 如果找不到翻译，返回键本身
             logger.warning(f"Translation key '{key}' not found in locale '{locale}'")
-            return key
+            return key, False
 
         # 确保返回的是字符串
         if not isinstance(value, str):
             logger.warning(f"Translation value for '{key}' is not a string: {type(value)}")
-            return str(value)
+            return str(value), False
+
+        return value, True
+
+    def translate(self, key: str, locale: str = "zh_CN", /, **kwargs) -> str:
+        """
+        翻译文本
+
+        已加载语言包中的键直接从预展开的模板表取出；其余情况（语言代码需标准化、
+        键不存在等）走带缓存的逐级查找。键和语言代码只能按位置传入，
+        格式化参数可以使用 key、locale 等同名占位符
+
+        Args:
+            key: 翻译键，支持点号分隔的嵌套键，如 'common.success'
+            locale: 语言代码，默认为 'zh_CN'
+            **kwargs: 格式化参数
+
+        Returns:
+            翻译后的文本，如果找不到翻译则返回键本身
+
+        Examples:
+            >>> i18n.translate('common.success', 'zh_CN')
+            '操作成功'
+            >>> i18n.translate('search.results_count', 'zh_CN', count=10)
+            '找到 10 个结果'
+        """
+        value = self._templates.get((locale, key))
+        if value is not None:
+            formattable = True
+        else:
+            value, formattable = self._lookup(key, locale)
 
         # 支持参数格式化
-        if kwargs:
+        if kwargs and formattable:
             try:
                 return value.format(**kwargs)
             except (KeyError, ValueError) as e:
@@ -110,7 +156,7 @@ class I18N:
 
         return value
 
-    def t(self, key: str, locale: str = "zh_CN", **kwargs) -> str:
+    def t(self, key: str, locale: str = "zh_CN", /, **kwargs) -> str:
         """
         翻译文本简写方法
 
@@ -175,7 +221,9 @@ class I18N:
     def reload(self):
         """重新加载所有语言包"""
         self._translations.clear()
-        self.translate.cache_clear()  # 清除缓存
+        self._templates.clear()
+        self._lookup.cache_clear()  # 清除缓存
+        get_locale_from_header.cache_clear()
         self._load_locales()
         logger.info("Reloaded all locales")
 
@@ -184,10 +232,13 @@ class I18N:
 i18n = I18N()
 
 
+@lru_cache(maxsize=256)
 def get_locale_from_header(accept_language: Optional[str] = None) -> str:
     """
     从 Accept-Language 请求头中解析语言代码
 
+    按原始请求头字符串缓存解析结果，同一客户端的请求头只解析一次
+
     Args:
         accept_language: Accept-Language 请求头的值
 
@@ -223,7 +274,7 @@ def get_locale_from_header(accept_language: Optional[str] = None) -> str:
         return "zh_CN"
 
 
-def t(key: str, locale: str = "zh_CN", **kwargs) -> str:
+def t(key: str, locale: str = "zh_CN", /, **kwargs) -> str:
     """
     全局翻译函数简写
 
@@ -3,8 +3,10 @@ AI模型配置数据模型
 定义AI模型配置的数据库表结构
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+import orjson
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Index, tuple_
 from sqlalchemy.sql import func
 from app.core.database import Base
 from datetime import datetime
@@ -27,6 +29,15 @@ class AIModelModel(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.now, comment="创建时间")
     updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now, comment="更新时间")
 
+    __table_args__ = (
+        # 按类型/提供商/名称查找配置（默认配置查询，前缀也覆盖按类型/提供商过滤）
+        Index('ix_ai_models_lookup', 'model_type', 'provider', 'model_name', 'is_active'),
+        # 按类型查找启用中的配置（更新配置）
+        Index('ix_ai_models_type_active', 'model_type', 'is_active'),
+        # 按类型/提供商过滤并按创建时间排序的列表查询
+        Index('ix_ai_models_list', 'model_type', 'provider', 'created_at'),
+    )
+
     def to_dict(self) -> dict:
         """
         转换为字典格式
@@ -45,6 +56,109 @@ class AIModelModel(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
 
+    @property
+    def config_dict(self) -> dict:
+        """
+        解析后的配置参数
+
+        解析结果与对应的config_json字符串一起缓存在实例上，config_json未变化时
+        重复访问不再解析；config_json被重新赋值或从数据库刷新后自动重新解析。
+        返回的字典为共享缓存，需要修改时请先复制
+
+        Returns:
+            dict: 配置参数
+
+        Raises:
+            orjson.JSONDecodeError: JSON格式无效时抛出
+        """
+        config_json = self.config_json
+        cached = self.__dict__.get('_config_cache')
+        if cached is None or cached[0] is not config_json:
+            cached = (config_json, self.load_config_json(config_json))
+            self.__dict__['_config_cache'] = cached
+        return cached[1]
+
+    @config_dict.setter
+    def config_dict(self, config: dict):
+        """设置配置参数，序列化一次写入config_json并更新缓存"""
+        config_json = self.dump_config_json(config)
+        self.config_json = config_json
+        self.__dict__['_config_cache'] = (config_json, config)
+
+    @staticmethod
+    def load_config_json(config_json: str) -> dict:
+        """
+        解析JSON格式的配置参数
+
+        Args:
+            config_json: JSON字符串
+
+        Returns:
+            dict: 配置参数
+
+        Raises:
+            orjson.JSONDecodeError: JSON格式无效时抛出
+        """
+        return orjson.loads(config_json)
+
+    @staticmethod
+    def dump_config_json(config: dict) -> str:
+        """
+        将配置参数序列化为JSON字符串（config_json为文本列）
+
+        Args:
+            config: 配置参数
+
+        Returns:
+            str: UTF-8 JSON字符串，中文不转义
+        """
+        return orjson.dumps(config, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    @classmethod
+    def build_default_row(cls, config_data: dict) -> dict:
+        """
+        构建默认模型配置的INSERT参数行（用于批量插入）
+
+        Args:
+            config_data: get_default_configs中的单项默认配置
+
+        Returns:
+            dict: ai_models表的列值
+        """
+        return {
+            "model_type": config_data["model_type"],
+            "provider": config_data["provider"],
+            "model_name": config_data["model_name"],
+            "config_json": cls.dump_config_json(config_data["config"]),
+            "is_active": True
+        }
+
+    @staticmethod
+    def default_config_key(config_data: dict) -> tuple:
+        """默认配置的唯一键：(模型类型, 提供商, 模型名称)"""
+        return config_data["model_type"], config_data["provider"], config_data["model_name"]
+
+    @classmethod
+    def query_default_models(cls, db, default_configs: dict) -> dict:
+        """
+        用单条元组IN查询取出已存在的默认模型配置
+
+        Args:
+            db: 数据库会话
+            default_configs: 默认配置字典
+
+        Returns:
+            dict: 以(模型类型, 提供商, 模型名称)为键的模型配置
+        """
+        keys = [cls.default_config_key(config_data) for config_data in default_configs.values()]
+        if not keys:
+            return {}
+
+        rows = db.query(cls).filter(
+            tuple_(cls.model_type, cls.provider, cls.model_name).in_(keys)
+        ).all()
+        return {(row.model_type, row.provider, row.model_name): row for row in rows}
+
     @classmethod
     def get_model_types(cls) -> list:
         """
@@ -183,10 +297,14 @@ class AIModelModel(Base):
         return ""
 
     @classmethod
+    @lru_cache(maxsize=1)
     def get_default_configs(cls) -> dict:
         """
         获取默认模型配置（基于数据库当前配置）
 
+        设备检测和项目根目录在进程内不会变化，结果缓存后复用，
+        返回的字典为共享缓存，调用方不应修改
+
         Returns:
             dict: 默认配置字典
         """
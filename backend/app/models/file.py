@@ -2,7 +2,7 @@
 文件索引数据模型
 定义文件索引的数据库表结构（软外键模式）
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, BigInteger, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, BigInteger, Boolean, Float, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 from datetime import datetime
@@ -53,6 +53,11 @@ class FileModel(Base):
     index_version = Column(String(20), default="1.0", comment="索引版本")
     needs_reindex = Column(Boolean, default=False, comment="是否需要重新索引")
 
+    __table_args__ = (
+        # 按文件类型过滤并按索引时间排序的已索引文件列表
+        Index('ix_files_type_indexed', 'file_type', 'indexed_at'),
+    )
+
     def to_dict(self) -> dict:
         """
         转换为字典格式
@@ -93,6 +98,22 @@ class FileModel(Base):
             "avg_chunk_size": self.avg_chunk_size
         }
 
+    @classmethod
+    def path_prefix_filter(cls, prefix: str) -> tuple:
+        """
+        构建文件路径前缀的半开区间过滤条件
+
+        等价于 file_path LIKE 'prefix%'，但路径中的 % 和 _ 不会被当作通配符，
+        且区间比较可以直接使用 file_path 唯一索引做范围扫描
+
+        Args:
+            prefix: 路径前缀
+
+        Returns:
+            tuple: 可直接展开传给 filter()/where() 的条件
+        """
+        return cls.file_path >= prefix, cls.file_path < prefix + "\U0010ffff"
+
     @classmethod
     def get_supported_extensions(cls) -> list:
         """
@@ -2,7 +2,7 @@
 索引任务数据模型
 定义文件索引任务的数据库表结构
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 from datetime import datetime
@@ -28,6 +28,22 @@ class IndexJobModel(Base):
     error_message = Column(Text, nullable=True, comment="错误信息")
     created_at = Column(DateTime, nullable=False, default=datetime.now, comment="创建时间")
 
+    __table_args__ = (
+        # 按文件夹检查是否有进行中的任务（创建/更新索引）
+        Index('ix_index_jobs_folder_status', 'folder_path', 'status'),
+        # 按状态过滤并按创建时间排序的列表查询
+        Index('ix_index_jobs_status_created', 'status', 'created_at'),
+    )
+
+    @property
+    def progress(self) -> int:
+        """进度百分比"""
+        # 确保数值不为None
+        total_files = self.total_files or 0
+        if total_files > 0:
+            return int(((self.processed_files or 0) / total_files) * 100)
+        return 0
+
     def to_dict(self) -> dict:
         """
         转换为字典格式
@@ -35,22 +51,14 @@ class IndexJobModel(Base):
         Returns:
             dict: 索引任务字典
         """
-        # 计算进度百分比
-        progress = 0
-        # 确保数值不为None
-        total_files = self.total_files or 0
-        processed_files = self.processed_files or 0
-        if total_files > 0:
-            progress = int((processed_files / total_files) * 100)
-
         return {
             "index_id": self.id,
             "folder_path": self.folder_path,
             "job_type": self.job_type,
             "status": self.status,
-            "progress": progress,
-            "total_files": total_files,
-            "processed_files": processed_files,
+            "progress": self.progress,
+            "total_files": self.total_files or 0,
+            "processed_files": self.processed_files or 0,
             "error_count": self.error_count or 0,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
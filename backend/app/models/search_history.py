@@ -2,7 +2,7 @@
 搜索历史数据模型
 定义用户搜索历史的数据库表结构
 """
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 from datetime import datetime
@@ -25,6 +25,13 @@ class SearchHistoryModel(Base):
     response_time = Column(Float, nullable=False, comment="响应时间(秒)")
     created_at = Column(DateTime, nullable=False, default=datetime.now, comment="搜索时间")
 
+    __table_args__ = (
+        # 不带过滤条件、按搜索时间倒序的历史列表
+        Index('ix_search_history_created', 'created_at'),
+        # 按搜索类型/输入类型过滤并按搜索时间排序的历史列表
+        Index('ix_search_history_type_created', 'search_type', 'input_type', 'created_at'),
+    )
+
     def to_dict(self) -> dict:
         """
         转换为字典格式
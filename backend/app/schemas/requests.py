@@ -2,13 +2,19 @@
 API请求数据模型
 定义所有API接口的请求参数结构
 """
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Optional, Dict, Any
 from app.schemas.enums import (
     InputType, SearchType, FileType, JobType,
     ModelType, ProviderType
 )
 
+# 请求模型通用配置：忽略未知字段，请求解析后不可变
+REQUEST_MODEL_CONFIG = ConfigDict(extra='ignore', frozen=True)
+
+# 多模态搜索允许的输入类型（预先计算，校验时只做集合查找）
+MULTIMODAL_INPUT_TYPES = frozenset({InputType.VOICE.value, InputType.IMAGE.value})
+
 
 class SearchRequest(BaseModel):
     """
@@ -23,9 +29,7 @@ class SearchRequest(BaseModel):
     threshold: float = Field(0.7, ge=0.0, le=1.0, description="相似度阈值")
     file_types: Optional[List[FileType]] = Field(None, description="文件类型过滤")
 
-    class Config:
-        """Pydantic配置"""
-        use_enum_values = True
+    model_config = ConfigDict(**REQUEST_MODEL_CONFIG, use_enum_values=True)
 
 
 class MultimodalRequest(BaseModel):
@@ -44,12 +48,11 @@ class MultimodalRequest(BaseModel):
     @field_validator('input_type')
     def validate_multimodal_input(cls, v):
         """验证多模态输入类型"""
-        if v not in [InputType.VOICE, InputType.IMAGE]:
+        if getattr(v, 'value', v) not in MULTIMODAL_INPUT_TYPES:
             raise ValueError('多模态输入类型只能是voice或image')
         return v
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(**REQUEST_MODEL_CONFIG, use_enum_values=True)
 
 
 class IndexCreateRequest(BaseModel):
@@ -65,6 +68,8 @@ class IndexCreateRequest(BaseModel):
     )
     recursive: bool = Field(True, description="是否递归搜索子文件夹")
 
+    model_config = REQUEST_MODEL_CONFIG
+
     @field_validator('folder_path')
     def validate_folder_path(cls, v):
         """验证文件夹路径"""
@@ -83,6 +88,8 @@ class IndexUpdateRequest(BaseModel):
     file_types: Optional[List[str]] = Field(None, description="支持文件类型")
     recursive: bool = Field(True, description="是否递归搜索子文件夹")
 
+    model_config = REQUEST_MODEL_CONFIG
+
 
 class AIModelConfigRequest(BaseModel):
     """
@@ -102,8 +109,7 @@ class AIModelConfigRequest(BaseModel):
             raise ValueError('模型名称不能为空')
         return v.strip()
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(**REQUEST_MODEL_CONFIG, use_enum_values=True)
 
 
 class AIModelTestRequest(BaseModel):
@@ -115,6 +121,20 @@ class AIModelTestRequest(BaseModel):
     test_data: Optional[str] = Field("测试数据", description="测试数据")
     config_override: Optional[Dict[str, Any]] = Field(None, description="临时配置覆盖")
 
+    model_config = REQUEST_MODEL_CONFIG
+
+
+class AIModelBatchTestRequest(BaseModel):
+    """
+    AI模型批量测试请求模型
+
+    用于一次并发测试多个AI模型的请求参数
+    """
+    model_ids: List[int] = Field(..., min_length=1, description="模型配置ID列表")
+    test_data: Optional[str] = Field("测试数据", description="测试数据")
+
+    model_config = REQUEST_MODEL_CONFIG
+
 
 class SettingsUpdateRequest(BaseModel):
     """
@@ -127,6 +147,8 @@ class SettingsUpdateRequest(BaseModel):
     ui: Optional[Dict[str, Any]] = Field(None, description="界面相关设置")
     ai_models: Optional[Dict[str, Any]] = Field(None, description="AI模型相关设置")
 
+    model_config = REQUEST_MODEL_CONFIG
+
 
 class SearchHistoryRequest(BaseModel):
     """
@@ -141,8 +163,7 @@ class SearchHistoryRequest(BaseModel):
     start_date: Optional[str] = Field(None, description="开始日期(YYYY-MM-DD)")
     end_date: Optional[str] = Field(None, description="结束日期(YYYY-MM-DD)")
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(**REQUEST_MODEL_CONFIG, use_enum_values=True)
 
 
 class FileListRequest(BaseModel):
@@ -156,8 +177,7 @@ class FileListRequest(BaseModel):
     file_type: Optional[FileType] = Field(None, description="文件类型过滤")
     search_query: Optional[str] = Field(None, min_length=1, max_length=100, description="文件名搜索")
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(**REQUEST_MODEL_CONFIG, use_enum_values=True)
 
 
 class CreateSettingRequest(BaseModel):
@@ -167,8 +187,9 @@ class CreateSettingRequest(BaseModel):
     type: str = Field(default="string", description="值类型: string/integer/boolean/float/json")
     description: Optional[str] = Field(default=None, description="设置说明")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        **REQUEST_MODEL_CONFIG,
+        json_schema_extra={
             "example": {
                 "key": "max_search_results",
                 "value": 50,
@@ -176,26 +197,30 @@ class CreateSettingRequest(BaseModel):
                 "description": "最大搜索结果数"
             }
         }
+    )
 
 
 class UpdateSettingRequest(BaseModel):
     """更新设置请求模型"""
     value: Any = Field(..., description="新的设置值")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        **REQUEST_MODEL_CONFIG,
+        json_schema_extra={
             "example": {
                 "value": 100
             }
         }
+    )
 
 
 class BatchCreateRequest(BaseModel):
     """批量创建设置请求模型"""
     settings: List[Dict[str, Any]] = Field(..., description="设置数据列表")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        **REQUEST_MODEL_CONFIG,
+        json_schema_extra={
             "example": {
                 "settings": [
                     {
@@ -213,14 +238,16 @@ class BatchCreateRequest(BaseModel):
                 ]
             }
         }
+    )
 
 
 class ResetRequest(BaseModel):
     """重置设置请求模型"""
     default_settings: List[Dict[str, Any]] = Field(..., description="默认设置列表")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        **REQUEST_MODEL_CONFIG,
+        json_schema_extra={
             "example": {
                 "default_settings": [
                     {
@@ -231,4 +258,5 @@ class ResetRequest(BaseModel):
                     }
                 ]
             }
-        }
\ No newline at end of file
+        }
+    )
\ No newline at end of file
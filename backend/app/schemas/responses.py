@@ -2,7 +2,7 @@
 API响应数据模型
 定义所有API接口的响应数据结构
 """
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from app.schemas.enums import (
@@ -72,7 +72,8 @@ class IndexJobInfo(BaseModel):
 
     索引任务状态的数据结构
     """
-    index_id: int = Field(..., description="索引任务ID")
+    # 从ORM对象直接校验时读取主键id
+    index_id: int = Field(..., validation_alias=AliasChoices("index_id", "id"), description="索引任务ID")
     folder_path: str = Field(..., description="索引文件夹路径")
     status: JobStatus = Field(..., description="任务状态")
     progress: int = Field(..., ge=0, le=100, description="进度百分比")
@@ -83,8 +84,14 @@ class IndexJobInfo(BaseModel):
     completed_at: Optional[datetime] = Field(None, description="完成时间")
     error_message: Optional[str] = Field(None, description="错误信息")
 
+    @field_validator('total_files', 'processed_files', 'error_count', mode='before')
+    def default_zero_counts(cls, v):
+        """旧任务记录中的计数可能为空，按0处理"""
+        return v or 0
+
     class Config:
         use_enum_values = True
+        from_attributes = True
 
 
 class IndexCreateResponse(BaseModel):
@@ -167,6 +174,7 @@ class SearchHistoryInfo(BaseModel):
 
     class Config:
         use_enum_values = True
+        from_attributes = True
 
 
 class SearchHistoryResponse(BaseModel):
@@ -2,6 +2,7 @@
 AI模型服务基类
 定义所有AI模型服务的通用接口和行为
 """
+from collections import Counter
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Union
 from enum import Enum
@@ -327,23 +328,29 @@ class ModelManager:
         if load_tasks:
             results_list = await asyncio.gather(*load_tasks, return_exceptions=True)
 
-            # 处理结果
+            # 处理结果，同时统计失败的模型
             results = {}
+            failed_ids = []
             for i, result in enumerate(results_list):
                 if isinstance(result, Exception):
                     model_id = model_ids[i]
                     logger.error(f"模型 {model_id} 加载异常: {str(result)}")
-                    results[model_id] = False
+                    success = False
                 else:
                     model_id, success = result
-                    results[model_id] = success
+                results[model_id] = success
+                if not success:
+                    failed_ids.append(model_id)
         else:
             results = {}
+            failed_ids = []
 
         load_time = (datetime.now() - start_time).total_seconds()
-        success_count = sum(1 for success in results.values() if success)
+        success_count = len(results) - len(failed_ids)
 
         logger.info(f"模型加载完成: {success_count}/{len(results)} 成功，耗时 {load_time:.2f}s")
+        if failed_ids:
+            logger.warning(f"加载失败的模型: {failed_ids}")
 
         return results
 
@@ -354,14 +361,20 @@ class ModelManager:
         Returns:
             Dict[str, bool]: 每个模型的卸载结果
         """
-        results = {}
-        for model_id, model in self.models.items():
+        async def unload_model_with_error_handling(mid: str, m: BaseAIModel) -> bool:
             try:
-                results[model_id] = await model.unload_model()
+                return await m.unload_model()
             except Exception as e:
-                logger.error(f"卸载模型{model_id}失败: {str(e)}")
-                results[model_id] = False
-        return results
+                logger.error(f"卸载模型{mid}失败: {str(e)}")
+                return False
+
+        # 并行卸载所有模型
+        model_ids = list(self.models)
+        results_list = await asyncio.gather(*(
+            unload_model_with_error_handling(model_id, model)
+            for model_id, model in self.models.items()
+        ))
+        return dict(zip(model_ids, results_list))
 
     async def health_check_all(self) -> Dict[str, bool]:
         """
@@ -370,14 +383,20 @@ class ModelManager:
         Returns:
             Dict[str, bool]: 每个模型的健康状态
         """
-        results = {}
-        for model_id, model in self.models.items():
+        async def health_check_with_error_handling(mid: str, m: BaseAIModel) -> bool:
             try:
-                results[model_id] = await model.health_check()
+                return await m.health_check()
             except Exception as e:
-                logger.error(f"检查模型{model_id}健康状态失败: {str(e)}")
-                results[model_id] = False
-        return results
+                logger.error(f"检查模型{mid}健康状态失败: {str(e)}")
+                return False
+
+        # 并行检查所有模型
+        model_ids = list(self.models)
+        results_list = await asyncio.gather(*(
+            health_check_with_error_handling(model_id, model)
+            for model_id, model in self.models.items()
+        ))
+        return dict(zip(model_ids, results_list))
 
     def get_models_by_type(self, model_type: ModelType) -> List[BaseAIModel]:
         """
@@ -407,17 +426,19 @@ class ModelManager:
         Returns:
             Dict[str, Any]: 状态摘要
         """
-        summary = {
-            "total_models": len(self.models),
-            "loaded_models": len([m for m in self.models.values() if m.status == ModelStatus.LOADED]),
-            "error_models": len([m for m in self.models.values() if m.status == ModelStatus.ERROR]),
-            "models": {}
-        }
-
+        # 一次遍历同时统计各状态数量并收集模型信息
+        status_counts = Counter()
+        models_info = {}
         for model_id, model in self.models.items():
-            summary["models"][model_id] = model.get_status_info()
+            status_counts[model.status] += 1
+            models_info[model_id] = model.get_status_info()
 
-        return summary
+        return {
+            "total_models": len(self.models),
+            "loaded_models": status_counts[ModelStatus.LOADED],
+            "error_models": status_counts[ModelStatus.ERROR],
+            "models": models_info
+        }
 
     async def __aenter__(self):
         """异步上下文管理器入口"""
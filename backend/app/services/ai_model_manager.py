@@ -4,9 +4,11 @@ AI模型管理服务
 """
 import asyncio
 import os
-from typing import Dict, Any, Optional, List, Union
+import time
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 import numpy as np
+from sqlalchemy import insert
 
 # 在导入任何AI模型库之前，配置环境变量以抑制日志警告
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # TensorFlow日志级别
@@ -26,6 +28,21 @@ from app.services.ollama_service import create_ollama_service
 from app.models.ai_model import AIModelModel
 from app.core.database import get_db, SessionLocal
 
+# 各模型类型对应的服务实例工厂
+MODEL_SERVICE_FACTORIES = {
+    "embedding": create_bge_service,
+    "speech": create_whisper_service,
+    "vision": create_clip_service,
+    "llm": create_ollama_service
+}
+
+# 各本地模型类型的必需文件
+REQUIRED_MODEL_FILES = {
+    "embedding": ["config.json", "pytorch_model.bin"],
+    "speech": ["model.bin"],
+    "vision": ["config.json", "pytorch_model.bin"]
+}
+
 
 class AIModelService:
     """
@@ -40,6 +57,10 @@ class AIModelService:
         self.model_configs: Dict[str, Dict[str, Any]] = {}
         self.default_models: Dict[str, str] = {}  # model_type -> model_id
 
+        # 模型状态摘要短时缓存：(状态摘要, 过期时间)，健康检查等轮询请求共用
+        self.status_cache_ttl = 1.0
+        self._status_cache: Optional[Tuple[Dict[str, Any], float]] = None
+
         logger.info("AI模型管理服务初始化完成")
 
     async def initialize(self):
@@ -68,11 +89,11 @@ class AIModelService:
             # 创建数据库会话
             db = SessionLocal()
             try:
-                # 首先检查数据库中是否有模型配置
-                total_models = db.query(AIModelModel).count()
+                # 首先检查数据库中是否有模型配置（EXISTS取到首行即停止，无需统计全表）
+                has_models = db.query(db.query(AIModelModel.id).exists()).scalar()
 
                 # 如果没有模型配置，先初始化默认配置
-                if total_models == 0:
+                if not has_models:
                     logger.info("数据库中没有AI模型配置，初始化默认配置")
                     await self._initialize_default_configs_to_db(db)
 
@@ -86,7 +107,7 @@ class AIModelService:
                         "model_type": config.model_type,
                         "provider": config.provider,
                         "model_name": config.model_name,
-                        "config": config.config_json
+                        "config": config.config_dict
                     }
 
                 logger.info(f"从数据库加载了 {len(self.model_configs)} 个模型配置")
@@ -105,7 +126,6 @@ class AIModelService:
             db: 数据库会话
         """
         try:
-            import json
             from app.models.ai_model import AIModelModel
 
             logger.info("开始将默认AI模型配置初始化到数据库")
@@ -113,37 +133,27 @@ class AIModelService:
             # 获取默认配置
             default_configs = AIModelModel.get_default_configs()
 
-            # 创建默认模型配置记录
-            created_count = 0
+            # 收集缺失的默认模型配置行
+            new_rows = []
+
+            # 一次元组IN查询取出已存在的默认配置
+            existing_by_key = AIModelModel.query_default_models(db, default_configs)
 
             for config_key, config_data in default_configs.items():
                 # 检查是否已存在相同的配置
-                existing_model = db.query(AIModelModel).filter(
-                    AIModelModel.model_type == config_data["model_type"],
-                    AIModelModel.provider == config_data["provider"],
-                    AIModelModel.model_name == config_data["model_name"]
-                ).first()
+                existing_model = existing_by_key.get(AIModelModel.default_config_key(config_data))
 
                 if not existing_model:
-                    # 创建新的模型配置
-                    new_model = AIModelModel(
-                        model_type=config_data["model_type"],
-                        provider=config_data["provider"],
-                        model_name=config_data["model_name"],
-                        config_json=json.dumps(config_data["config"], ensure_ascii=False),
-                        is_active=True
-                    )
-                    db.add(new_model)
-                    created_count += 1
+                    new_rows.append(AIModelModel.build_default_row(config_data))
                     logger.info(f"创建默认AI模型配置: {config_data['model_type']} - {config_data['model_name']}")
                 else:
                     logger.info(f"AI模型配置已存在，跳过: {config_data['model_type']} - {config_data['model_name']}")
 
-            # 提交所有更改
-            db.commit()
-
-            if created_count > 0:
-                logger.info(f"成功初始化 {created_count} 个默认AI模型配置到数据库")
+            if new_rows:
+                # 单条executemany批量INSERT，一次提交
+                db.execute(insert(AIModelModel), new_rows)
+                db.commit()
+                logger.info(f"成功初始化 {len(new_rows)} 个默认AI模型配置到数据库")
             else:
                 logger.info("所有默认AI模型配置都已存在于数据库中")
 
@@ -163,49 +173,22 @@ class AIModelService:
 
                 # 如果config是字符串，需要解析JSON
                 if isinstance(config, str):
-                    import json
-                    config = json.loads(config)
+                    config = AIModelModel.load_config_json(config)
 
                 # 校验本地模型路径
                 if provider == "local" and model_type in ["embedding", "speech", "vision"]:
                     await self._validate_and_fix_model_path(model_type, config, model_id)
 
+                factory = MODEL_SERVICE_FACTORIES.get(model_type)
+                if factory is None:
+                    continue
+
                 try:
-                    if model_type == "embedding":
-                        # 创建文本嵌入模型
-                        bge_service = create_bge_service(config)
-                        self.model_manager.register_model(model_id, bge_service)
-                        self.default_models["embedding"] = model_id
-                        # 立即加载模型
-                        await self.model_manager.load_model(model_id)
-                        logger.info(f"创建并加载embedding模型: {model_id}")
-
-                    elif model_type == "speech":
-                        # 创建语音识别模型
-                        whisper_service = create_whisper_service(config)
-                        self.model_manager.register_model(model_id, whisper_service)
-                        self.default_models["speech"] = model_id
-                        # 立即加载模型
-                        await self.model_manager.load_model(model_id)
-                        logger.info(f"创建并加载speech模型: {model_id}")
-
-                    elif model_type == "vision":
-                        # 创建图像理解模型
-                        clip_service = create_clip_service(config)
-                        self.model_manager.register_model(model_id, clip_service)
-                        self.default_models["vision"] = model_id
-                        # 立即加载模型
-                        await self.model_manager.load_model(model_id)
-                        logger.info(f"创建并加载vision模型: {model_id}")
-
-                    elif model_type == "llm":
-                        # 创建大语言模型
-                        ollama_service = create_ollama_service(config)
-                        self.model_manager.register_model(model_id, ollama_service)
-                        self.default_models["llm"] = model_id
-                        # 立即加载模型
-                        await self.model_manager.load_model(model_id)
-                        logger.info(f"创建并加载llm模型: {model_id}")
+                    # 创建模型实例并立即加载
+                    self.model_manager.register_model(model_id, factory(config))
+                    self.default_models[model_type] = model_id
+                    await self.model_manager.load_model(model_id)
+                    logger.info(f"创建并加载{model_type}模型: {model_id}")
 
                 except Exception as model_error:
                     logger.warning(f"创建{model_type}模型失败 ({model_id}): {str(model_error)}")
@@ -225,6 +208,7 @@ class AIModelService:
         Returns:
             bool: 加载是否成功
         """
+        self._status_cache = None  # 模型状态即将变化，丢弃缓存的状态摘要
         return await self.model_manager.load_model(model_id)
 
     async def unload_model(self, model_id: str) -> bool:
@@ -237,6 +221,7 @@ class AIModelService:
         Returns:
             bool: 卸载是否成功
         """
+        self._status_cache = None
         return await self.model_manager.unload_model(model_id)
 
     async def get_model(self, model_type: Union[str, ModelType]) -> Optional[BaseAIModel]:
@@ -285,7 +270,7 @@ class AIModelService:
 
         return await model.predict(texts, **kwargs)
 
-    async def batch_text_embedding(self, texts: List[str], batch_size: int = 32, **kwargs) -> List[List[float]]:
+    async def batch_text_embedding(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
         """
         批量文本嵌入
 
@@ -295,12 +280,13 @@ class AIModelService:
             **kwargs: 其他参数
 
         Returns:
-            List[List[float]]: 嵌入向量列表
+            np.ndarray: 形状为 (向量数, 嵌入维度) 的float32矩阵，每行一个嵌入向量
         """
         if isinstance(texts, str):
             texts = [texts]
 
-        all_embeddings = []
+        # 成功批次保存为二维float32矩阵，失败批次先记录条数，待确定维度后补零向量
+        batch_results: List[Union[np.ndarray, int]] = []
         total_texts = len(texts)
 
         # 分批处理
@@ -309,41 +295,30 @@ class AIModelService:
             try:
                 batch_embeddings = await self.text_embedding(batch_texts, **kwargs)
 
-                # 处理numpy数组返回值
-                if isinstance(batch_embeddings, np.ndarray):
-                    if batch_embeddings.ndim == 2:
-                        # 标准情况: (batch_size, embedding_dim)
-                        batch_list = batch_embeddings.tolist()
-                        all_embeddings.extend(batch_list)
-                    elif batch_embeddings.ndim == 1:
-                        # 单个向量: (embedding_dim,)
-                        all_embeddings.append(batch_embeddings.tolist())
-                    else:
-                        # 多维数组，展平处理
-                        flattened = [emb.flatten().tolist() for emb in batch_embeddings]
-                        all_embeddings.extend(flattened)
-                elif isinstance(batch_embeddings, list):
-                    # 如果是列表，需要检查元素类型
-                    for emb in batch_embeddings:
-                        if isinstance(emb, np.ndarray):
-                            if emb.ndim > 1:
-                                all_embeddings.append(emb.flatten().tolist())
-                            else:
-                                all_embeddings.append(emb.tolist())
-                        else:
-                            all_embeddings.append(emb)
-                else:
-                    # 其他类型，直接添加
-                    all_embeddings.append(batch_embeddings)
+                # 模型可能返回numpy数组或向量列表，统一为二维矩阵：
+                # 一维视为单个向量，更高维按行展平
+                batch_matrix = np.asarray(batch_embeddings, dtype=np.float32)
+                if batch_matrix.ndim == 1:
+                    batch_matrix = batch_matrix.reshape(1, -1)
+                elif batch_matrix.ndim > 2:
+                    batch_matrix = batch_matrix.reshape(len(batch_matrix), -1)
+                batch_results.append(batch_matrix)
 
             except Exception as e:
                 logger.error(f"批量嵌入处理失败 (批次 {i//batch_size + 1}): {str(e)}")
-                # 使用零向量作为fallback
-                dummy_embedding = [0.0] * 1024  # BGE-M3标准维度
-                for _ in batch_texts:
-                    all_embeddings.append(dummy_embedding)
-
-        return all_embeddings
+                batch_results.append(len(batch_texts))
+
+        # 使用零向量作为失败批次的fallback，维度与成功批次一致，全部失败时按BGE-M3标准维度
+        dimension = next(
+            (result.shape[1] for result in batch_results if isinstance(result, np.ndarray)),
+            1024
+        )
+        if not batch_results:
+            return np.empty((0, dimension), dtype=np.float32)
+        return np.vstack([
+            result if isinstance(result, np.ndarray) else np.zeros((result, dimension), dtype=np.float32)
+            for result in batch_results
+        ])
 
     async def speech_to_text(self, audio_input: Any, **kwargs) -> Dict[str, Any]:
         """
@@ -487,10 +462,19 @@ class AIModelService:
         """
         获取所有模型状态
 
+        状态摘要缓存 status_cache_ttl 秒，短时间内的并发轮询共用同一份结果
+
         Returns:
             Dict[str, Any]: 模型状态信息
         """
-        return self.model_manager.get_status_summary()
+        now = time.monotonic()
+        cached = self._status_cache
+        if cached is not None and now < cached[1]:
+            return cached[0]
+
+        summary = self.model_manager.get_status_summary()
+        self._status_cache = (summary, now + self.status_cache_ttl)
+        return summary
 
     async def health_check(self) -> Dict[str, bool]:
         """
@@ -536,16 +520,10 @@ class AIModelService:
             config = model_config.get("config", {})
 
             # 根据类型创建模型实例
-            if model_type == "embedding":
-                model = create_bge_service(config)
-            elif model_type == "speech":
-                model = create_whisper_service(config)
-            elif model_type == "vision":
-                model = create_clip_service(config)
-            elif model_type == "llm":
-                model = create_ollama_service(config)
-            else:
+            factory = MODEL_SERVICE_FACTORIES.get(model_type)
+            if factory is None:
                 raise AIModelException(f"不支持的模型类型: {model_type}")
+            model = factory(config)
 
             # 注册模型
             self.model_manager.register_model(model_id, model)
@@ -737,25 +715,17 @@ class AIModelService:
             logger.info(f"创建并加载新模型: {new_model_id}")
             config = new_model_config.get("config", {})
             if isinstance(config, str):
-                import json
-                config = json.loads(config)
+                config = AIModelModel.load_config_json(config)
 
             # 根据模型类型创建新模型实例
-            new_model = None
-            if model_type == "embedding":
-                new_model = create_bge_service(config)
-            elif model_type == "speech":
-                new_model = create_whisper_service(config)
-            elif model_type == "vision":
-                new_model = create_clip_service(config)
-            elif model_type == "llm":
-                new_model = create_ollama_service(config)
-            else:
+            factory = MODEL_SERVICE_FACTORIES.get(model_type)
+            if factory is None:
                 return {
                     "success": False,
                     "message": f"不支持的模型类型: {model_type}",
                     "reload_time": time.time() - start_time
                 }
+            new_model = factory(config)
 
             # 注册新模型
             self.model_manager.register_model(new_model_id, new_model)
@@ -890,14 +860,7 @@ class AIModelService:
         Returns:
             list: 必需文件模式列表
         """
-        if model_type == "embedding":
-            return ["config.json", "pytorch_model.bin"]
-        elif model_type == "speech":
-            return ["model.bin"]
-        elif model_type == "vision":
-            return ["config.json", "pytorch_model.bin"]
-        else:
-            return []
+        return list(REQUIRED_MODEL_FILES.get(model_type, []))
 
     async def __aenter__(self):
         """异步上下文管理器入口"""
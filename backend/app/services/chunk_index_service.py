@@ -423,9 +423,13 @@ class ChunkIndexService:
 
                     if len(batch_embeddings) != len(batch_texts):
                         logger.warning(f"批次 {batch_idx + 1}/{total_batches} 嵌入数量不匹配: 期望{len(batch_texts)}, 实际{len(batch_embeddings)}")
-                        # 截断或填充
+                        # 截断或填充（batch_text_embedding返回二维numpy矩阵）
                         if len(batch_embeddings) < len(batch_texts):
-                            batch_embeddings.extend([[0.0] * 768] * (len(batch_texts) - len(batch_embeddings)))
+                            padding = np.zeros(
+                                (len(batch_texts) - len(batch_embeddings), batch_embeddings.shape[1]),
+                                dtype=np.float32
+                            )
+                            batch_embeddings = np.vstack([batch_embeddings, padding])
                         else:
                             batch_embeddings = batch_embeddings[:len(batch_texts)]
 
@@ -1842,7 +1846,7 @@ class ChunkIndexService:
             try:
                 # 查找文件夹下的所有文件
                 files = db.query(FileModel).filter(
-                    FileModel.file_path.like(f"{folder_path}%")
+                    *FileModel.path_prefix_filter(folder_path)
                 ).all()
 
                 if not files:
@@ -4,6 +4,7 @@
 
 import os
 import pickle
+import threading
 import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
@@ -17,7 +18,7 @@ import numpy as np
 from whoosh import index, qparser
 from whoosh.filedb.filestore import FileStorage
 from whoosh.query import Query
-from app.services.ai_model_manager import ai_model_service
+from app.services.embedding_batcher import get_query_embedding_batcher
 
 
 class ChunkSearchService:
@@ -291,11 +292,8 @@ class ChunkSearchService:
                 logger.warning("分块Faiss索引为空，跳过语义搜索")
                 return []
 
-            # 生成查询向量
-            query_embedding = await ai_model_service.text_embedding(
-                query,
-                normalize_embeddings=True
-            )
+            # 生成查询向量（并发查询由微批处理器合并为一次推理）
+            query_embedding = await get_query_embedding_batcher().submit(query)
 
             # 执行向量搜索
             import numpy as np
@@ -897,25 +895,29 @@ class ChunkSearchService:
 
 # 创建全局分块搜索服务实例
 _chunk_search_service: Optional[ChunkSearchService] = None
+_chunk_search_service_lock = threading.Lock()
 
 
 def get_chunk_search_service() -> ChunkSearchService:
     """获取分块搜索服务实例"""
     global _chunk_search_service
     if _chunk_search_service is None:
-        # 使用默认路径创建服务实例
-        chunk_faiss_path = os.getenv('FAISS_INDEX_PATH', '../data/indexes/faiss') + '/document_index_chunks.faiss'
-        chunk_whoosh_path = os.getenv('WHOOSH_INDEX_PATH', '../data/indexes/whoosh')
-
-        logger.info(f"初始化分块搜索服务:")
-        logger.info(f"  - Faiss索引路径: {chunk_faiss_path}")
-        logger.info(f"  - Whoosh索引路径: {chunk_whoosh_path}")
-
-        _chunk_search_service = ChunkSearchService(
-            chunk_faiss_index_path=chunk_faiss_path,
-            chunk_whoosh_index_path=chunk_whoosh_path,
-            use_ai_models=True
-        )
+        # 双重检查，避免并发首次调用时重复加载索引
+        with _chunk_search_service_lock:
+            if _chunk_search_service is None:
+                # 使用默认路径创建服务实例
+                chunk_faiss_path = os.getenv('FAISS_INDEX_PATH', '../data/indexes/faiss') + '/document_index_chunks.faiss'
+                chunk_whoosh_path = os.getenv('WHOOSH_INDEX_PATH', '../data/indexes/whoosh')
+
+                logger.info(f"初始化分块搜索服务:")
+                logger.info(f"  - Faiss索引路径: {chunk_faiss_path}")
+                logger.info(f"  - Whoosh索引路径: {chunk_whoosh_path}")
+
+                _chunk_search_service = ChunkSearchService(
+                    chunk_faiss_index_path=chunk_faiss_path,
+                    chunk_whoosh_index_path=chunk_whoosh_path,
+                    use_ai_models=True
+                )
 
     return _chunk_search_service
 
@@ -0,0 +1,181 @@
+"""
+查询向量微批处理服务
+将并发搜索请求的查询文本合并为一次批量嵌入推理，减少逐条调用模型的开销
+"""
+import asyncio
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging_config import get_logger
+from app.services.ai_model_manager import ai_model_service
+
+logger = get_logger(__name__)
+
+
+class QueryEmbeddingBatcher:
+    """
+    查询向量微批处理器
+
+    搜索请求调用 submit 把查询文本放入队列并等待结果，后台协程在
+    batch_window 秒的窗口内收集并发到达的查询（最多 max_batch_size 条），
+    用一次 text_embedding 批量推理后按顺序把向量分发给各个请求
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 32,
+        batch_window: float = 0.01,
+        normalize_embeddings: bool = True,
+        max_queue_size: int = 256
+    ):
+        """
+        初始化微批处理器
+
+        Args:
+            max_batch_size: 单批最大查询条数
+            batch_window: 收集同批查询的最长等待时间(秒)
+            normalize_embeddings: 是否归一化嵌入向量
+            max_queue_size: 等待队列上限，队列满时提交方等待空位
+        """
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self.batch_window = batch_window
+        self.normalize_embeddings = normalize_embeddings
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        """后台批处理协程是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """启动后台批处理协程（需在事件循环中调用）"""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = False
+        self._task = asyncio.create_task(self._batch_loop())
+        logger.info("查询向量微批处理器已启动")
+
+    async def stop(self):
+        """停止后台批处理协程，并取消仍在等待的查询"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+        logger.info("查询向量微批处理器已停止")
+
+    async def submit(self, text: str) -> np.ndarray:
+        """
+        提交一条查询文本并等待其嵌入向量
+
+        Args:
+            text: 查询文本
+
+        Returns:
+            np.ndarray: 一维嵌入向量；处理器未运行时直接调用模型
+        """
+        if not self.is_running:
+            embedding = await ai_model_service.text_embedding(
+                text,
+                normalize_embeddings=self.normalize_embeddings
+            )
+            return np.asarray(embedding, dtype=np.float32).reshape(-1)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        if not self.is_running:
+            # 等待队列空位期间处理器已停止，队列不会再被消费
+            future.cancel()
+        return await future
+
+    async def _batch_loop(self):
+        """后台协程：按时间窗口收集查询并批量推理"""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[str, asyncio.Future]] = []
+        try:
+            while True:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.batch_window
+
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                    # Python 3.11及以前，取消请求恰好与队列取到查询同时发生时会被 wait_for 吞掉，
+                    # 按停止标志重新抛出，避免 stop() 一直等待
+                    if self._stopping:
+                        raise asyncio.CancelledError
+
+                pending, batch = batch, []
+                try:
+                    await self._embed_batch(pending)
+                finally:
+                    # 推理期间被取消时，本批未拿到结果的查询一并取消，避免调用方一直等待
+                    for _, future in pending:
+                        if not future.done():
+                            future.cancel()
+        except asyncio.CancelledError:
+            # 停止时已取出但未处理的查询直接取消
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+
+    async def _embed_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """
+        对一批查询执行一次嵌入推理并分发结果
+
+        Args:
+            batch: (查询文本, 等待结果的Future) 列表
+        """
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await ai_model_service.text_embedding(
+                texts,
+                normalize_embeddings=self.normalize_embeddings
+            )
+            embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+        except Exception as e:
+            logger.warning(f"批量生成查询向量失败: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(batch) > 1:
+            logger.debug("合并 {} 条查询为一次嵌入推理", len(batch))
+
+        for (_, future), embedding in zip(batch, embeddings):
+            # 调用方可能已被取消，跳过已完成的Future
+            if not future.done():
+                future.set_result(embedding)
+
+
+# 全局实例
+_query_embedding_batcher: Optional[QueryEmbeddingBatcher] = None
+
+
+def get_query_embedding_batcher() -> QueryEmbeddingBatcher:
+    """获取查询向量微批处理器实例"""
+    global _query_embedding_batcher
+    if _query_embedding_batcher is None:
+        _query_embedding_batcher = QueryEmbeddingBatcher()
+    return _query_embedding_batcher
@@ -5,8 +5,10 @@
 """
 
 import os
+import time
 import uuid
 import asyncio
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
@@ -16,12 +18,16 @@ from .file_scanner import FileScanner, FileInfo
 from .metadata_extractor import MetadataExtractor
 from .content_parser import ContentParser, ParsedContent
 from .chunk_index_service import get_chunk_index_service
+from .search_suggestions import get_cold_suggestion_queries
 from app.core.logging_config import logger
 
 # 导入统一配置
 from app.core.config import get_settings
 settings = get_settings()
 
+# 索引状态统计结果的缓存时间(秒)，状态栏轮询时避免反复遍历索引目录和统计数据库
+INDEX_STATUS_CACHE_TTL = 10.0
+
 
 class FileIndexService:
     """文件索引服务
@@ -87,6 +93,9 @@ class FileIndexService:
         # 内存中缓存已索引文件信息（用于变更检测）
         self._indexed_files_cache: Dict[str, FileInfo] = {}
 
+        # 索引状态统计缓存：(过期时间, 状态字典)
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
     def stop_indexing(self, task_id: Optional[int] = None) -> Dict[str, Any]:
         """停止索引构建任务
 
@@ -260,7 +269,9 @@ class FileIndexService:
                         'stopped': True
                     }
 
-                files = self.scanner.scan_directory(
+                # 目录扫描是阻塞IO，放到线程中执行，避免阻塞请求所在的事件循环
+                files = await asyncio.to_thread(
+                    self.scanner.scan_directory,
                     path,
                     recursive=True,
                     include_hidden=False,
@@ -455,6 +466,9 @@ class FileIndexService:
             }
         finally:
             self.index_status['is_building'] = False
+            self.reset_status_cache()
+            # 新索引的文件标题和关键词可能让此前的冷查询词产生建议
+            get_cold_suggestion_queries().clear()
 
     def _build_full_index_sync(self, scan_paths: List[str]) -> Dict[str, Any]:
         """同步版本的完整索引构建
@@ -536,7 +550,8 @@ class FileIndexService:
                     }
 
                 logger.info(f"🔍 扫描路径变更: {path}")
-                changed_files, deleted_files, _ = self.scanner.scan_changes(
+                changed_files, deleted_files, _ = await asyncio.to_thread(
+                    self.scanner.scan_changes,
                     path,
                     self._indexed_files_cache,
                     recursive=True,
@@ -669,6 +684,9 @@ class FileIndexService:
                 'success': False,
                 'error': str(e)
             }
+        finally:
+            self.reset_status_cache()
+            get_cold_suggestion_queries().clear()
 
     async def _save_files_to_database(self, all_files: List[FileInfo], documents: List[Dict[str, Any]]):
         """保存文件数据到数据库
@@ -1052,6 +1070,28 @@ class FileIndexService:
 
         return status
 
+    def get_cached_index_status(self, ttl: float = INDEX_STATUS_CACHE_TTL) -> Dict[str, Any]:
+        """
+        获取索引状态，在缓存有效期内复用上次的统计结果
+
+        Args:
+            ttl: 缓存时间(秒)
+
+        Returns:
+            Dict[str, Any]: 索引状态
+        """
+        cached = self._status_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1].copy()
+
+        status = self.get_index_status()
+        self._status_cache = (time.monotonic() + ttl, status)
+        return status.copy()
+
+    def reset_status_cache(self):
+        """清除索引状态缓存（索引构建、更新或删除后调用）"""
+        self._status_cache = None
+
     def search_files(
         self,
         query: str,
@@ -1110,6 +1150,7 @@ class FileIndexService:
 
             # 从缓存中删除
             self._indexed_files_cache.pop(file_path, None)
+            self.reset_status_cache()
 
             if not success:
                 logger.error(f"删除文件失败: {delete_result.get('error', '未知错误')}")
@@ -1204,6 +1245,7 @@ class FileIndexService:
 
 # 全局文件索引服务实例（单例模式）
 _file_index_service: Optional[FileIndexService] = None
+_file_index_service_lock = threading.Lock()
 
 
 def get_file_index_service() -> FileIndexService:
@@ -1214,24 +1256,27 @@ def get_file_index_service() -> FileIndexService:
     """
     global _file_index_service
     if _file_index_service is None:
-        from app.core.config import get_settings
-        settings = get_settings()
-
-        faiss_path, whoosh_path = settings.get_index_paths()
-        _file_index_service = FileIndexService(
-            data_root=settings.index.data_root,
-            faiss_index_path=faiss_path,
-            whoosh_index_path=whoosh_path,
-            use_chinese_analyzer=settings.index.use_chinese_analyzer,
-            scanner_config={
-                'max_workers': settings.index.scanner_max_workers,
-                'max_file_size': settings.index.max_file_size,
-                'supported_extensions': set(settings.index.supported_extensions)
-            },
-            parser_config={
-                'max_content_length': settings.index.max_content_length
-            }
-        )
+        # 双重检查，避免并发首次调用时重复创建服务实例
+        with _file_index_service_lock:
+            if _file_index_service is None:
+                from app.core.config import get_settings
+                settings = get_settings()
+
+                faiss_path, whoosh_path = settings.get_index_paths()
+                _file_index_service = FileIndexService(
+                    data_root=settings.index.data_root,
+                    faiss_index_path=faiss_path,
+                    whoosh_index_path=whoosh_path,
+                    use_chinese_analyzer=settings.index.use_chinese_analyzer,
+                    scanner_config={
+                        'max_workers': settings.index.scanner_max_workers,
+                        'max_file_size': settings.index.max_file_size,
+                        'supported_extensions': set(settings.index.supported_extensions)
+                    },
+                    parser_config={
+                        'max_content_length': settings.index.max_content_length
+                    }
+                )
 
-        logger.info("文件索引服务实例已创建")
+                logger.info("文件索引服务实例已创建")
     return _file_index_service
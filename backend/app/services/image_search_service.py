@@ -366,6 +366,8 @@ class ImageSearchService:
 
 # 全局实例
 _image_search_service = None
+# 初始化锁：并发请求只由第一个调用方执行初始化，其余等待其完成
+_image_search_init_lock = asyncio.Lock()
 
 
 def get_image_search_service() -> ImageSearchService:
@@ -393,6 +395,9 @@ async def ensure_image_search_service() -> ImageSearchService:
     service = get_image_search_service()
 
     if not service.is_initialized:
-        await service.initialize()
+        async with _image_search_init_lock:
+            # 等待锁期间可能已由其他请求完成初始化
+            if not service.is_initialized:
+                await service.initialize()
 
     return service
\ No newline at end of file
@@ -5,6 +5,8 @@ LLM查询增强服务 - 简化版
 
 import json
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional
 
 from app.services.ai_model_manager import ai_model_service
@@ -13,21 +15,49 @@ from app.core.logging_config import get_logger
 logger = get_logger(__name__)
 
 
+# 基于规则增强使用的同义词映射
+RULE_EXPANSIONS = {
+    '怎么用': ['使用方法', '操作指南', '教程', '使用步骤'],
+    '如何': ['怎么', '怎样', '如何操作', '方法'],
+    '什么是': ['定义', '概念', '含义', '解释'],
+    '为什么': ['原因', '理由', '原理', '成因'],
+    '下载': ['下载地址', '获取', '安装包'],
+    '安装': ['安装教程', '配置', '部署', '搭建'],
+    '打不开': ['无法启动', '启动失败', '运行错误'],
+    '错误': ['问题', '异常', 'bug', '故障'],
+    '教程': ['指南', '手册', '文档', '学习资料'],
+    '配置': ['设置', '参数', '选项', '自定义']
+}
+
+# 每个关键词取前3个同义词预先拼接好的扩展后缀，按映射顺序匹配
+RULE_EXPANSION_SUFFIXES = tuple(
+    (key, ' '.join(synonyms[:3])) for key, synonyms in RULE_EXPANSIONS.items()
+)
+
+
 class LLMQueryEnhancer:
     """LLM查询增强器 - 简化版
 
-    专注于查询扩展和重写功能，不包含复杂缓存机制
+    专注于查询扩展和重写功能，带进程内LRU缓存，相同查询不重复调用LLM
     """
 
-    def __init__(self, model_name: str = "qwen2.5:1.5b"):
+    def __init__(self, model_name: str = "qwen2.5:1.5b", cache_size: int = 4096):
         """初始化LLM查询增强器
 
         Args:
             model_name: Ollama模型名称
+            cache_size: 增强结果LRU缓存容量
         """
         self.model_name = model_name
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict[str, any]]" = OrderedDict()
         logger.info(f"LLM查询增强器初始化完成，使用模型: {model_name}")
 
+    def clear_cache(self):
+        """清空增强结果缓存（切换LLM模型配置后调用）"""
+        self._cache.clear()
+        logger.info("LLM查询增强缓存已清空")
+
     async def enhance_query(self, query: str) -> Dict[str, any]:
         """增强搜索查询
 
@@ -47,6 +77,12 @@ class LLMQueryEnhancer:
                 'enhanced': False
             }
 
+        # 命中进程内缓存直接返回
+        cached = self._cache.get(query)
+        if cached is not None:
+            self._cache.move_to_end(query)
+            return dict(cached)
+
         try:
             # 构建提示词
             prompt = self._build_simple_prompt(query)
@@ -66,12 +102,20 @@ class LLMQueryEnhancer:
             result = self._parse_simple_response(enhanced_content, query)
 
             logger.info(f"查询增强完成: '{query}' -> '{result['expanded_query']}'")
-            return result
+            self._cache_result(query, result)
+            return dict(result)
 
         except Exception as e:
             logger.error(f"查询增强失败: {str(e)}")
             return self._create_fallback_response(query)
 
+    def _cache_result(self, query: str, result: Dict[str, any]):
+        """写入LRU缓存，超出容量时淘汰最久未使用的条目"""
+        self._cache[query] = result
+        self._cache.move_to_end(query)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
     def _should_enhance_query(self, query: str) -> bool:
         """判断是否需要增强查询"""
         query = query.strip()
@@ -136,30 +180,14 @@ class LLMQueryEnhancer:
 
     def _create_rule_based_response(self, query: str) -> Dict[str, any]:
         """基于规则的查询增强"""
-        # 简单的同义词映射
-        expansions = {
-            '怎么用': ['使用方法', '操作指南', '教程', '使用步骤'],
-            '如何': ['怎么', '怎样', '如何操作', '方法'],
-            '什么是': ['定义', '概念', '含义', '解释'],
-            '为什么': ['原因', '理由', '原理', '成因'],
-            '下载': ['下载地址', '获取', '安装包'],
-            '安装': ['安装教程', '配置', '部署', '搭建'],
-            '打不开': ['无法启动', '启动失败', '运行错误'],
-            '错误': ['问题', '异常', 'bug', '故障'],
-            '教程': ['指南', '手册', '文档', '学习资料'],
-            '配置': ['设置', '参数', '选项', '自定义']
-        }
-
         query_lower = query.lower()
-        expanded_terms = []
+        expanded_query = query
 
-        for key, synonyms in expansions.items():
+        for key, suffix in RULE_EXPANSION_SUFFIXES:
             if key in query_lower:
-                expanded_terms.extend(synonyms)
+                expanded_query = f"{query} {suffix}"
                 break
 
-        expanded_query = query + ' ' + ' '.join(expanded_terms[:3])
-
         return {
             'success': True,
             'original_query': query,
@@ -181,11 +209,15 @@ class LLMQueryEnhancer:
 
 # 全局实例
 _llm_query_enhancer = None
+_llm_query_enhancer_lock = threading.Lock()
 
 
 def get_llm_query_enhancer() -> LLMQueryEnhancer:
     """获取LLM查询增强器实例"""
     global _llm_query_enhancer
     if _llm_query_enhancer is None:
-        _llm_query_enhancer = LLMQueryEnhancer()
+        # 双重检查，避免并发首次调用时创建多个实例（各自持有独立缓存）
+        with _llm_query_enhancer_lock:
+            if _llm_query_enhancer is None:
+                _llm_query_enhancer = LLMQueryEnhancer()
     return _llm_query_enhancer
\ No newline at end of file
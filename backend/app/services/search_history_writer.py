@@ -0,0 +1,163 @@
+"""
+搜索历史批量写入服务
+将搜索历史记录缓冲到异步队列中，由后台协程批量写入数据库
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.database import SessionLocal
+from app.core.logging_config import get_logger
+from app.models.search_history import SearchHistoryModel
+from app.services.search_stats import get_today_search_counter
+from app.services.search_suggestions import get_cold_suggestion_queries, get_suggestion_result_cache
+
+logger = get_logger(__name__)
+
+# 预先构建的批量INSERT语句，所有批次复用同一语句及其编译缓存
+_INSERT_SEARCH_HISTORY = insert(SearchHistoryModel.__table__)
+
+
+class SearchHistoryWriter:
+    """
+    搜索历史批量写入器
+
+    搜索请求只负责把记录放入队列，后台协程每攒够 batch_size 条或等待
+    flush_interval 秒后，用一次批量INSERT写入，避免每次搜索单独提交事务
+    """
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 500, flush_interval: float = 0.5):
+        """
+        初始化批量写入器
+
+        Args:
+            max_queue_size: 队列最大长度
+            batch_size: 单批最大写入条数
+            flush_interval: 批次最长等待时间(秒)
+        """
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        """后台写入协程是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """启动后台写入协程（需在事件循环中调用）"""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = False
+        self._task = asyncio.create_task(self._drain_loop())
+        logger.info("搜索历史批量写入器已启动")
+
+    async def stop(self):
+        """停止后台写入协程，并写入队列中剩余的记录"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        remaining = []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        if remaining:
+            await asyncio.to_thread(self._write_batch, remaining)
+        logger.info(f"搜索历史批量写入器已停止，退出前写入 {len(remaining)} 条记录")
+
+    def enqueue(self, record: Dict[str, Any]) -> bool:
+        """
+        将一条搜索历史放入写入队列
+
+        Args:
+            record: 搜索历史字段字典
+
+        Returns:
+            bool: 是否入队成功；写入器未运行或队列已满时返回False，由调用方自行写入
+        """
+        if not self.is_running:
+            return False
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("搜索历史写入队列已满，改为单条写入")
+            return False
+
+    async def _drain_loop(self):
+        """后台协程：按批次从队列取出记录并写入数据库"""
+        loop = asyncio.get_running_loop()
+        batch: List[Dict[str, Any]] = []
+        try:
+            while True:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.flush_interval
+
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                    # Python 3.11及以前，取消请求恰好与队列取到记录同时发生时会被 wait_for 吞掉，
+                    # 按停止标志重新抛出，避免 stop() 一直等待
+                    if self._stopping:
+                        raise asyncio.CancelledError
+
+                pending, batch = batch, []
+                await asyncio.to_thread(self._write_batch, pending)
+        except asyncio.CancelledError:
+            # 停止时已取出但未写入的记录直接落库
+            if batch:
+                self._write_batch(batch)
+            raise
+
+    @staticmethod
+    def _write_batch(records: List[Dict[str, Any]]):
+        """
+        批量写入搜索历史
+
+        Args:
+            records: 搜索历史字段字典列表
+        """
+        db = SessionLocal()
+        try:
+            db.execute(_INSERT_SEARCH_HISTORY, records)
+            db.commit()
+            get_today_search_counter().record(record['created_at'] for record in records)
+            get_suggestion_result_cache().clear()
+            # 新写入的有结果搜索词可能让此前的冷查询词产生建议
+            get_cold_suggestion_queries().discard_matching(
+                record['search_query'] for record in records if record.get('result_count')
+            )
+            logger.debug(f"批量写入搜索历史: {len(records)} 条")
+        except Exception as e:
+            logger.warning(f"批量写入搜索历史失败: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+
+# 全局实例
+_search_history_writer: Optional[SearchHistoryWriter] = None
+
+
+def get_search_history_writer() -> SearchHistoryWriter:
+    """获取搜索历史批量写入器实例"""
+    global _search_history_writer
+    if _search_history_writer is None:
+        _search_history_writer = SearchHistoryWriter()
+    return _search_history_writer
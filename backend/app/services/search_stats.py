@@ -0,0 +1,85 @@
+"""
+搜索统计服务
+在内存中维护今日搜索次数，状态栏轮询时无需每次统计搜索历史表
+"""
+import threading
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class TodaySearchCounter:
+    """
+    今日搜索次数计数器
+
+    首次读取或跨天后从数据库统计一次，之后搜索历史每写入一批就累加计数；
+    删除历史记录时作废计数，下次读取重新统计
+    """
+
+    def __init__(self):
+        """初始化计数器"""
+        self._lock = threading.Lock()
+        self._day: Optional[date] = None
+        self._count = 0
+        self._loaded = False
+        # 每次累加或作废都递增版本号，统计期间版本变化时丢弃统计结果
+        self._version = 0
+
+    def record(self, created_times: Iterable[datetime]):
+        """
+        搜索历史写入数据库后累加计数
+
+        Args:
+            created_times: 已写入记录的搜索时间
+        """
+        with self._lock:
+            self._version += 1
+            if self._loaded:
+                self._count += sum(1 for created_at in created_times if created_at.date() == self._day)
+
+    def invalidate(self):
+        """作废当前计数（删除搜索历史后调用）"""
+        with self._lock:
+            self._version += 1
+            self._loaded = False
+
+    def get(self, load: Callable[[date], int]) -> int:
+        """
+        获取今日搜索次数
+
+        Args:
+            load: 计数不可用时从数据库统计指定日期搜索次数的函数
+
+        Returns:
+            int: 今日搜索次数
+        """
+        today = date.today()
+        with self._lock:
+            if self._loaded and self._day == today:
+                return self._count
+            version = self._version
+
+        count = load(today)
+
+        with self._lock:
+            if self._version == version:
+                self._day = today
+                self._count = count
+                self._loaded = True
+                logger.debug("今日搜索次数已从数据库统计: {}", count)
+        return count
+
+
+# 全局实例
+_today_search_counter: Optional[TodaySearchCounter] = None
+
+
+def get_today_search_counter() -> TodaySearchCounter:
+    """获取今日搜索次数计数器实例"""
+    global _today_search_counter
+    if _today_search_counter is None:
+        _today_search_counter = TodaySearchCounter()
+    return _today_search_counter
@@ -0,0 +1,171 @@
+"""
+搜索建议状态服务
+维护搜索建议结果缓存和近期确认无匹配的冷查询词，搜索历史写入和索引任务完成后及时失效
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ColdSuggestionQueries:
+    """
+    冷查询词集合
+
+    记录历史记录和文件索引都没有匹配的查询词，下次请求直接跳过检索；
+    写入新的搜索历史时移除能被新记录匹配到的词，索引任务完成后整体清空，
+    另按 ttl 整体过期兜底
+    """
+
+    def __init__(self, ttl: float = 3600, max_size: int = 10000):
+        """
+        初始化冷查询集合
+
+        Args:
+            ttl: 集合整体过期时间(秒)
+            max_size: 容量上限，超出时清空重建
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._queries: Set[str] = set()
+        self._expire_at = time.monotonic() + ttl
+
+    def contains(self, query: str) -> bool:
+        """
+        判断查询词是否为冷查询
+
+        Args:
+            query: 已去除首尾空白的查询词
+
+        Returns:
+            bool: 是否为冷查询
+        """
+        with self._lock:
+            if time.monotonic() >= self._expire_at:
+                self._queries = set()
+                self._expire_at = time.monotonic() + self.ttl
+                return False
+            return query in self._queries
+
+    def add(self, query: str):
+        """
+        记录没有历史/索引匹配的查询词
+
+        Args:
+            query: 已去除首尾空白的查询词
+        """
+        with self._lock:
+            if len(self._queries) >= self.max_size:
+                self._queries.clear()
+            self._queries.add(query)
+
+    def discard_matching(self, search_queries: Iterable[str]):
+        """
+        移除能被新写入的搜索历史匹配到的冷查询词（建议检索按忽略大小写的子串匹配历史）
+
+        Args:
+            search_queries: 新写入且有结果的搜索词
+        """
+        lowered = [search_query.lower() for search_query in search_queries if search_query]
+        if not lowered:
+            return
+        with self._lock:
+            if not self._queries:
+                return
+            self._queries = {
+                query for query in self._queries
+                if not any(query.lower() in search_query for search_query in lowered)
+            }
+
+    def clear(self):
+        """清空冷查询集合（索引任务完成后调用）"""
+        with self._lock:
+            self._queries = set()
+
+
+class SuggestionResultCache:
+    """
+    搜索建议结果缓存
+
+    连续输入时同一查询词会被反复请求，短时间内直接返回缓存结果；
+    搜索历史写入或删除后整体清空，新的搜索词立即出现在建议中
+    """
+
+    def __init__(self, ttl: float = 30, max_size: int = 1024):
+        """
+        初始化结果缓存
+
+        Args:
+            ttl: 单条缓存有效期(秒)
+            max_size: 容量上限，超出时清空重建
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # (查询词, 数量) -> (过期时间, 建议数据)
+        self._entries: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+
+    def get(self, query: str, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        读取未过期的搜索建议缓存
+
+        Args:
+            query: 已去除首尾空白的查询词
+            limit: 建议数量
+
+        Returns:
+            Optional[Dict[str, Any]]: 缓存的建议数据，未命中或已过期返回None
+        """
+        with self._lock:
+            cached = self._entries.get((query, limit))
+            if cached is None:
+                return None
+            expire_at, data = cached
+            if time.monotonic() >= expire_at:
+                self._entries.pop((query, limit), None)
+                return None
+            return data
+
+    def put(self, query: str, limit: int, data: Dict[str, Any]):
+        """
+        缓存一次搜索建议结果
+
+        Args:
+            query: 已去除首尾空白的查询词
+            limit: 建议数量
+            data: 建议数据
+        """
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.clear()
+            self._entries[(query, limit)] = (time.monotonic() + self.ttl, data)
+
+    def clear(self):
+        """清空建议缓存（搜索历史写入或删除后调用）"""
+        with self._lock:
+            self._entries.clear()
+
+
+# 全局实例
+_suggestion_result_cache: Optional[SuggestionResultCache] = None
+_cold_suggestion_queries: Optional[ColdSuggestionQueries] = None
+
+
+def get_cold_suggestion_queries() -> ColdSuggestionQueries:
+    """获取冷查询集合实例"""
+    global _cold_suggestion_queries
+    if _cold_suggestion_queries is None:
+        _cold_suggestion_queries = ColdSuggestionQueries()
+    return _cold_suggestion_queries
+
+
+def get_suggestion_result_cache() -> SuggestionResultCache:
+    """获取搜索建议结果缓存实例"""
+    global _suggestion_result_cache
+    if _suggestion_result_cache is None:
+        _suggestion_result_cache = SuggestionResultCache()
+    return _suggestion_result_cache
@@ -4,6 +4,8 @@
 """
 import json
 import logging
+import threading
+import time
 from typing import List, Dict, Any, Optional, Union
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
@@ -15,10 +17,21 @@ logger = logging.getLogger(__name__)
 
 
 class SettingsService:
-    """应用设置服务类"""
+    """
+    应用设置服务类
+
+    设置读多写少，读取结果按设置键缓存在进程内；任何写操作提交后递增
+    缓存版本并清空缓存，下一次读取时重新从数据库加载
+    """
 
     def __init__(self):
         self._db: Optional[Session] = None
+        # 设置缓存: 设置键 -> 设置字典，None表示尚未加载
+        self._settings_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._cache_version = 0
+        self._cache_lock = threading.Lock()
+        # 进程启动标识，避免重启后版本号从0重新计数导致ETag误判
+        self._boot_id = format(time.time_ns(), "x")
 
     def _get_db(self) -> Session:
         """获取数据库会话"""
@@ -32,6 +45,42 @@ class SettingsService:
             self._db.close()
             self._db = None
 
+    @property
+    def etag(self) -> str:
+        """当前设置数据版本对应的ETag，任何写操作后都会变化"""
+        return f'"settings-{self._boot_id}-{self._cache_version}"'
+
+    def _invalidate_cache(self):
+        """写操作提交后使设置缓存失效"""
+        with self._cache_lock:
+            self._cache_version += 1
+            self._settings_cache = None
+
+    def _get_settings_map(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取按设置键索引的全部设置，优先读取缓存
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 设置键到设置字典的映射
+        """
+        cache = self._settings_cache
+        if cache is not None:
+            return cache
+
+        version = self._cache_version
+        try:
+            db = self._get_db()
+            settings = db.query(AppSettingsModel).all()
+            cache = {setting.setting_key: setting.to_dict() for setting in settings}
+        finally:
+            self._close_db()
+
+        with self._cache_lock:
+            # 加载期间若有写操作，本次结果可能已过期，不写入缓存
+            if version == self._cache_version:
+                self._settings_cache = cache
+        return cache
+
     def get_all_settings(self) -> List[Dict[str, Any]]:
         """
         获取所有设置项
@@ -40,14 +89,11 @@ class SettingsService:
             List[Dict[str, Any]]: 设置项列表
         """
         try:
-            db = self._get_db()
-            settings = db.query(AppSettingsModel).all()
-            return [setting.to_dict() for setting in settings]
+            # 返回副本，避免调用方修改缓存内容
+            return [dict(setting) for setting in self._get_settings_map().values()]
         except Exception as e:
             logger.error(f"获取设置失败: {str(e)}")
             raise HTTPException(status_code=500, detail=f"获取设置失败: {str(e)}")
-        finally:
-            self._close_db()
 
     def get_setting(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -60,19 +106,11 @@ class SettingsService:
             Optional[Dict[str, Any]]: 设置项，不存在返回None
         """
         try:
-            db = self._get_db()
-            setting = db.query(AppSettingsModel).filter(
-                AppSettingsModel.setting_key == key
-            ).first()
-
-            if setting:
-                return setting.to_dict()
-            return None
+            setting = self._get_settings_map().get(key)
+            return dict(setting) if setting else None
         except Exception as e:
             logger.error(f"获取设置 {key} 失败: {str(e)}")
             raise HTTPException(status_code=500, detail=f"获取设置失败: {str(e)}")
-        finally:
-            self._close_db()
 
     def get_setting_value(self, key: str, default: Any = None) -> Any:
         """
@@ -87,16 +125,33 @@ class SettingsService:
         """
         try:
             setting_dict = self.get_setting(key)
-            if setting_dict:
-                setting = AppSettingsModel()
-                setting.setting_key = setting_dict['setting_key']
-                setting.setting_value = setting_dict['setting_value']
-                setting.setting_type = setting_dict['setting_type']
-                return setting.get_parsed_value()
-            return default
         except Exception as e:
             logger.error(f"获取设置值 {key} 失败: {str(e)}")
             return default
+        return self.parse_setting_value(setting_dict, default)
+
+    def parse_setting_value(self, setting_dict: Optional[Dict[str, Any]], default: Any = None) -> Any:
+        """
+        将已获取的设置项解析为原始值
+
+        Args:
+            setting_dict: get_setting 返回的设置项，None表示不存在
+            default: 默认值
+
+        Returns:
+            Any: 解析后的设置值，设置项不存在或解析失败返回默认值
+        """
+        if not setting_dict:
+            return default
+        try:
+            setting = AppSettingsModel()
+            setting.setting_key = setting_dict['setting_key']
+            setting.setting_value = setting_dict['setting_value']
+            setting.setting_type = setting_dict['setting_type']
+            return setting.get_parsed_value()
+        except Exception as e:
+            logger.error(f"获取设置值 {setting_dict.get('setting_key')} 失败: {str(e)}")
+            return default
 
     def create_setting(
         self,
@@ -137,6 +192,7 @@ class SettingsService:
 
             db.add(setting)
             db.commit()
+            self._invalidate_cache()
             db.refresh(setting)
 
             logger.info(f"创建设置项成功: {key}")
@@ -173,6 +229,7 @@ class SettingsService:
             # 更新值
             setting.update_value(value)
             db.commit()
+            self._invalidate_cache()
             db.refresh(setting)
 
             logger.info(f"更新设置项成功: {key} = {value}")
@@ -207,6 +264,7 @@ class SettingsService:
 
             db.delete(setting)
             db.commit()
+            self._invalidate_cache()
 
             logger.info(f"删除设置项成功: {key}")
             return True
@@ -230,43 +288,41 @@ class SettingsService:
         """
         try:
             db = self._get_db()
-            created_settings = []
 
+            # 一次查询取出已存在的键，代替逐条检查
+            keys = {setting_data.get('key') for setting_data in settings_data if setting_data.get('key')}
+            skipped_keys = {
+                key for (key,) in db.query(AppSettingsModel.setting_key).filter(
+                    AppSettingsModel.setting_key.in_(keys)
+                )
+            } if keys else set()
+
+            created_settings = []
             for setting_data in settings_data:
                 key = setting_data.get('key')
-                value = setting_data.get('value')
-                setting_type = setting_data.get('type', 'string')
-                description = setting_data.get('description')
 
-                if not key:
+                # 跳过空键、已存在的键以及本批次中重复的键
+                if not key or key in skipped_keys:
                     continue
+                skipped_keys.add(key)
 
-                # 检查是否已存在
-                existing = db.query(AppSettingsModel).filter(
-                    AppSettingsModel.setting_key == key
-                ).first()
-
-                if existing:
-                    continue
-
-                # 创建设置
+                setting_type = setting_data.get('type', 'string')
                 setting = AppSettingsModel()
                 setting.setting_key = key
-                setting.setting_value = AppSettingsModel.parse_value_to_string(value, setting_type)
+                setting.setting_value = AppSettingsModel.parse_value_to_string(setting_data.get('value'), setting_type)
                 setting.setting_type = setting_type
-                setting.description = description
-
-                db.add(setting)
+                setting.description = setting_data.get('description')
                 created_settings.append(setting)
 
+            # 一次flush批量插入，并在提交前取出结果，避免提交后逐条refresh
+            db.add_all(created_settings)
+            db.flush()
+            created_dicts = [setting.to_dict() for setting in created_settings]
             db.commit()
-
-            # 刷新并返回创建的设置
-            for setting in created_settings:
-                db.refresh(setting)
+            self._invalidate_cache()
 
             logger.info(f"批量创建设置项成功: {len(created_settings)} 个")
-            return [setting.to_dict() for setting in created_settings]
+            return created_dicts
         except Exception as e:
             logger.error(f"批量创建设置项失败: {str(e)}")
             raise HTTPException(status_code=500, detail=f"批量创建设置项失败: {str(e)}")
@@ -289,6 +345,7 @@ class SettingsService:
             # 清除所有现有设置
             db.query(AppSettingsModel).delete()
             db.commit()
+            self._invalidate_cache()
 
             # 创建默认设置
             created_count = 0
@@ -307,6 +364,7 @@ class SettingsService:
                     continue
 
             db.commit()
+            self._invalidate_cache()
 
             logger.info(f"重置设置为默认值成功: {created_count} 个设置项")
             return {
@@ -408,6 +466,7 @@ class SettingsService:
                     continue
 
             db.commit()
+            self._invalidate_cache()
 
             logger.info(f"导入设置完成: 导入 {imported_count} 个，跳过 {skipped_count} 个")
             return {
@@ -0,0 +1,172 @@
+"""
+系统状态采样服务
+后台协程定时采样系统资源和数据库状态，健康检查接口直接读取最近一次快照
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import psutil
+
+from app.core.config import get_settings
+from app.core.database import get_database_info
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 字节数换算为GB的除数
+_GIB = 1073741824.0
+
+# 导入时先采样一次CPU计数，之后 interval=None 的调用立即返回距上次调用期间的CPU占用率
+psutil.cpu_percent(interval=None)
+
+
+@dataclass(frozen=True, slots=True)
+class SystemSnapshot:
+    """系统资源与数据库状态快照（/health 与 /running-status 共用）"""
+    memory: Any
+    disk: Any
+    cpu_percent: float
+    db_status: Dict[str, Any]
+    # 健康检查响应中的 system 字段，采样时格式化一次，快照有效期内各请求共用
+    system_info: Dict[str, Any]
+    expires_at: float
+
+
+def _format_usage(total: int, used: int, percent: float) -> Dict[str, Any]:
+    """
+    构建内存/磁盘占用信息
+
+    Args:
+        total: 总字节数
+        used: 已用字节数
+        percent: 占用百分比
+
+    Returns:
+        Dict[str, Any]: 便于展示的GB字符串，以及原始字节数
+    """
+    return {
+        "total": f"{total / _GIB:.1f}GB",
+        "used": f"{used / _GIB:.1f}GB",
+        "percent": percent,
+        "total_bytes": total,
+        "used_bytes": used
+    }
+
+
+class SystemMonitor:
+    """
+    系统状态采样器
+
+    运行时后台协程每隔 ttl/2 秒在线程中采样一次，接口读取快照时总能拿到未过期的数据；
+    未启动或快照过期时，由第一个请求重新采样，其余并发请求等待并复用同一份结果
+    """
+
+    def __init__(self, ttl: float = 5.0):
+        """
+        初始化采样器
+
+        Args:
+            ttl: 快照有效期(秒)
+        """
+        self.ttl = ttl
+        self._snapshot: Optional[SystemSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        """后台采样协程是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """启动后台采样协程（需在事件循环中调用）"""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._sample_loop())
+        logger.info("系统状态采样器已启动")
+
+    async def stop(self):
+        """停止后台采样协程"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("系统状态采样器已停止")
+
+    async def get_snapshot(self) -> SystemSnapshot:
+        """
+        获取系统状态快照，在有效期内直接复用
+
+        Returns:
+            SystemSnapshot: 系统状态快照
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < snapshot.expires_at:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() >= snapshot.expires_at:
+                snapshot = await asyncio.to_thread(self._take_snapshot)
+                self._snapshot = snapshot
+        return snapshot
+
+    def _take_snapshot(self) -> SystemSnapshot:
+        """
+        采样系统资源并检查数据库连接（在线程中调用）
+
+        Returns:
+            SystemSnapshot: 新的系统状态快照
+        """
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        cpu_percent = psutil.cpu_percent(interval=None)
+        return SystemSnapshot(
+            memory=memory,
+            disk=disk,
+            cpu_percent=cpu_percent,
+            db_status=get_database_info(),
+            system_info={
+                "cpu_percent": cpu_percent,
+                "memory": _format_usage(memory.total, memory.used, memory.percent),
+                "disk": _format_usage(disk.total, disk.used, disk.percent)
+            },
+            expires_at=time.monotonic() + self.ttl
+        )
+
+    async def _sample_loop(self):
+        """后台协程：按固定节拍刷新快照，节拍以事件循环时钟累加，不受单次采样耗时影响"""
+        loop = asyncio.get_running_loop()
+        interval = self.ttl / 2
+        next_run = loop.time()
+        while True:
+            try:
+                snapshot = await asyncio.to_thread(self._take_snapshot)
+                self._snapshot = snapshot
+            except Exception as e:
+                logger.warning(f"采样系统状态失败: {str(e)}")
+
+            next_run += interval
+            # 采样耗时超过一个节拍时跳过错过的节拍，不连续补采
+            now = loop.time()
+            if next_run < now:
+                next_run = now + interval
+            await asyncio.sleep(next_run - now)
+
+
+# 全局实例
+_system_monitor: Optional[SystemMonitor] = None
+
+
+def get_system_monitor() -> SystemMonitor:
+    """获取系统状态采样器实例"""
+    global _system_monitor
+    if _system_monitor is None:
+        _system_monitor = SystemMonitor(ttl=get_settings().api.system_snapshot_ttl)
+    return _system_monitor
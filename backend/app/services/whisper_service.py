@@ -281,9 +281,9 @@ class WhisperTranscriptionService(BaseAIModel):
                     model_name=self.model_name
                 )
 
-            # 检查音频时长
+            # 检查音频时长（librosa读取音频头/解码是阻塞操作，放到线程中执行）
             try:
-                duration = librosa.get_duration(path=audio_input)
+                duration = await asyncio.to_thread(librosa.get_duration, path=audio_input)
                 # 获取最大时长限制，支持索引模式
                 max_duration = self.config.get("max_duration", 30)
                 if kwargs.get("indexing_mode", False):
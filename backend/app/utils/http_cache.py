@@ -0,0 +1,76 @@
+"""
+HTTP条件请求的辅助函数
+为只读GET接口生成ETag，客户端携带相同的If-None-Match时直接返回304
+"""
+import hashlib
+from typing import Any, Dict
+
+import orjson
+from fastapi import Request, Response
+
+# 允许客户端缓存响应，但每次使用前都要带ETag向服务端确认
+CACHE_CONTROL = "private, no-cache"
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """
+    构建条件请求相关的响应头
+
+    Args:
+        etag: 带引号的ETag值
+
+    Returns:
+        Dict[str, str]: ETag和Cache-Control响应头
+    """
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    判断请求携带的If-None-Match是否与当前ETag匹配
+
+    Args:
+        request: 当前请求
+        etag: 带引号的ETag值
+
+    Returns:
+        bool: 匹配时返回True，应答304
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    构建304响应
+
+    Args:
+        etag: 带引号的ETag值
+
+    Returns:
+        Response: 不带响应体的304响应
+    """
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def etag_json_response(request: Request, content: Any) -> Response:
+    """
+    序列化响应内容并按内容哈希生成ETag
+
+    内容未变化时返回304，省去响应体的传输和客户端解析
+
+    Args:
+        request: 当前请求
+        content: 可被orjson序列化的响应内容
+
+    Returns:
+        Response: 200 JSON响应或304响应
+    """
+    body = orjson.dumps(content)
+    etag = f'"{hashlib.blake2s(body, digest_size=16).hexdigest()}"'
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
@@ -0,0 +1,51 @@
+"""
+NDJSON流式响应的辅助函数
+列表接口在客户端声明 Accept: application/x-ndjson 时逐行输出记录，不再整体拼装JSON数组
+"""
+from typing import Any, Dict, Iterable, Iterator
+
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """
+    判断客户端是否请求NDJSON格式的响应
+
+    Args:
+        request: 当前请求
+
+    Returns:
+        bool: Accept请求头包含 application/x-ndjson 时返回True
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_page_response(rows: Iterable[Dict[str, Any]], total: int, limit: int, offset: int) -> StreamingResponse:
+    """
+    将一页记录以NDJSON流输出
+
+    每条记录一行JSON，分页信息放在响应头中
+
+    Args:
+        rows: 可被orjson序列化的记录，按需逐条生成
+        total: 过滤后的总数
+        limit: 返回结果数量
+        offset: 偏移量
+
+    Returns:
+        StreamingResponse: NDJSON流式响应
+    """
+    def lines() -> Iterator[bytes]:
+        for row in rows:
+            yield orjson.dumps(row) + b"\n"
+
+    headers = {
+        "X-Total-Count": str(total),
+        "X-Limit": str(limit),
+        "X-Offset": str(offset),
+    }
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
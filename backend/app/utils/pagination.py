@@ -0,0 +1,72 @@
+"""
+分页查询的辅助函数
+用窗口函数在取分页数据的同一条查询中带出总数，避免额外的COUNT查询
+"""
+from typing import Any, Iterator, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+# 流式分页时每次从游标取出的行数
+STREAM_BATCH_SIZE = 200
+
+
+def paginate_with_total(query: Query, order_by: Any, limit: int, offset: int) -> Tuple[List[Any], int]:
+    """
+    分页查询并同时返回过滤后的总数
+
+    Args:
+        query: 已应用过滤条件的单实体查询
+        order_by: 排序表达式
+        limit: 返回结果数量
+        offset: 偏移量
+
+    Returns:
+        Tuple[List[Any], int]: (当前页的实体列表, 总数)
+    """
+    rows = query.add_columns(
+        func.count().over().label("total")
+    ).order_by(order_by).offset(offset).limit(limit).all()
+
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+
+    # 页为空时窗口列无法带出总数；只有偏移量超出范围或未取任何行时才需要补一次COUNT
+    total = query.count() if offset > 0 or limit <= 0 else 0
+    return [], total
+
+
+def iter_page_with_total(
+    query: Query, order_by: Any, limit: int, offset: int, batch_size: int = STREAM_BATCH_SIZE
+) -> Tuple[Iterator[Any], int]:
+    """
+    分页查询并逐批迭代结果，同时返回过滤后的总数
+
+    先取出第一行以读取窗口列中的总数，其余行在迭代时按 batch_size 分批从游标读取，
+    适合边查询边输出的流式响应
+
+    Args:
+        query: 已应用过滤条件的单实体查询
+        order_by: 排序表达式
+        limit: 返回结果数量
+        offset: 偏移量
+        batch_size: 每批读取的行数
+
+    Returns:
+        Tuple[Iterator[Any], int]: (当前页实体的迭代器, 总数)
+    """
+    rows = iter(query.add_columns(
+        func.count().over().label("total")
+    ).order_by(order_by).offset(offset).limit(limit).yield_per(batch_size))
+
+    first = next(rows, None)
+    if first is None:
+        total = query.count() if offset > 0 or limit <= 0 else 0
+        return iter(()), total
+
+    def entities() -> Iterator[Any]:
+        yield first[0]
+        for row in rows:
+            yield row[0]
+
+    return entities(), first.total
@@ -44,6 +44,10 @@ async def lifespan(app: FastAPI):
         init_database()
         logger.info("数据库初始化完成")
 
+        # 上次运行中断的索引任务不会继续执行，标记为失败
+        from app.api.index import fail_interrupted_index_jobs
+        fail_interrupted_index_jobs()
+
             # 初始化AI模型服务
         logger.info("加载AI模型...")
         try:
@@ -71,6 +75,18 @@ async def lifespan(app: FastAPI):
             logger.warning(f"索引缓存初始化失败: {str(e)}")
             logger.info("继续运行，但首次增量更新可能较慢")
 
+        # 启动搜索历史批量写入器
+        from app.services.search_history_writer import get_search_history_writer
+        get_search_history_writer().start()
+
+        # 启动查询向量微批处理器
+        from app.services.embedding_batcher import get_query_embedding_batcher
+        get_query_embedding_batcher().start()
+
+        # 启动系统状态采样器
+        from app.services.system_monitor import get_system_monitor
+        get_system_monitor().start()
+
         logger.info("✅ 小遥搜索服务启动完成")
         logger.info(f"📖 API文档: http://127.0.0.1:8000/docs")
         logger.info(f"📋 ReDoc文档: http://127.0.0.1:8000/redoc")
@@ -84,6 +100,18 @@ async def lifespan(app: FastAPI):
     # 关闭时执行
     logger.info("小遥搜索服务关闭中...")
     try:
+        # 写入队列中剩余的搜索历史
+        from app.services.search_history_writer import get_search_history_writer
+        await get_search_history_writer().stop()
+
+        # 停止查询向量微批处理器
+        from app.services.embedding_batcher import get_query_embedding_batcher
+        await get_query_embedding_batcher().stop()
+
+        # 停止系统状态采样器
+        from app.services.system_monitor import get_system_monitor
+        await get_system_monitor().stop()
+
         # TODO: 清理资源
         # await cleanup_resources()
         logger.info("资源清理完成")
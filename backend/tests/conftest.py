@@ -0,0 +1,30 @@
+"""
+测试公共配置
+在导入应用模块前将数据库和日志指向临时目录，避免读写本地数据
+"""
+import os
+import tempfile
+
+import pytest
+
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="xiaoyao_test_")
+os.environ.setdefault("DATABASE_PATH", os.path.join(_TEST_DATA_DIR, "xiaoyao_search.db"))
+os.environ.setdefault("LOG_FILE", os.path.join(_TEST_DATA_DIR, "app.log"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def init_test_database():
+    """初始化测试数据库表结构"""
+    from app.core.database import init_database
+    init_database()
+
+
+@pytest.fixture
+def db_session():
+    """测试用数据库会话"""
+    from app.core.database import SessionLocal
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+"""
+AI模型配置API测试
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import config as config_api
+from app.core.i18n import i18n
+from app.models.ai_model import AIModelModel
+
+MISSING_ID = 999999
+
+
+@pytest.fixture
+def client():
+    """仅挂载AI模型配置路由的测试客户端"""
+    app = FastAPI()
+    app.include_router(config_api.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def model_ids(db_session, monkeypatch):
+    """创建一个配置正常和一个 config_json 损坏的嵌入模型"""
+    async def fake_text_embedding(text, **kwargs):
+        return [0.1, 0.2, 0.3]
+
+    monkeypatch.setattr(config_api.ai_model_service, "text_embedding", fake_text_embedding)
+
+    models = [
+        AIModelModel(model_type="embedding", provider="local", model_name="test-good", config_json="{}"),
+        AIModelModel(model_type="embedding", provider="local", model_name="test-bad", config_json="{not json"),
+    ]
+    db_session.add_all(models)
+    db_session.commit()
+    ids = [model.id for model in models]
+    yield ids
+    db_session.query(AIModelModel).filter(AIModelModel.id.in_(ids)).delete(synchronize_session=False)
+    db_session.commit()
+
+
+def _results_by_id(response) -> dict:
+    assert response.status_code == 200
+    return {item["model_id"]: item for item in response.json()["data"]}
+
+
+def test_batch_reports_each_model(client, model_ids):
+    good_id, bad_id = model_ids
+    response = client.post("/api/config/ai-models/test-batch", json={"model_ids": [good_id, bad_id, MISSING_ID]})
+    results = _results_by_id(response)
+
+    assert list(results) == [good_id, bad_id, MISSING_ID]
+    assert results[good_id]["test_passed"] is True
+    # 配置解析失败只影响该模型，不会让整批请求失败
+    assert results[bad_id]["test_passed"] is False
+    assert results[MISSING_ID] == {
+        "model_id": MISSING_ID,
+        "test_passed": False,
+        "test_message": i18n.t("model.not_found", "zh_CN"),
+    }
+
+
+def test_batch_maps_raised_exceptions(client, model_ids, monkeypatch):
+    good_id, bad_id = model_ids
+    run_model_test = config_api._run_model_test
+
+    async def failing_run_model_test(model_config, request, locale):
+        if model_config.id == bad_id:
+            raise RuntimeError("boom")
+        return await run_model_test(model_config, request, locale)
+
+    monkeypatch.setattr(config_api, "_run_model_test", failing_run_model_test)
+
+    results = _results_by_id(
+        client.post("/api/config/ai-models/test-batch", json={"model_ids": [good_id, bad_id]})
+    )
+    assert results[good_id]["test_passed"] is True
+    assert results[bad_id] == {"model_id": bad_id, "test_passed": False, "test_message": "boom"}
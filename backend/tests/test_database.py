@@ -0,0 +1,29 @@
+"""
+数据库连接配置测试
+"""
+from sqlalchemy import text
+
+from app.core.database import BUSY_TIMEOUT, SessionLocal, engine
+
+
+def test_connections_use_wal_and_busy_timeout():
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == BUSY_TIMEOUT * 1000
+
+
+def test_write_not_blocked_by_open_read_transaction():
+    reader = engine.connect()
+    read_txn = reader.begin()
+    try:
+        reader.execute(text("SELECT COUNT(*) FROM app_settings")).scalar()
+
+        writer = SessionLocal()
+        try:
+            writer.execute(text("UPDATE app_settings SET description = description"))
+            writer.commit()
+        finally:
+            writer.close()
+    finally:
+        read_txn.rollback()
+        reader.close()
@@ -0,0 +1,100 @@
+"""
+查询向量微批处理器测试
+"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services import embedding_batcher
+from app.services.embedding_batcher import QueryEmbeddingBatcher
+
+
+def test_concurrent_queries_share_one_batch(monkeypatch):
+    calls = []
+
+    async def fake_text_embedding(texts, normalize_embeddings=True):
+        calls.append(list(texts))
+        return [[float(i), 1.0] for i in range(len(texts))]
+
+    monkeypatch.setattr(embedding_batcher.ai_model_service, "text_embedding", fake_text_embedding)
+
+    async def run():
+        batcher = QueryEmbeddingBatcher(batch_window=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(text) for text in ["a", "b", "c"]))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert calls == [["a", "b", "c"]]
+    assert [result.tolist() for result in results] == [[0.0, 1.0], [1.0, 1.0], [2.0, 1.0]]
+    assert all(result.dtype == np.float32 for result in results)
+
+
+def test_stop_during_batch_cancels_waiting_queries(monkeypatch):
+    async def run():
+        embedding_started = asyncio.Event()
+
+        async def hanging_text_embedding(texts, normalize_embeddings=True):
+            embedding_started.set()
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(embedding_batcher.ai_model_service, "text_embedding", hanging_text_embedding)
+
+        batcher = QueryEmbeddingBatcher(batch_window=0.01)
+        batcher.start()
+        submits = [asyncio.create_task(batcher.submit(text)) for text in ["a", "b"]]
+        await asyncio.wait_for(embedding_started.wait(), timeout=1)
+
+        await batcher.stop()
+
+        # 推理中的整批查询都应被取消，而不是一直挂起
+        done, pending = await asyncio.wait(submits, timeout=1)
+        assert not pending
+        for task in done:
+            with pytest.raises(asyncio.CancelledError):
+                task.result()
+
+    asyncio.run(run())
+
+
+def test_queue_is_bounded():
+    async def run():
+        batcher = QueryEmbeddingBatcher(max_queue_size=4)
+        batcher.start()
+        try:
+            return batcher._queue.maxsize
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == 4
+
+
+def test_stop_while_query_arrives_in_batch_window(monkeypatch):
+    async def fake_text_embedding(texts, normalize_embeddings=True):
+        return [[1.0] for _ in texts]
+
+    monkeypatch.setattr(embedding_batcher.ai_model_service, "text_embedding", fake_text_embedding)
+
+    async def run():
+        batcher = QueryEmbeddingBatcher(batch_window=60)
+        batcher.start()
+        first = asyncio.create_task(batcher.submit("a"))
+        await asyncio.sleep(0.01)
+        # 第二条查询入队与停止发生在同一轮事件循环中
+        second = asyncio.create_task(batcher.submit("b"))
+        await asyncio.sleep(0)
+        stopping = asyncio.create_task(batcher.stop())
+        done, _ = await asyncio.wait([stopping], timeout=2)
+        assert done, "stop() 未在超时内返回"
+
+        done, pending = await asyncio.wait([first, second], timeout=1)
+        assert not pending
+        for task in done:
+            with pytest.raises(asyncio.CancelledError):
+                task.result()
+
+    asyncio.run(run())
@@ -0,0 +1,58 @@
+"""
+文件模型测试
+"""
+import uuid
+
+import pytest
+
+from app.models.file import FileModel
+
+
+@pytest.fixture
+def root(db_session):
+    """在独立根目录下创建路径中含 % 和 _ 的文件，返回根目录"""
+    root = f"/prefix-{uuid.uuid4().hex}"
+    paths = [
+        f"{root}/a_b/x.txt",
+        f"{root}/a_b2/y.txt",
+        f"{root}/axb/z.txt",
+        f"{root}/a%b/p.txt",
+        f"{root}/a%%b/q.txt",
+        f"{root}/A_B/u.txt",
+    ]
+    db_session.add_all([
+        FileModel(
+            file_path=path, file_name=path.rsplit("/", 1)[1], file_extension=".txt",
+            file_type="document", file_size=1, content_hash=str(i)
+        )
+        for i, path in enumerate(paths)
+    ])
+    db_session.commit()
+    yield root
+    db_session.query(FileModel).filter(*FileModel.path_prefix_filter(root)).delete(synchronize_session=False)
+    db_session.commit()
+
+
+def _matching_paths(db_session, prefix: str) -> set:
+    rows = db_session.query(FileModel.file_path).filter(*FileModel.path_prefix_filter(prefix)).all()
+    return {path for (path,) in rows}
+
+
+def test_underscore_is_not_a_wildcard(db_session, root):
+    assert _matching_paths(db_session, f"{root}/a_b/") == {f"{root}/a_b/x.txt"}
+    # 不带结尾分隔符时与 LIKE 'prefix%' 一样按字符串前缀匹配
+    assert _matching_paths(db_session, f"{root}/a_b") == {f"{root}/a_b/x.txt", f"{root}/a_b2/y.txt"}
+
+
+def test_percent_is_not_a_wildcard(db_session, root):
+    assert _matching_paths(db_session, f"{root}/a%b/") == {f"{root}/a%b/p.txt"}
+
+
+def test_prefix_match_is_case_sensitive(db_session, root):
+    assert _matching_paths(db_session, f"{root}/A_B/") == {f"{root}/A_B/u.txt"}
+
+
+def test_range_is_half_open(db_session, root):
+    # 区间下界包含前缀本身，上界之后的兄弟目录不会被匹配
+    assert _matching_paths(db_session, f"{root}/a_b/x.txt") == {f"{root}/a_b/x.txt"}
+    assert _matching_paths(db_session, f"{root}/b") == set()
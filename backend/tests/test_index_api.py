@@ -0,0 +1,74 @@
+"""
+索引管理API测试
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.index import router
+from app.models.file import FileModel
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+@pytest.fixture
+def client():
+    """仅挂载索引路由的测试客户端"""
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def folder(db_session):
+    """在独立目录下创建3个已索引文件"""
+    folder = f"/ndjson-{uuid.uuid4().hex}/"
+    now = datetime.now()
+    db_session.add_all([
+        FileModel(
+            file_path=f"{folder}f{i}.txt", file_name=f"f{i}.txt", file_extension=".txt",
+            file_type="document", file_size=1, content_hash=str(i),
+            indexed_at=now - timedelta(minutes=i)
+        )
+        for i in range(3)
+    ])
+    db_session.commit()
+    yield folder
+    db_session.query(FileModel).filter(*FileModel.path_prefix_filter(folder)).delete(synchronize_session=False)
+    db_session.commit()
+
+
+def _lines(response) -> list:
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+def test_files_ndjson_stream(client, folder):
+    response = client.get("/api/index/files", params={"folder_path": folder, "limit": 2}, headers=NDJSON)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-total-count"] == "3"
+    assert response.headers["x-limit"] == "2"
+    assert response.headers["x-offset"] == "0"
+    assert [row["file_name"] for row in _lines(response)] == ["f0.txt", "f1.txt"]
+
+
+def test_files_ndjson_offset_past_end(client, folder):
+    response = client.get("/api/index/files", params={"folder_path": folder, "offset": 10}, headers=NDJSON)
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["x-total-count"] == "3"
+
+
+def test_files_json_matches_ndjson(client, folder):
+    params = {"folder_path": folder, "limit": 2}
+    data = client.get("/api/index/files", params=params).json()["data"]
+    streamed = _lines(client.get("/api/index/files", params=params, headers=NDJSON))
+
+    assert data["total"] == 3
+    assert data["files"] == streamed
@@ -0,0 +1,63 @@
+"""
+分页查询辅助函数测试
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.file import FileModel
+from app.utils.pagination import iter_page_with_total, paginate_with_total
+
+
+@pytest.fixture
+def files_query(db_session):
+    """在独立目录下创建5个文件，返回限定在该目录的查询"""
+    folder = f"/pagination-{uuid.uuid4().hex}/"
+    now = datetime.now()
+    db_session.add_all([
+        FileModel(
+            file_path=f"{folder}f{i}.txt", file_name=f"f{i}.txt", file_extension=".txt",
+            file_type="document", file_size=1, content_hash=str(i),
+            indexed_at=now - timedelta(minutes=i)
+        )
+        for i in range(5)
+    ])
+    db_session.commit()
+    yield db_session.query(FileModel).filter(*FileModel.path_prefix_filter(folder))
+    db_session.query(FileModel).filter(*FileModel.path_prefix_filter(folder)).delete(synchronize_session=False)
+    db_session.commit()
+
+
+def _names(files) -> list:
+    return [file.file_name for file in files]
+
+
+def test_page_carries_total(files_query):
+    files, total = paginate_with_total(files_query, FileModel.indexed_at.desc(), 2, 1)
+    assert _names(files) == ["f1.txt", "f2.txt"]
+    assert total == 5
+
+
+@pytest.mark.parametrize("offset", [5, 50])
+def test_offset_past_end_still_reports_total(files_query, offset):
+    files, total = paginate_with_total(files_query, FileModel.indexed_at.desc(), 2, offset)
+    assert files == []
+    assert total == 5
+
+
+def test_empty_result(db_session):
+    query = db_session.query(FileModel).filter(FileModel.file_path == f"/missing-{uuid.uuid4().hex}")
+    assert paginate_with_total(query, FileModel.indexed_at.desc(), 10, 0) == ([], 0)
+
+
+def test_iter_page_matches_paginate(files_query):
+    files, total = iter_page_with_total(files_query, FileModel.indexed_at.desc(), 3, 1, batch_size=2)
+    assert _names(files) == ["f1.txt", "f2.txt", "f3.txt"]
+    assert total == 5
+
+
+def test_iter_page_offset_past_end(files_query):
+    files, total = iter_page_with_total(files_query, FileModel.indexed_at.desc(), 3, 10)
+    assert list(files) == []
+    assert total == 5
@@ -0,0 +1,72 @@
+"""
+搜索历史批量写入器测试
+"""
+import asyncio
+import uuid
+from datetime import datetime
+
+from app.models.search_history import SearchHistoryModel
+from app.services.search_history_writer import SearchHistoryWriter
+
+
+def _record(search_query: str) -> dict:
+    return {
+        "search_query": search_query,
+        "input_type": "text",
+        "search_type": "hybrid",
+        "ai_model_used": None,
+        "result_count": 1,
+        "response_time": 0.1,
+        "created_at": datetime.now(),
+    }
+
+
+def _count(db_session, prefix: str) -> int:
+    return db_session.query(SearchHistoryModel).filter(
+        SearchHistoryModel.search_query.startswith(prefix)
+    ).count()
+
+
+def test_enqueue_rejected_when_not_running():
+    assert SearchHistoryWriter().enqueue(_record("not-running")) is False
+
+
+def test_stop_writes_buffered_records(db_session):
+    prefix = f"writer-drain-{uuid.uuid4().hex}-"
+
+    async def run():
+        # 刷新间隔足够长，记录停止前不会按时间窗口写入
+        writer = SearchHistoryWriter(batch_size=500, flush_interval=60)
+        writer.start()
+        for i in range(5):
+            assert writer.enqueue(_record(f"{prefix}{i}"))
+        # 让后台协程取走部分记录放入当前批次，其余仍留在队列中
+        await asyncio.sleep(0.05)
+        for i in range(5, 8):
+            assert writer.enqueue(_record(f"{prefix}{i}"))
+        await writer.stop()
+        assert not writer.is_running
+
+    asyncio.run(run())
+
+    assert _count(db_session, prefix) == 8
+
+
+def test_full_batch_is_written_without_waiting_for_interval(db_session):
+    prefix = f"writer-batch-{uuid.uuid4().hex}-"
+
+    async def run():
+        writer = SearchHistoryWriter(batch_size=3, flush_interval=60)
+        writer.start()
+        try:
+            for i in range(3):
+                writer.enqueue(_record(f"{prefix}{i}"))
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if _count(db_session, prefix) == 3:
+                    return True
+            return False
+        finally:
+            await writer.stop()
+
+    assert asyncio.run(run())
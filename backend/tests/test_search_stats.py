@@ -0,0 +1,101 @@
+"""
+今日搜索次数计数器测试
+"""
+from datetime import date, datetime
+
+import pytest
+
+from app.services import search_stats
+from app.services.search_stats import TodaySearchCounter
+
+DAY1 = date(2024, 5, 1)
+DAY2 = date(2024, 5, 2)
+
+
+@pytest.fixture
+def today(monkeypatch):
+    """可控制的“今天”"""
+    current = [DAY1]
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return current[0]
+
+    monkeypatch.setattr(search_stats, "date", FakeDate)
+    return current
+
+
+class Loader:
+    """记录调用的数据库统计函数替身"""
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.calls = []
+
+    def __call__(self, day):
+        self.calls.append(day)
+        return self.counts[day]
+
+
+def _at(day: date, hour: int = 12) -> datetime:
+    return datetime(day.year, day.month, day.day, hour)
+
+
+def test_loads_once_then_counts_in_memory(today):
+    counter = TodaySearchCounter()
+    load = Loader({DAY1: 10})
+
+    assert counter.get(load) == 10
+    counter.record([_at(DAY1), _at(DAY1, 23)])
+    assert counter.get(load) == 12
+    assert load.calls == [DAY1]
+
+
+def test_records_from_other_days_are_ignored(today):
+    counter = TodaySearchCounter()
+    load = Loader({DAY1: 0})
+
+    counter.get(load)
+    counter.record([_at(DAY2), _at(date(2024, 4, 30))])
+    assert counter.get(load) == 0
+
+
+def test_reloads_after_midnight(today):
+    counter = TodaySearchCounter()
+    load = Loader({DAY1: 7, DAY2: 1})
+
+    assert counter.get(load) == 7
+    today[0] = DAY2
+    assert counter.get(load) == 1
+    # 跨天后前一天的记录不再计入
+    counter.record([_at(DAY1, 23)])
+    counter.record([_at(DAY2, 0)])
+    assert counter.get(load) == 2
+    assert load.calls == [DAY1, DAY2]
+
+
+def test_reloads_after_invalidate(today):
+    counter = TodaySearchCounter()
+    load = Loader({DAY1: 5})
+
+    counter.get(load)
+    counter.invalidate()
+    load.counts[DAY1] = 3
+    assert counter.get(load) == 3
+    assert load.calls == [DAY1, DAY1]
+
+
+def test_write_during_load_discards_loaded_count(today):
+    counter = TodaySearchCounter()
+
+    def load_with_concurrent_write(day):
+        # 统计期间有新记录写入，统计结果可能已过时，不应缓存
+        counter.record([_at(DAY1)])
+        return 4
+
+    assert counter.get(load_with_concurrent_write) == 4
+
+    load = Loader({DAY1: 5})
+    assert counter.get(load) == 5
+    assert load.calls == [DAY1]
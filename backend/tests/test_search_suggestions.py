@@ -0,0 +1,50 @@
+"""
+搜索建议状态测试
+"""
+from app.services import search_suggestions
+from app.services.search_suggestions import ColdSuggestionQueries, SuggestionResultCache
+
+
+def test_history_write_discards_matching_cold_queries():
+    cold = ColdSuggestionQueries()
+    for query in ["Python", "java", "rust"]:
+        cold.add(query)
+
+    # 建议检索按忽略大小写的子串匹配历史记录
+    cold.discard_matching(["learn python fast", "javascript"])
+
+    assert not cold.contains("Python")
+    assert not cold.contains("java")
+    assert cold.contains("rust")
+
+
+def test_clear_and_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_suggestions.time, "monotonic", lambda: now[0])
+
+    cold = ColdSuggestionQueries(ttl=60)
+    cold.add("rust")
+    cold.clear()
+    assert not cold.contains("rust")
+
+    cold.add("go")
+    now[0] += 61
+    assert not cold.contains("go")
+
+
+def test_result_cache_expires_and_clears(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_suggestions.time, "monotonic", lambda: now[0])
+
+    cache = SuggestionResultCache(ttl=30)
+    data = {"suggestions": ["python"], "query": "py"}
+    cache.put("py", 10, data)
+    assert cache.get("py", 10) is data
+    assert cache.get("py", 5) is None
+
+    cache.clear()
+    assert cache.get("py", 10) is None
+
+    cache.put("py", 10, data)
+    now[0] += 31
+    assert cache.get("py", 10) is None
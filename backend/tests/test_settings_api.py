@@ -0,0 +1,44 @@
+"""
+设置管理API测试
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.settings import router
+
+
+@pytest.fixture
+def client():
+    """仅挂载设置路由的测试客户端"""
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def existing_key(client):
+    """创建一个测试用设置项"""
+    key = "test.etag_setting"
+    client.post("/api/settings/", json={"key": key, "value": "x", "type": "string"})
+    yield key
+    client.delete(f"/api/settings/{key}")
+
+
+def test_get_setting_returns_etag(client, existing_key):
+    response = client.get(f"/api/settings/{existing_key}")
+    assert response.status_code == 200
+    assert response.headers["etag"]
+
+    cached = client.get(f"/api/settings/{existing_key}", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+@pytest.mark.parametrize("if_none_match", ["*", "current"])
+def test_get_missing_setting_with_if_none_match_returns_404(client, existing_key, if_none_match):
+    if if_none_match == "current":
+        # 取已存在设置项的ETag，即当前设置数据版本
+        if_none_match = client.get(f"/api/settings/{existing_key}").headers["etag"]
+
+    response = client.get("/api/settings/test.missing_setting", headers={"If-None-Match": if_none_match})
+    assert response.status_code == 404